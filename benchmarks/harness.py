@@ -0,0 +1,100 @@
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+# Una medición es regresión si tarda más de (1 + THRESHOLD) veces la línea base
+THRESHOLD = 0.25
+
+
+def measure(func, budget=1.0, min_repeat=3, max_repeat=1000):
+    """
+    Tiempos de pared de func() (perf_counter). La primera llamada es de
+    calentamiento y fija cuántas repeticiones caben en budget segundos
+    (entre min_repeat y max_repeat): las funciones rápidas se repiten mucho
+    para que el mínimo sea estable.
+
+    Returns:
+        Diccionario con el mejor tiempo ("seconds", el que se compara contra
+        la línea base), la mediana y el número de repeticiones.
+    """
+    start = time.perf_counter()
+    func()
+    warmup = time.perf_counter() - start
+    repeat = min(max_repeat, max(min_repeat, math.ceil(budget / max(warmup, 1e-9))))
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return {"seconds": min(times), "median": statistics.median(times), "repeat": repeat}
+
+
+def environment():
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def save(path, results, **meta):
+    """Escribe {"meta": ..., "results": [...]} en JSON."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"meta": {**environment(), **meta}, "results": results}, f, indent=2)
+
+
+def load(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(results, baseline, threshold=THRESHOLD):
+    """
+    Compara por nombre cada medición contra la línea base.
+
+    Returns:
+        Lista de filas {"name", "baseline", "current", "ratio", "regression"}
+        para los nombres presentes en ambas.
+    """
+    reference = {r["name"]: r["seconds"] for r in baseline["results"]}
+    rows = []
+    for r in results:
+        if r["name"] not in reference:
+            continue
+        ratio = r["seconds"] / reference[r["name"]]
+        rows.append({"name": r["name"], "baseline": reference[r["name"]],
+                     "current": r["seconds"], "ratio": ratio,
+                     "regression": ratio > 1.0 + threshold})
+    return rows
+
+
+def format_results(results):
+    lines = []
+    for r in results:
+        extra = "".join(f"  {k}={v:.4g}" for k, v in r.items()
+                        if k.endswith("_per_second"))
+        lines.append(f"{r['name']:<58} {1e3 * r['seconds']:>10.2f} ms{extra}")
+    return "\n".join(lines)
+
+
+def format_comparison(rows, threshold=THRESHOLD):
+    lines = []
+    for row in rows:
+        flag = "REGRESIÓN" if row["regression"] else ""
+        lines.append(f"{row['name']:<58} {1e3 * row['baseline']:>10.2f} -> "
+                     f"{1e3 * row['current']:>10.2f} ms  x{row['ratio']:.2f}  {flag}")
+    n = sum(row["regression"] for row in rows)
+    lines.append(f"{n} regresiones (umbral +{100 * threshold:.0f}%) en {len(rows)} mediciones")
+    return "\n".join(lines)
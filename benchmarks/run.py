@@ -0,0 +1,69 @@
+"""
+Corre la suite de benchmarks sin gráficas y guarda los resultados en JSON.
+
+    python -m benchmarks.run                      # todo, compara con la línea base
+    python -m benchmarks.run --quick nash         # solo un grupo, tamaños chicos
+    python -m benchmarks.run --save-baseline      # fija la línea base actual
+
+Sale con código 1 si alguna medición es más lenta que la línea base por más
+del umbral (--threshold, +25% por defecto).
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks import harness
+from benchmarks.suite import GROUPS
+
+DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+BASELINE = os.path.join(DIRECTORY, "baseline.json")
+OUTPUT = os.path.join(DIRECTORY, "results", "latest.json")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de simuladores, matrices y Nash")
+    parser.add_argument("groups", nargs="*",
+                        help=f"grupos a correr (por defecto todos: {', '.join(GROUPS)})")
+    parser.add_argument("--quick", action="store_true", help="tamaños y repeticiones reducidos")
+    parser.add_argument("--output", default=OUTPUT, help="JSON de resultados")
+    parser.add_argument("--baseline", default=BASELINE, help="JSON de la línea base")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="guarda estos resultados como la nueva línea base")
+    parser.add_argument("--threshold", type=float, default=harness.THRESHOLD,
+                        help="fracción de lentitud tolerada antes de marcar regresión")
+    args = parser.parse_args(argv)
+    unknown = set(args.groups) - set(GROUPS)
+    if unknown:
+        parser.error(f"grupos desconocidos: {', '.join(sorted(unknown))}")
+
+    results = []
+    for group in args.groups or GROUPS:
+        print(f"== {group}")
+        group_results = GROUPS[group](quick=args.quick)
+        print(harness.format_results(group_results))
+        results += group_results
+
+    harness.save(args.output, results, quick=args.quick)
+    print(f"\nResultados guardados en {args.output}")
+
+    if args.save_baseline:
+        harness.save(args.baseline, results, quick=args.quick)
+        print(f"Línea base guardada en {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"Sin línea base en {args.baseline} (usar --save-baseline)")
+        return 0
+
+    baseline = harness.load(args.baseline)
+    if baseline["meta"].get("quick") != args.quick:
+        print("Aviso: la línea base se midió con otro valor de --quick")
+    rows = harness.compare(results, baseline, args.threshold)
+    print("\n" + harness.format_comparison(rows, args.threshold))
+    return 1 if any(row["regression"] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,197 @@
+"""
+Mediciones de rendimiento de los caminos críticos del proyecto.
+
+Cada función bench_* devuelve una lista de resultados {"name", "group",
+"seconds", "median", "repeat", ...}. Los juegos de los scripts se
+reconstruyen aquí con los mismos parámetros (los scripts no se importan:
+ejecutan y grafican al importarse), así que al cambiar esos parámetros hay
+que actualizar las constantes de este módulo.
+"""
+
+import numpy as np
+
+from common.parallel import build_payoff_matrices
+from first_scenario.lib.epidemic_model import EpidemicModel as SISModel
+from first_scenario.lib.simulation import BatchSimulator, Simulator as SISSimulator
+from second_scenario.lib.epidemic_model import EpidemicModel as PatchModel
+from second_scenario.lib.simulation import Simulator as PatchSimulator
+from common.nash import solve_nash
+from common.trajectory import remaining_times
+from third_scenario.lib.unified_model import UnifiedEpidemicModel
+from third_scenario.lib.unified_simulation import UnifiedSimulator, sweep, to_matrix
+
+from .harness import measure
+
+# Condiciones de los scripts
+N = 10000
+I0 = 15
+S0 = N - I0
+R0 = 0
+TOTAL_TIME = 168.0
+
+# analyze_nash.py (primer escenario)
+NASH_BETAS = [0.5, 1.0, 1.5, 2.0, 2.5]
+NASH_RS = [0.5, 1.0, 2.0, 3.0, 5.0]
+
+# matrix_nash.py (segundo escenario)
+MATRIX_BETAS = [0.5, 1.0, 1.62, 2.0]
+MATRIX_LAMBDAS = [1, 5, 10, 15, 20]
+MATRIX_R = 2
+MATRIX_GAMMA = 1
+
+# analyze_case.py (tercer escenario)
+CASE_BETAS = [0.5, 1.0, 1.5, 2.0]
+CASE_GAMMAS = [2, 4, 6]
+CASE_RS = [2, 5, 10]
+CASE_LAMBDAS = [2, 5, 10]
+CASE_STEADY_TOL = 1e-9
+
+# Juegos sintéticos por método: los métodos de enumeración crecen
+# exponencialmente, así que cada uno llega hasta un tamaño distinto
+SYNTHETIC_SHAPES = {
+    "lemke_howson": [(4, 4), (8, 8), (16, 16), (32, 32), (64, 64), (128, 128), (8, 64)],
+    "support": [(4, 4), (6, 6), (8, 8), (10, 10), (4, 27)],
+    "vertex": [(4, 4), (6, 6), (8, 8), (4, 27)],
+    "support_loop": [(4, 4), (6, 6)],
+}
+# En modo rápido solo los juegos de hasta este número de celdas
+QUICK_MAX_CELLS = 64
+
+
+def _result(name, group, timing, **extra):
+    return {"name": name, "group": group, **timing, **extra}
+
+
+# ---------------------------------------------------------------
+# Simuladores
+# ---------------------------------------------------------------
+
+def bench_simulators(quick=False):
+    """Pasos por segundo de los simuladores escalares y celdas-paso por segundo de los lotes."""
+    dt = 0.05 if quick else 0.01
+    budget = 0.2 if quick else 1.0
+    results = []
+
+    scalar = [
+        ("first_scenario.Simulator", ("euler", "rk45"), lambda method: SISSimulator(
+            SISModel(1.62, 0.5), [S0, I0], dt, TOTAL_TIME, method=method, record="summary")),
+        ("second_scenario.Simulator", ("euler", "rk45"), lambda method: PatchSimulator(
+            PatchModel(1.62, 2, 1, 15, N), (S0, I0, R0), dt, TOTAL_TIME, method=method,
+            record="summary")),
+        ("third_scenario.UnifiedSimulator", ("euler",), lambda method: UnifiedSimulator(
+            UnifiedEpidemicModel(1.5, 3, 2, 2), [S0, I0, R0], dt, TOTAL_TIME, record="summary")),
+    ]
+    for name, methods, make in scalar:
+        for method in methods:
+            timing = measure(lambda: make(method).run(), budget=budget)
+            if method == "rk45":
+                sim = make(method)
+                sim.run()
+                n_steps = sim.n_steps
+            else:
+                n_steps = len(remaining_times(0.0, TOTAL_TIME, dt))
+            results.append(_result(f"simulator/{name}/{method}", "simulators", timing,
+                                   dt=dt, steps=n_steps,
+                                   steps_per_second=n_steps / timing["seconds"]))
+
+    side = 50 if quick else 200
+    grid = np.linspace(0.1, 5.0, side), np.linspace(0.1, 10.0, side)
+    n_steps = len(remaining_times(0.0, TOTAL_TIME, 1.0))
+    timing = measure(lambda: BatchSimulator.from_grid(*grid, [S0, I0], 1.0, TOTAL_TIME).run(),
+                     budget)
+    results.append(_result(f"simulator/first_scenario.BatchSimulator/{side}x{side}",
+                           "simulators", timing, cells=side * side,
+                           cell_steps_per_second=side * side * n_steps / timing["seconds"]))
+
+    side = 6 if quick else 12
+    axes = np.linspace(0.1, 5.0, side), *(np.linspace(0.5, 15.0, side),) * 3
+    timing = measure(lambda: sweep(*axes, [S0, I0, R0], 1.0, TOTAL_TIME), budget)
+    results.append(_result(f"simulator/third_scenario.UnifiedBatchSimulator/{side}^4",
+                           "simulators", timing, cells=side ** 4,
+                           cell_steps_per_second=side ** 4 * n_steps / timing["seconds"]))
+    return results
+
+
+# ---------------------------------------------------------------
+# Matrices de payoff de los scripts
+# ---------------------------------------------------------------
+
+def make_patch_model(beta, lam):
+    return PatchModel(beta, MATRIX_R, MATRIX_GAMMA, lam, N)
+
+
+def payoff_games():
+    """Matrices (A, D) de los tres scripts, para los benchmarks de Nash."""
+    batch = BatchSimulator.from_grid(NASH_BETAS, NASH_RS, [S0, I0], 1.0, TOTAL_TIME)
+    batch.run()
+    matrix = build_payoff_matrices(make_patch_model, PatchSimulator, MATRIX_BETAS,
+                                   MATRIX_LAMBDAS, (S0, I0, R0), 1.0, TOTAL_TIME, workers=1)
+    case = sweep(CASE_BETAS, CASE_GAMMAS, CASE_RS, CASE_LAMBDAS, [S0, I0, R0], 1.0, TOTAL_TIME)
+    return {
+        "analyze_nash": (batch.payoff_attacker, batch.payoff_defender),
+        "matrix_nash": matrix,
+        "analyze_case": (to_matrix(case["payoff_attacker"]), to_matrix(case["payoff_defender"])),
+    }
+
+
+def bench_payoff_matrices(quick=False):
+    """Tiempo de construir las matrices de payoff de analyze_nash, matrix_nash y analyze_case."""
+    budget = 0.2 if quick else 1.0
+    cases = [
+        ("payoffs/analyze_nash", lambda: BatchSimulator.from_grid(
+            NASH_BETAS, NASH_RS, [S0, I0], 1.0, TOTAL_TIME).run()),
+        ("payoffs/matrix_nash/serial", lambda: build_payoff_matrices(
+            make_patch_model, PatchSimulator, MATRIX_BETAS, MATRIX_LAMBDAS,
+            (S0, I0, R0), 1.0, TOTAL_TIME, workers=1)),
+        ("payoffs/matrix_nash/parallel", lambda: build_payoff_matrices(
+            make_patch_model, PatchSimulator, MATRIX_BETAS, MATRIX_LAMBDAS,
+            (S0, I0, R0), 1.0, TOTAL_TIME, workers=None)),
+        ("payoffs/analyze_case", lambda: sweep(
+            CASE_BETAS, CASE_GAMMAS, CASE_RS, CASE_LAMBDAS, [S0, I0, R0], 1.0, TOTAL_TIME)),
+        ("payoffs/analyze_case/steady", lambda: sweep(
+            CASE_BETAS, CASE_GAMMAS, CASE_RS, CASE_LAMBDAS, [S0, I0, R0], 1.0, TOTAL_TIME,
+            steady_tol=CASE_STEADY_TOL)),
+    ]
+    return [_result(name, "payoffs", measure(func, budget)) for name, func in cases]
+
+
+# ---------------------------------------------------------------
+# Equilibrios de Nash
+# ---------------------------------------------------------------
+
+def synthetic_game(m, n, seed=0):
+    """Juego bimatricial aleatorio m x n (payoffs uniformes, genéricamente no degenerado)."""
+    rng = np.random.default_rng(seed)
+    return rng.random((m, n)), rng.random((m, n))
+
+
+def bench_nash(quick=False):
+    """Tiempo de solve_nash por método en los juegos de los scripts y en juegos sintéticos."""
+    budget = 0.2 if quick else 1.0
+    results = []
+
+    for game, (A, D) in payoff_games().items():
+        for method in SYNTHETIC_SHAPES:
+            # La enumeración soporte por soporte tarda segundos en 4x27; ya la cubre "support"
+            if method == "support_loop" and A.size > QUICK_MAX_CELLS:
+                continue
+            timing = measure(lambda: solve_nash(A, D, method=method), budget=budget)
+            results.append(_result(f"nash/{game}/{method}", "nash", timing,
+                                   method=method, shape=list(A.shape)))
+
+    for method, shapes in SYNTHETIC_SHAPES.items():
+        for m, n in shapes:
+            if quick and m * n > QUICK_MAX_CELLS:
+                continue
+            A, B = synthetic_game(m, n)
+            timing = measure(lambda: solve_nash(A, B, method=method), budget=budget)
+            results.append(_result(f"nash/synthetic/{method}/{m}x{n}", "nash", timing,
+                                   method=method, shape=[m, n]))
+    return results
+
+
+GROUPS = {
+    "simulators": bench_simulators,
+    "payoffs": bench_payoff_matrices,
+    "nash": bench_nash,
+}
@@ -0,0 +1,319 @@
+"""
+Punto de entrada único para los tres escenarios.
+
+    python cli.py simulate first --beta 1.62 --r 2          # una celda
+    python cli.py matrix third --output matrices            # matrices de payoff
+    python cli.py nash second --method lemke_howson         # equilibrio
+    python cli.py nash third --input matrices --beta 1 2    # corte de matrices guardadas
+    python cli.py plot first --beta 1.62 --r 2              # trayectoria en PNG
+    python cli.py plot third --kind payoffs                 # mapas de las matrices
+    python cli.py run experiments/caso4.toml                # experimento TOML (common/experiment.py)
+
+Las dependencias pesadas se importan dentro de cada subcomando: simulate
+solo carga NumPy y el lib/ del escenario, nash agrega SciPy y plot
+matplotlib. pandas y seaborn no se importan.
+"""
+
+import argparse
+import json
+import sys
+
+from common.scenarios import (SCENARIOS, cell_model, initial_state, label, make_model,
+                              parameters, simulator_class, strategies, strategy_labels)
+
+# Salidas escalares de una celda (las de common.cache.OUTPUTS)
+OUTPUTS = ("gain_attacker", "gain_defender", "cost_attacker", "cost_defender",
+           "payoff_attacker", "payoff_defender")
+
+
+def _initial_state(scenario, args):
+    return initial_state(scenario, args.N, args.I0)
+
+
+# ---------------------------------------------------------------
+# Modelos y simuladores (imports diferidos por escenario)
+# ---------------------------------------------------------------
+
+def make_simulator(scenario, cell, args, record="summary"):
+    """Simulador escalar de una celda {parámetro: valor}."""
+    options = {"record": record}
+    if args.steady_tol is not None:
+        options["steady_tol"] = args.steady_tol
+    if scenario != "third":
+        options["method"] = args.method
+    elif args.method != "euler":
+        raise ValueError("El tercer escenario solo integra con euler")
+
+    model = make_model(scenario, cell, args.N)
+    return simulator_class(scenario)(model, _initial_state(scenario, args), args.dt,
+                                     args.total_time, **options)
+
+
+def payoff_matrices(scenario, grid, args):
+    """
+    Matrices (A, D) del atacante y del defensor sobre la malla {parámetro:
+    lista}. El primer y el tercer escenario usan sus simuladores por lotes;
+    el segundo reparte las celdas con common.parallel.
+    """
+    import numpy as np
+
+    state = _initial_state(scenario, args)
+    options = {} if args.steady_tol is None else {"steady_tol": args.steady_tol}
+
+    if scenario == "first":
+        from first_scenario.lib.simulation import BatchSimulator
+        sim = BatchSimulator.from_grid(grid["beta"], grid["r"], state, args.dt,
+                                       args.total_time, **options)
+        sim.run()
+        return np.asarray(sim.payoff_attacker), np.asarray(sim.payoff_defender)
+
+    if scenario == "second":
+        from functools import partial
+
+        from common.parallel import build_payoff_matrices
+        return build_payoff_matrices(partial(cell_model, scenario, args.N),
+                                     simulator_class(scenario), *strategies(scenario, grid),
+                                     state, args.dt, args.total_time, workers=args.workers,
+                                     sim_kwargs=options)
+
+    from third_scenario.lib.unified_simulation import sweep, to_matrix
+    result = sweep(grid["beta"], grid["gamma"], grid["r"], grid["lambda_"], state,
+                   args.dt, args.total_time, **options)
+    return to_matrix(result["payoff_attacker"]), to_matrix(result["payoff_defender"])
+
+
+def _matrices(args):
+    if getattr(args, "input", None):
+        # Solo se lee del disco el corte de los valores pasados por opción
+        from common.result_store import ResultStore, load_payoffs
+        return load_payoffs(ResultStore(args.input), args.scenario, **args.given)
+    A, D = payoff_matrices(args.scenario, args.grid, args)
+    return (A, D, *strategy_labels(args.scenario, args.grid))
+
+
+# ---------------------------------------------------------------
+# Subcomandos
+# ---------------------------------------------------------------
+
+def cmd_simulate(args):
+    sim = make_simulator(args.scenario, args.cell, args)
+    sim.run()
+    result = {"scenario": args.scenario, "parameters": args.cell,
+              **{name: float(getattr(sim, name)) for name in OUTPUTS}}
+    if getattr(sim, "steady_time", None) is not None:
+        result["steady_time"] = float(sim.steady_time)
+
+    if args.json:
+        print(json.dumps(result))
+    else:
+        names = parameters(args.scenario)
+        print(f"Escenario {args.scenario}: {label(names, [args.cell[n] for n in names])}")
+        for name in OUTPUTS + ("steady_time",):
+            if name in result:
+                print(f"  {name:<16} {result[name]:.6f}")
+    return 0
+
+
+def cmd_matrix(args):
+    import numpy as np
+
+    A, D, attackers, defenders = _matrices(args)
+    if args.output:
+        from common.result_store import ResultStore, save_payoffs
+        save_payoffs(ResultStore(args.output), args.scenario, args.grid, A, D, csv=args.csv)
+        print(f"Matrices {A.shape[0]}x{A.shape[1]} guardadas en {args.output}")
+    if args.json:
+        print(json.dumps({"attacker": attackers, "defender": defenders,
+                          "payoff_attacker": A.tolist(), "payoff_defender": D.tolist()}))
+    elif not args.output:
+        with np.printoptions(precision=4, suppress=True, linewidth=120):
+            print("Payoff del Atacante:")
+            print(A)
+            print("Payoff del Defensor:")
+            print(D)
+    return 0
+
+
+def cmd_nash(args):
+    from common.nash import solve_nash
+
+    A, D, attackers, defenders = _matrices(args)
+    equilibria = solve_nash(A, D, method=args.method, eliminate=args.eliminate)
+
+    if args.json:
+        print(json.dumps([{"attacker": dict(zip(attackers, map(float, p))),
+                           "defender": dict(zip(defenders, map(float, q))),
+                           "payoff_attacker": float(p @ A @ q),
+                           "payoff_defender": float(p @ D @ q)}
+                          for p, q in equilibria]))
+        return 0 if equilibria else 1
+
+    if not equilibria:
+        print("No se encontró equilibrio.")
+        return 1
+    for k, (p, q) in enumerate(equilibria, 1):
+        print(f"Equilibrio {k}: payoffs atacante {p @ A @ q:.6f}, defensor {p @ D @ q:.6f}")
+        for label, prob in zip(attackers, p):
+            if prob > 1e-9:
+                print(f"  Atacante {label}: {prob:.4f}")
+        for label, prob in zip(defenders, q):
+            if prob > 1e-9:
+                print(f"  Defensor {label}: {prob:.4f}")
+    return 0
+
+
+def cmd_plot(args):
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    output = args.output or f"{args.scenario}_{args.kind}.png"
+    if args.kind == "trajectory":
+        sim = make_simulator(args.scenario, args.cell, args, record="full")
+        sim.run()
+        names = parameters(args.scenario)
+        plt.figure(figsize=(10, 6))
+        for column in sim.trajectory.columns[1:]:
+            plt.plot(sim.trajectory.column("t"), sim.trajectory.column(column), label=column)
+        plt.title(f"Escenario {args.scenario}: {label(names, [args.cell[n] for n in names])}")
+        plt.xlabel("Tiempo (horas)")
+        plt.ylabel("Nodos")
+        plt.grid(True, alpha=0.3)
+        plt.legend()
+    else:
+        A, D, attackers, defenders = _matrices(args)
+        plt.figure(figsize=(14, 6))
+        for k, (matrix, title, cmap) in enumerate(((A, "Payoff del Atacante", "Reds"),
+                                                   (D, "Payoff del Defensor", "Greens")), 1):
+            plt.subplot(1, 2, k)
+            plt.imshow(matrix, aspect="auto", cmap=cmap)
+            plt.colorbar()
+            plt.yticks(range(len(attackers)), attackers, fontsize=7)
+            plt.xticks(range(len(defenders)), defenders, rotation=90, fontsize=7)
+            plt.title(title)
+    plt.tight_layout()
+    plt.savefig(output)
+    plt.close("all")
+    print(f"Generada: {output}")
+    return 0
+
+
+def cmd_run(args):
+    from common.experiment import run_experiment
+
+    experiment, status = run_experiment(args.config, force=args.force, workers=args.workers)
+    for name, state in status.items():
+        detail = ""
+        if name == "matrices" and state == "ejecutada":
+            result = experiment.result(name)
+            detail = f" ({result['simulated']} de {result['payoff_attacker'].size} celdas simuladas)"
+        print(f"  {name:<10} {state}{detail}")
+    print(experiment.cache.report())
+    print(experiment.figures.report())
+    print(f"Resultados en {experiment.directory}")
+    return 0
+
+
+COMMANDS = {
+    "simulate": (cmd_simulate, "simula una celda y muestra ganancias, costos y payoffs"),
+    "matrix": (cmd_matrix, "construye las matrices de payoff sobre una malla de estrategias"),
+    "nash": (cmd_nash, "resuelve el equilibrio de Nash de las matrices de payoff"),
+    "plot": (cmd_plot, "grafica la trayectoria de una celda o las matrices de payoff"),
+    "run": (cmd_run, "ejecuta un experimento descrito en TOML (solo las etapas que cambiaron)"),
+}
+
+
+# ---------------------------------------------------------------
+# Argumentos
+# ---------------------------------------------------------------
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Simulación y equilibrios de los tres escenarios")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    for name, (_, help_text) in COMMANDS.items():
+        sub = commands.add_parser(name, help=help_text, description=help_text)
+        if name == "run":
+            sub.add_argument("config", help="archivo TOML del experimento")
+            sub.add_argument("--force", action="store_true", help="repite todas las etapas")
+            sub.add_argument("--workers", type=int, default=None,
+                             help="procesos para simular las celdas (None = todos los núcleos)")
+            continue
+        sub.add_argument("scenario", choices=SCENARIOS)
+
+        grid = name in ("matrix", "nash")
+        nargs = "+" if grid else None
+        for param in ("beta", "r", "gamma", "lambda"):
+            sub.add_argument(f"--{param}", dest="lambda_" if param == "lambda" else param,
+                             type=float, nargs=nargs,
+                             help="valores de la malla" if grid else "valor de la celda")
+
+        sub.add_argument("--N", type=int, default=10000, help="nodos de la red")
+        sub.add_argument("--I0", type=int, default=15, help="infectados iniciales")
+        sub.add_argument("--dt", type=float, default=1.0)
+        sub.add_argument("--total-time", type=float, default=168.0)
+        sub.add_argument("--steady-tol", type=float, default=None,
+                         help="corta la integración en estado estacionario (primer y tercer escenario)")
+
+        if name in ("simulate", "plot"):
+            sub.add_argument("--method", choices=("euler", "rk45"), default="euler")
+        if name in ("matrix", "nash", "plot"):
+            sub.add_argument("--workers", type=int, default=None,
+                             help="procesos para el segundo escenario (None = todos los núcleos)")
+        if name in ("nash", "plot"):
+            sub.add_argument("--input", help="directorio guardado con `matrix --output`; las "
+                                             "opciones de parámetros eligen un corte")
+        if name == "nash":
+            sub.add_argument("--method", default="support",
+                             choices=("support", "support_loop", "vertex", "lemke_howson"))
+            sub.add_argument("--eliminate", choices=("pure", "mixed"), default=None,
+                             help="elimina antes las estrategias estrictamente dominadas")
+        if name == "plot":
+            sub.add_argument("--kind", choices=("trajectory", "payoffs"), default="trajectory")
+        if name in ("matrix", "plot"):
+            sub.add_argument("--output", help="salida: directorio de resultados (common.result_store) "
+                                              "para matrix, .png para plot")
+        if name == "matrix":
+            sub.add_argument("--csv", action="store_true",
+                             help="con --output, escribe también la vista CSV de las matrices")
+        if name != "plot":
+            sub.add_argument("--json", action="store_true", help="salida en JSON")
+    return parser
+
+
+def parse_args(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        return args
+    spec = SCENARIOS[args.scenario]
+    names = parameters(args.scenario)
+
+    given = {n: getattr(args, n) for n in ("beta", "r", "gamma", "lambda_")
+             if getattr(args, n) is not None}
+    unused = sorted(set(given) - set(names))
+    if unused:
+        parser.error(f"el escenario {args.scenario} no usa "
+                     + ", ".join(f"--{n.rstrip('_')}" for n in unused))
+
+    args.given = given
+    if args.command in ("matrix", "nash"):
+        args.grid = {n: given.get(n, spec["grid"][n]) for n in names}
+    else:
+        args.cell = {n: given.get(n, spec["cell"][n]) for n in names}
+        # plot --kind payoffs sin --input usa la malla por defecto
+        args.grid = spec["grid"]
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        return COMMANDS[args.command][0](args)
+    except ValueError as error:
+        print(f"Error: {error}", file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
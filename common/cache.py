@@ -0,0 +1,244 @@
+import glob
+import hashlib
+import inspect
+import json
+import os
+
+import numpy as np
+
+from .integrators import dopri5
+from .trajectory import Trajectory
+
+# Subir este número invalida todas las entradas aunque el código no cambie
+CODE_VERSION = 1
+
+PACKAGE_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DIRECTORY = os.path.join(os.path.dirname(PACKAGE_DIRECTORY), ".simulation_cache")
+
+# Salidas escalares que todos los simuladores dejan como atributos tras run()
+OUTPUTS = ("gain_attacker", "gain_defender", "cost_attacker", "cost_defender",
+           "payoff_attacker", "payoff_defender")
+
+# Argumentos de los simuladores que no cambian las salidas (no entran en la llave)
+UNKEYED_OPTIONS = ("observers",)
+
+
+def _qualname(cls):
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+
+def _plain(value):
+    """Convierte parámetros a tipos JSON estables (arreglos NumPy incluidos)."""
+    if isinstance(value, np.ndarray):
+        return {"shape": list(value.shape), "values": value.astype(float).ravel().tolist()}
+    if isinstance(value, (np.generic, int, float)):
+        return float(value)
+    if isinstance(value, (list, tuple)):
+        return [_plain(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _plain(v) for k, v in sorted(value.items())}
+    return repr(value)
+
+
+def model_parameters(model):
+    """Parámetros del modelo: atributos de instancia y propiedades (p. ej. cost_defender)."""
+    params = {k: v for k, v in vars(model).items() if not k.startswith("_")}
+    for name, attr in inspect.getmembers(type(model)):
+        if isinstance(attr, property):
+            params[name] = getattr(model, name)
+    return _plain(params)
+
+
+_source_hashes = {}
+
+
+def source_hash(*objects):
+    """
+    Hash del código fuente de los paquetes que definen los objetos (todos los
+    .py del directorio de cada módulo), para que cualquier cambio en lib/
+    invalide las entradas. Los objetos de common/ solo aportan su propio
+    archivo: así un cambio en, p. ej., las figuras no invalida la caché.
+    """
+    paths = set()
+    for obj in objects:
+        path = os.path.abspath(inspect.getsourcefile(obj))
+        paths.add(path if os.path.dirname(path) == PACKAGE_DIRECTORY else os.path.dirname(path))
+
+    digest = hashlib.sha256()
+    for path in sorted(paths):
+        if path not in _source_hashes:
+            files = [path] if os.path.isfile(path) else sorted(glob.glob(os.path.join(path, "*.py")))
+            h = hashlib.sha256()
+            for name in files:
+                with open(name, "rb") as f:
+                    h.update(os.path.basename(name).encode())
+                    h.update(f.read())
+            _source_hashes[path] = h.hexdigest()
+        digest.update(_source_hashes[path].encode())
+    return digest.hexdigest()
+
+
+def collect_outputs(sim, trajectories=False):
+    """Salidas de una corrida ya ejecutada (y su trayectoria si se pide)."""
+    result = {name: float(getattr(sim, name)) for name in OUTPUTS}
+    if trajectories:
+        trajectory = sim.trajectory
+        result["trajectory"] = {name: trajectory.column(name).copy()
+                                for name in trajectory.columns}
+    return result
+
+
+class SimulationCache:
+    """
+    Caché en disco de corridas de simuladores, direccionada por contenido.
+
+    La llave es un SHA-256 de: clase del simulador, clase y parámetros del
+    modelo (incluye coeficientes de costo como k0/k1), estado inicial, dt,
+    total_time, argumentos extra del simulador, CODE_VERSION y el hash del
+    código fuente de lib/. Cada entrada es un .npz con las ganancias, costos y
+    payoffs y, opcionalmente, la trayectoria.
+
+    Cuando el tamaño total supera max_bytes se eliminan las entradas usadas
+    hace más tiempo (LRU por mtime; un acierto actualiza el mtime). El tamaño
+    se lleva como un total acumulado (el directorio se recorre una vez al
+    primer store() y luego solo al desalojar), así que guardar no cuesta
+    O(entradas). Con varios procesos escribiendo, cada uno ve sus propias
+    escrituras; el recorrido de evict() corrige el total.
+    """
+
+    def __init__(self, directory=DEFAULT_DIRECTORY, max_bytes=256 * 2**20,
+                 trajectories=False, enabled=True):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.trajectories = trajectories
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.size = None        # bytes en disco; se calcula al primer store()
+        if enabled:
+            os.makedirs(directory, exist_ok=True)
+
+    def key(self, simulator_class, model, initial_state, dt, total_time, **sim_kwargs):
+        payload = {
+            "simulator": _qualname(simulator_class),
+            "model": _qualname(type(model)),
+            "parameters": model_parameters(model),
+            "initial_state": _plain(list(initial_state)),
+            "dt": float(dt),
+            "total_time": float(total_time),
+            "options": _plain({k: v for k, v in sim_kwargs.items()
+                               if k not in UNKEYED_OPTIONS}),
+            "code_version": CODE_VERSION,
+            "source": source_hash(simulator_class, type(model), dopri5, Trajectory),
+        }
+        blob = json.dumps(payload, sort_keys=True).encode()
+        return hashlib.sha256(blob).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key + ".npz")
+
+    def load(self, key, trajectories=None):
+        """Entrada guardada o None. Cuenta aciertos y fallos."""
+        trajectories = self.trajectories if trajectories is None else trajectories
+        path = self.path(key)
+        if self.enabled and os.path.exists(path):
+            try:
+                with np.load(path) as data:
+                    if not trajectories or "trajectory" in data:
+                        result = {name: float(data[name]) for name in OUTPUTS}
+                        if trajectories:
+                            columns = [str(c) for c in data["columns"]]
+                            result["trajectory"] = dict(zip(columns, data["trajectory"].T.copy()))
+                        os.utime(path)
+                        self.hits += 1
+                        return result
+            except (OSError, ValueError, KeyError):
+                pass  # entrada corrupta o incompleta: se recalcula
+        self.misses += 1
+        return None
+
+    def store(self, key, result):
+        if not self.enabled:
+            return
+        arrays = {name: np.float64(result[name]) for name in OUTPUTS}
+        if "trajectory" in result:
+            arrays["columns"] = np.array(list(result["trajectory"]))
+            arrays["trajectory"] = np.column_stack(list(result["trajectory"].values()))
+
+        # Escritura atómica: archivo temporal y luego os.replace
+        path = self.path(key)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            np.savez(f, **arrays)
+        if self.size is None:
+            self.size = sum(size for _, size, _ in self._entries())
+        try:
+            self.size -= os.stat(path).st_size     # se reemplaza una entrada
+        except OSError:
+            pass
+        self.size += os.stat(tmp).st_size
+        os.replace(tmp, path)
+        if self.size > self.max_bytes:
+            self.evict()
+
+    def _entries(self):
+        """(mtime, tamaño, ruta) de cada entrada en disco."""
+        entries = []
+        for path in glob.glob(os.path.join(self.directory, "*.npz")):
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def evict(self):
+        """Elimina las entradas menos usadas hasta quedar bajo max_bytes."""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            self.evictions += 1
+        self.size = total
+
+    def run(self, simulator_class, model, initial_state, dt=1.0, total_time=168.0,
+            trajectories=None, **sim_kwargs):
+        """
+        Equivalente en caché de simulator_class(model, initial_state, dt,
+        total_time, **sim_kwargs).run(). En un acierto no se simula, así que
+        los observadores pasados en sim_kwargs no se llaman.
+
+        Returns:
+            Diccionario con ganancias, costos y payoffs; con trajectories=True
+            incluye "trajectory" (columna -> arreglo, con "t").
+        """
+        trajectories = self.trajectories if trajectories is None else trajectories
+        key = self.key(simulator_class, model, initial_state, dt, total_time, **sim_kwargs)
+        result = self.load(key, trajectories)
+        if result is None:
+            sim = simulator_class(model, initial_state, dt, total_time, **sim_kwargs)
+            sim.run()
+            result = collect_outputs(sim, trajectories)
+            self.store(key, result)
+        return result
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+    def report(self):
+        s = self.stats()
+        return (f"Caché de simulaciones: {s['hits']} aciertos, {s['misses']} fallos "
+                f"({100 * s['hit_rate']:.1f}% reutilizado), {s['evictions']} desalojos")
@@ -0,0 +1,424 @@
+"""
+Experimentos descritos en TOML y ejecutados como un DAG de etapas con caché.
+
+    python cli.py run experiments/caso4.toml
+
+Etapas de un experimento (entre paréntesis, de cuáles depende):
+
+    matrices   simula las celdas y arma las matrices de payoff
+    reduccion  eliminación de estrategias dominadas (matrices)
+    nash       equilibrios del juego reducido (matrices, reduccion)
+    casos      trayectorias de los casos [[cases]]
+    figuras    heatmaps, estrategias mixtas y trayectorias (matrices, nash, casos)
+    tablas     matrices y equilibrios en common.result_store, con vista CSV
+               opcional (matrices, nash)
+
+La llave de cada etapa es un SHA-256 de su código, de sus parámetros (solo
+la parte de la configuración que usa), del código de lib/ que ejecuta y de
+las llaves de sus dependencias. Una etapa cuya llave coincide con la del
+manifiesto no se vuelve a ejecutar. Además las celdas pasan por
+SimulationCache: al cambiar un valor del defensor la etapa matrices se
+repite, pero solo se simulan las columnas nuevas.
+"""
+
+import csv
+import graphlib
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import tomllib
+from functools import partial
+
+import numpy as np
+
+from .nash import eliminate_dominated, expand_equilibria, solve_nash
+
+from .cache import SimulationCache, source_hash
+from .figures import FigureRenderer, fingerprint
+from .parallel import build_payoff_matrices
+from .result_store import ResultStore, save_payoffs
+from .scenarios import (SCENARIOS, cell_model, initial_state, label, make_model,
+                        parameters, simulator_class, strategies, strategy_labels)
+
+# Directorio (dentro de la salida del experimento) con los resultados de cada
+# etapa y el manifiesto de llaves
+STAGE_DIRECTORY = ".etapas"
+MANIFEST = "manifiesto.json"
+
+CONDITIONS = {"N": 10000, "I0": 15, "dt": 1.0, "total_time": 168.0}
+GAME = {"method": "support", "eliminate": None}
+FIGURES = {"heatmaps": True, "nash": True}
+TABLES = {"csv": True}
+
+
+class Stage:
+    """
+    Etapa del DAG: func(experiment, params, **resultados_de_deps) -> resultado.
+
+    El resultado se guarda con pickle. Si es un diccionario con "files", la
+    etapa también se repite cuando falta alguno de esos archivos. `code` son
+    clases o funciones cuyo paquete (todos los .py del directorio) entra en
+    la llave, como en SimulationCache.
+    """
+
+    __slots__ = ("name", "func", "deps", "params", "code")
+
+    def __init__(self, name, func, deps=(), params=None, code=()):
+        self.name = name
+        self.func = func
+        self.deps = tuple(deps)
+        self.params = params or {}
+        self.code = tuple(code)
+
+
+class Experiment:
+    """
+    Ejecuta un conjunto de etapas en orden topológico saltando las que no
+    cambiaron. Las etapas reciben el experimento para usar la caché de
+    simulaciones, el renderizador de figuras y el número de procesos.
+    """
+
+    def __init__(self, stages, directory, cache=None, figures=None, workers=None,
+                 profiler=None):
+        self.stages = {stage.name: stage for stage in stages}
+        self.directory = directory
+        self.cache = cache if cache is not None else SimulationCache()
+        self.figures = figures if figures is not None else FigureRenderer()
+        self.workers = workers
+        self.profiler = profiler
+        self.results = {}
+
+    def key(self, stage, dep_keys):
+        digest = hashlib.sha256()
+        digest.update(stage.name.encode())
+        digest.update(inspect.getsource(stage.func).encode())
+        fingerprint(stage.params, digest)
+        if stage.code:
+            digest.update(source_hash(*stage.code).encode())
+        for key in dep_keys:
+            digest.update(key.encode())
+        return digest.hexdigest()
+
+    def _path(self, *names):
+        return os.path.join(self.directory, STAGE_DIRECTORY, *names)
+
+    def _load_manifest(self):
+        try:
+            with open(self._path(MANIFEST), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_manifest(self, manifest):
+        path = self._path(MANIFEST)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp, path)
+
+    def _available(self, name, entry):
+        return (os.path.exists(self._path(f"{name}.pkl"))
+                and all(os.path.exists(path) for path in entry.get("files", [])))
+
+    def result(self, name):
+        """Resultado de una etapa (se lee del disco si se saltó en esta corrida)."""
+        if name not in self.results:
+            with open(self._path(f"{name}.pkl"), "rb") as f:
+                self.results[name] = pickle.load(f)
+        return self.results[name]
+
+    def _store(self, name, result):
+        path = self._path(f"{name}.pkl")
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+    def run(self, force=False):
+        """
+        Ejecuta las etapas cuya llave cambió (todas con force=True).
+
+        Returns:
+            Diccionario {etapa: "ejecutada" | "sin cambios"} en orden de ejecución.
+        """
+        os.makedirs(self._path(), exist_ok=True)
+        graph = {name: stage.deps for name, stage in self.stages.items()}
+        manifest = self._load_manifest()
+        keys = {}
+        status = {}
+        for name in graphlib.TopologicalSorter(graph).static_order():
+            stage = self.stages[name]
+            keys[name] = self.key(stage, [keys[dep] for dep in stage.deps])
+            entry = manifest.get(name)
+            if (not force and entry is not None and entry["key"] == keys[name]
+                    and self._available(name, entry)):
+                status[name] = "sin cambios"
+                continue
+
+            inputs = {dep: self.result(dep) for dep in stage.deps}
+            if self.profiler is not None:
+                with self.profiler.phase(name):
+                    result = stage.func(self, stage.params, **inputs)
+            else:
+                result = stage.func(self, stage.params, **inputs)
+            self.results[name] = result
+            self._store(name, result)
+
+            files = result.get("files", []) if isinstance(result, dict) else []
+            manifest[name] = {"key": keys[name], "files": list(files)}
+            # Se guarda tras cada etapa para no perder lo hecho si otra falla
+            self._save_manifest(manifest)
+            status[name] = "ejecutada"
+        return status
+
+
+# ---------------------------------------------------------------
+# Configuración
+# ---------------------------------------------------------------
+
+def _normalize(values, scenario, where):
+    """Pasa "lambda" a "lambda_" y rechaza parámetros que el escenario no usa."""
+    names = parameters(scenario)
+    result = {}
+    for key, value in values.items():
+        name = "lambda_" if key == "lambda" else key
+        if name not in names:
+            raise ValueError(f"{where}: el escenario {scenario} no usa el parámetro {key!r}")
+        result[name] = value
+    return result
+
+
+def load_config(path):
+    """
+    Lee y valida la configuración TOML de un experimento. Las rutas de
+    salida son relativas al archivo de configuración.
+    """
+    with open(path, "rb") as f:
+        raw = tomllib.load(f)
+
+    experiment = raw.get("experiment", {})
+    scenario = experiment.get("scenario")
+    if scenario not in SCENARIOS:
+        raise ValueError(f"[experiment] scenario debe ser uno de {', '.join(SCENARIOS)}")
+    name = experiment.get("name", os.path.splitext(os.path.basename(path))[0])
+    output = os.path.join(os.path.dirname(os.path.abspath(path)),
+                          experiment.get("output", os.path.join("results", name)))
+
+    strategies = {**SCENARIOS[scenario]["grid"],
+                  **_normalize(raw.get("strategies", {}), scenario, "[strategies]")}
+    strategies = {n: [float(v) for v in np.atleast_1d(values)]
+                  for n, values in strategies.items()}
+
+    cases = []
+    for k, case in enumerate(raw.get("cases", []), 1):
+        values = {key: v for key, v in case.items() if key not in ("title", "file")}
+        cell = {**SCENARIOS[scenario]["cell"], **_normalize(values, scenario, f"[[cases]] {k}")}
+        cases.append({"title": case.get("title", f"Caso {k}"),
+                      "file": case.get("file", f"caso_{k}.png"),
+                      "cell": {n: float(v) for n, v in cell.items()}})
+
+    game = {**GAME, **raw.get("game", {})}
+    if game["eliminate"] not in (None, "pure", "mixed"):
+        raise ValueError("[game] eliminate debe ser \"pure\" o \"mixed\"")
+
+    return {
+        "name": name,
+        "scenario": scenario,
+        "output": output,
+        "conditions": {**CONDITIONS, **raw.get("conditions", {})},
+        "strategies": strategies,
+        "game": game,
+        "cases": cases,
+        "figures": {**FIGURES, **raw.get("figures", {})},
+        "tables": {**TABLES, **raw.get("tables", {})},
+    }
+
+
+# ---------------------------------------------------------------
+# Etapas
+# ---------------------------------------------------------------
+
+def stage_matrices(experiment, params):
+    scenario, conditions = params["scenario"], params["conditions"]
+    misses = experiment.cache.misses
+    A, D = build_payoff_matrices(
+        partial(cell_model, scenario, conditions["N"]), simulator_class(scenario),
+        *strategies(scenario, params["strategies"]),
+        initial_state(scenario, conditions["N"], conditions["I0"]),
+        conditions["dt"], conditions["total_time"], workers=experiment.workers,
+        cache=experiment.cache, profiler=experiment.profiler)
+    attackers, defenders = strategy_labels(scenario, params["strategies"])
+    return {"attacker": attackers, "defender": defenders,
+            "payoff_attacker": A, "payoff_defender": D,
+            "simulated": experiment.cache.misses - misses}
+
+
+def stage_reduce(experiment, params, matrices):
+    A, D = matrices["payoff_attacker"], matrices["payoff_defender"]
+    if params["eliminate"] is None:
+        return {"rows": np.arange(A.shape[0]), "cols": np.arange(A.shape[1])}
+    rows, cols = eliminate_dominated(A, D, mixed=params["eliminate"] == "mixed")
+    return {"rows": rows, "cols": cols}
+
+
+def stage_nash(experiment, params, matrices, reduccion):
+    A, D = matrices["payoff_attacker"], matrices["payoff_defender"]
+    block = np.ix_(reduccion["rows"], reduccion["cols"])
+    equilibria = expand_equilibria(solve_nash(A[block], D[block], method=params["method"]),
+                                   reduccion["rows"], reduccion["cols"], A.shape)
+    return [{"attacker": p, "defender": q,
+             "payoff_attacker": float(p @ A @ q), "payoff_defender": float(p @ D @ q)}
+            for p, q in equilibria]
+
+
+def stage_cases(experiment, params):
+    scenario, conditions = params["scenario"], params["conditions"]
+    results = []
+    for case in params["cases"]:
+        model = make_model(scenario, case["cell"], conditions["N"])
+        run = experiment.cache.run(simulator_class(scenario), model,
+                                   initial_state(scenario, conditions["N"], conditions["I0"]),
+                                   conditions["dt"], conditions["total_time"], trajectories=True)
+        results.append({**case, "trajectory": run["trajectory"]})
+    return results
+
+
+def stage_figures(experiment, params, matrices, nash, casos):
+    directory = params["directory"]
+    figures = experiment.figures
+    if params["heatmaps"]:
+        figures.submit(os.path.join(directory, "heatmaps.png"), plot_heatmaps,
+                       matrices["payoff_attacker"], matrices["payoff_defender"],
+                       matrices["attacker"], matrices["defender"])
+    if params["nash"] and nash:
+        figures.submit(os.path.join(directory, "nash_mixto.png"), plot_mixed_strategies,
+                       nash[0]["attacker"], nash[0]["defender"],
+                       matrices["attacker"], matrices["defender"])
+    names = parameters(params["scenario"])
+    for case in casos:
+        figures.submit(os.path.join(directory, case["file"]), plot_case, case["trajectory"],
+                       case["title"], label(names, [case["cell"][n] for n in names]))
+    status = figures.flush()
+    return {"files": list(status), "status": status}
+
+
+def stage_tables(experiment, params, matrices, nash):
+    store = ResultStore(params["directory"])
+    save_payoffs(store, params["scenario"], params["strategies"],
+                 matrices["payoff_attacker"], matrices["payoff_defender"], csv=params["csv"])
+    names = ["payoff_attacker", "payoff_defender"]
+    for side in ("attacker", "defender"):
+        probabilities = np.array([eq[side] for eq in nash]).reshape(len(nash), -1)
+        store.save(f"equilibria_{side}", probabilities,
+                   {"equilibrio": None, "estrategia": matrices[side]})
+        names.append(f"equilibria_{side}")
+    files = [store.path(name) for name in names]
+
+    if params["csv"]:
+        files += [os.path.join(store.directory, name + ".csv") for name in names[:2]]
+        path = os.path.join(store.directory, "equilibrios.csv")
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f, lineterminator="\n")
+            writer.writerow(["equilibrio", "jugador", "estrategia", "probabilidad"])
+            for k, eq in enumerate(nash, 1):
+                for player, side in (("atacante", "attacker"), ("defensor", "defender")):
+                    for strategy, prob in zip(matrices[side], eq[side]):
+                        if prob > 1e-9:
+                            writer.writerow([k, player, strategy, repr(float(prob))])
+        files.append(path)
+    return {"files": files}
+
+
+def build_stages(config):
+    scenario = config["scenario"]
+    base = {"scenario": scenario, "conditions": config["conditions"]}
+    simulator = simulator_class(scenario)
+    return [
+        Stage("matrices", stage_matrices,
+              params={**base, "strategies": config["strategies"]}, code=(simulator,)),
+        Stage("reduccion", stage_reduce, deps=("matrices",),
+              params={"eliminate": config["game"]["eliminate"]}, code=(solve_nash,)),
+        Stage("nash", stage_nash, deps=("matrices", "reduccion"),
+              params={"method": config["game"]["method"]}, code=(solve_nash,)),
+        Stage("casos", stage_cases, params={**base, "cases": config["cases"]}, code=(simulator,)),
+        Stage("figuras", stage_figures, deps=("matrices", "nash", "casos"),
+              params={"scenario": scenario, "directory": config["output"],
+                      **config["figures"]}, code=(plot_case,)),
+        Stage("tablas", stage_tables, deps=("matrices", "nash"),
+              params={"scenario": scenario, "strategies": config["strategies"],
+                      "directory": config["output"], **config["tables"]}),
+    ]
+
+
+def run_experiment(path, force=False, workers=None, cache=None, profiler=None):
+    """
+    Carga la configuración y ejecuta el experimento.
+
+    Returns:
+        (experiment, status) con status = {etapa: "ejecutada" | "sin cambios"}.
+    """
+    config = load_config(path)
+    os.makedirs(config["output"], exist_ok=True)
+    experiment = Experiment(build_stages(config), config["output"], cache=cache,
+                            workers=workers, profiler=profiler)
+    return experiment, experiment.run(force=force)
+
+
+# ---------------------------------------------------------------
+# Figuras (a nivel de módulo para los procesos de FigureRenderer)
+# ---------------------------------------------------------------
+
+# Estilo de cada variable de las trayectorias (como en analyze_case.py)
+STYLES = {"S": ("b--", "Susceptible"), "I": ("r-", "Infectado"), "R": ("g-.", "Recuperado/Inmune")}
+
+
+def plot_case(trajectory, title, subtitle):
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(10, 6))
+    for column, values in trajectory.items():
+        if column in STYLES:
+            style, name = STYLES[column]
+            plt.plot(trajectory["t"], values, style, linewidth=2, label=name)
+    plt.title(f"{title}\n{subtitle}")
+    plt.xlabel("Tiempo (horas)")
+    plt.ylabel("Nodos")
+    plt.grid(True, alpha=0.3)
+    plt.legend()
+    plt.tight_layout()
+
+
+def plot_heatmaps(A, D, attackers, defenders):
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(18, 6))
+    for k, (matrix, title, cmap) in enumerate(((A, "Payoff del Atacante", "Reds"),
+                                               (D, "Payoff del Defensor", "Greens")), 1):
+        plt.subplot(1, 2, k)
+        plt.imshow(matrix, aspect="auto", cmap=cmap)
+        plt.colorbar()
+        plt.yticks(range(len(attackers)), attackers, fontsize=7)
+        plt.xticks(range(len(defenders)), defenders, rotation=90, fontsize=7)
+        plt.title(title)
+    plt.tight_layout()
+
+
+def plot_mixed_strategies(p, q, attackers, defenders):
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(12, 5))
+
+    plt.subplot(1, 2, 1)
+    plt.bar(range(len(attackers)), p, color="red")
+    plt.xticks(range(len(attackers)), attackers, rotation=90, fontsize=7)
+    plt.title("Estrategia Mixta Atacante")
+    plt.ylabel("Probabilidad")
+
+    plt.subplot(1, 2, 2)
+    plt.bar(range(len(defenders)), q, color="green")
+    plt.xticks(range(len(defenders)), defenders, rotation=90, fontsize=7)
+    plt.title("Estrategia Mixta Defensor")
+
+    plt.tight_layout()
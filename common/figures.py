@@ -0,0 +1,185 @@
+import hashlib
+import inspect
+import json
+import multiprocessing as mp
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Archivo (uno por directorio de salida) con la llave de cada figura ya generada
+MANIFEST = ".figuras.json"
+
+
+def fingerprint(value, digest):
+    """Agrega value al hash: arreglos por dtype, shape y bytes; contenedores recursivamente."""
+    if isinstance(value, np.ndarray):
+        if value.dtype == object:
+            digest.update(b"object")
+            fingerprint(value.tolist(), digest)
+        else:
+            digest.update(f"ndarray {value.dtype} {value.shape}".encode())
+            digest.update(np.ascontiguousarray(value).tobytes())
+    elif hasattr(value, "to_numpy") and hasattr(value, "index"):
+        # DataFrame / Series de pandas
+        digest.update(type(value).__name__.encode())
+        fingerprint(value.to_numpy(), digest)
+        fingerprint(list(value.index), digest)
+        fingerprint(list(getattr(value, "columns", [])), digest)
+    elif isinstance(value, (list, tuple)):
+        digest.update(f"{type(value).__name__} {len(value)}".encode())
+        for v in value:
+            fingerprint(v, digest)
+    elif isinstance(value, dict):
+        digest.update(f"dict {len(value)}".encode())
+        for k in sorted(value, key=repr):
+            fingerprint(k, digest)
+            fingerprint(value[k], digest)
+    else:
+        digest.update(repr(value).encode())
+        digest.update(b"\0")
+
+
+def _source(func):
+    try:
+        return inspect.getsource(func)
+    except (OSError, TypeError):
+        return f"{func.__module__}.{func.__qualname__}"
+
+
+def _render(path, draw, args, kwargs):
+    """
+    Dibuja con pyplot (backend Agg, también en este proceso: sin ventanas ni
+    display) y guarda de forma atómica (archivo temporal y os.replace).
+    """
+    import matplotlib.pyplot as plt
+    if plt.get_backend().lower() != "agg":
+        plt.switch_backend("Agg")
+    try:
+        draw(*args, **kwargs)
+        root, ext = os.path.splitext(path)
+        tmp = f"{root}.{os.getpid()}.tmp{ext}"
+        plt.savefig(tmp)
+        os.replace(tmp, path)
+    finally:
+        plt.close("all")
+    return path
+
+
+class FigureRenderer:
+    """
+    Generación de figuras en procesos trabajadores (backend Agg), saltando
+    las que no cambiaron.
+
+    submit(path, draw, *args, **kwargs) encola una figura: draw dibuja con
+    pyplot en la figura actual (puede crearla con plt.figure) y el
+    renderizador la guarda en path y la cierra. Debe estar definida a nivel
+    de módulo y ser pura en sus argumentos: todo lo que aparece en la figura
+    (títulos incluidos) debe llegar por args/kwargs, nunca leerse de
+    variables globales del script. La llave de la figura es un SHA-256 del
+    código de draw, de los argumentos (arreglos y DataFrames por contenido)
+    y de la versión de matplotlib, así que un global que cambie no la
+    invalida. Si el archivo existe, no fue modificado y su llave guardada en
+    el manifiesto del directorio coincide, no se vuelve a dibujar.
+
+    flush() genera todas las figuras pendientes. Los trabajadores se crean
+    con "fork" (las funciones del script ya están definidas en ellos); si
+    "fork" no existe o workers=1 se dibuja en este proceso.
+    """
+
+    def __init__(self, workers=None, enabled=True):
+        self.workers = workers
+        self.enabled = enabled
+        self.pending = []
+        self.rendered = 0
+        self.skipped = 0
+
+    def key(self, draw, args, kwargs):
+        import matplotlib
+        digest = hashlib.sha256()
+        digest.update(f"{draw.__module__}.{draw.__qualname__}".encode())
+        digest.update(_source(draw).encode())
+        digest.update(matplotlib.__version__.encode())
+        fingerprint(list(args), digest)
+        fingerprint(kwargs, digest)
+        return digest.hexdigest()
+
+    def submit(self, path, draw, *args, **kwargs):
+        self.pending.append((os.path.abspath(path), draw, args, kwargs))
+
+    @staticmethod
+    def _load_manifest(directory):
+        try:
+            with open(os.path.join(directory, MANIFEST), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _save_manifest(directory, manifest):
+        path = os.path.join(directory, MANIFEST)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _unchanged(path, entry, key):
+        if entry is None or entry["key"] != key or not os.path.exists(path):
+            return False
+        st = os.stat(path)
+        return entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns
+
+    def flush(self):
+        """
+        Genera las figuras pendientes.
+
+        Returns:
+            Diccionario {ruta: "generada" | "sin cambios"} en el orden de submit().
+        """
+        pending, self.pending = self.pending, []
+        manifests = {}
+        status = {}
+        jobs = []
+        for path, draw, args, kwargs in pending:
+            directory, name = os.path.split(path)
+            manifest = manifests.setdefault(directory, self._load_manifest(directory))
+            key = self.key(draw, args, kwargs)
+            if self.enabled and self._unchanged(path, manifest.get(name), key):
+                status[path] = "sin cambios"
+            else:
+                status[path] = None
+                jobs.append((path, key, draw, args, kwargs))
+
+        workers = self.workers or os.cpu_count() or 1
+        workers = max(1, min(workers, len(jobs)))
+        try:
+            if workers == 1 or "fork" not in mp.get_all_start_methods():
+                done = (_render(path, draw, args, kwargs)
+                        for path, _, draw, args, kwargs in jobs)
+                self._record(done, jobs, manifests)
+            else:
+                with ProcessPoolExecutor(max_workers=workers,
+                                         mp_context=mp.get_context("fork")) as pool:
+                    futures = [pool.submit(_render, path, draw, args, kwargs)
+                               for path, _, draw, args, kwargs in jobs]
+                    self._record((f.result() for f in futures), jobs, manifests)
+        finally:
+            # Las figuras ya generadas quedan registradas aunque otra falle
+            for directory, manifest in manifests.items():
+                self._save_manifest(directory, manifest)
+
+        self.skipped += sum(s == "sin cambios" for s in status.values())
+        self.rendered += len(jobs)
+        return {path: s or "generada" for path, s in status.items()}
+
+    @staticmethod
+    def _record(done, jobs, manifests):
+        for path, (_, key, *_) in zip(done, jobs):
+            st = os.stat(path)
+            directory, name = os.path.split(path)
+            manifests[directory][name] = {"key": key, "size": st.st_size,
+                                          "mtime_ns": st.st_mtime_ns}
+
+    def report(self):
+        return f"Figuras: {self.rendered} generadas, {self.skipped} sin cambios"
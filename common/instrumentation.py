@@ -0,0 +1,112 @@
+import json
+import os
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+# Percentiles de latencia por celda que se reportan
+PERCENTILES = (50, 90, 99)
+
+
+class Profiler:
+    """
+    Temporizadores por fase (construcción de matrices, equilibrio, figuras...)
+    con salida JSON.
+
+    Cada medición es un evento (segundos, celdas): phase() mide un bloque
+    `with`, record() agrega una medición hecha por otro lado (por ejemplo en
+    un proceso trabajador). Por fase se reportan cantidad de eventos y
+    tiempo total. Los percentiles de la latencia por celda (segundos /
+    celdas de cada evento) solo se reportan para las fases cuyos eventos
+    traen un número de celdas (cells); un evento sin cells, como resolver
+    un equilibrio una vez, solo aporta tiempo. Con enabled=False phase() no
+    mide nada.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.events = {}
+        self.start = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name, cells=None):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start, cells)
+
+    def record(self, name, seconds, cells=None):
+        if self.enabled:
+            self.events.setdefault(name, []).append((seconds, cells))
+
+    def summary(self):
+        """
+        {fase: {"count", "total"}}; si algún evento de la fase trae celdas,
+        además "cells", "mean", "p50", "p90", "p99" y "max" por celda
+        (calculados solo con esos eventos).
+        """
+        result = {}
+        for name, events in self.events.items():
+            seconds = np.array([s for s, _ in events], dtype=float)
+            result[name] = {"count": len(events), "total": float(seconds.sum())}
+
+            counted = np.array([(s, c) for s, c in events if c], dtype=float)
+            if len(counted):
+                seconds, cells = counted.T
+                latency = seconds / cells
+                result[name].update({
+                    "cells": int(cells.sum()),
+                    "mean": float(seconds.sum() / cells.sum()),
+                    **{f"p{q}": float(np.percentile(latency, q)) for q in PERCENTILES},
+                    "max": float(latency.max()),
+                })
+        return result
+
+    def save(self, path, **meta):
+        """Escribe {"meta": ..., "wall_time": ..., "phases": summary()} en JSON."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        data = {"meta": meta, "wall_time": time.perf_counter() - self.start,
+                "phases": self.summary()}
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+    def report(self):
+        wall = time.perf_counter() - self.start
+        lines = [f"Tiempos por fase ({wall:.2f} s en total):"]
+        phases = sorted(self.summary().items(), key=lambda item: -item[1]["total"])
+        for name, s in phases:
+            line = (f"  {name:<16} {s['total']:8.3f} s ({100 * s['total'] / wall:5.1f}%)  "
+                    f"{s['count']} eventos")
+            if "cells" in s:
+                line += (f", {s['cells']} celdas, por celda "
+                         f"p50 {1e3 * s['p50']:.3f} ms, p99 {1e3 * s['p99']:.3f} ms")
+            lines.append(line)
+        return "\n".join(lines)
+
+
+class StepObserver:
+    """
+    Observador para el parámetro observers de los simuladores: registra en
+    profiler la latencia de cada paso (tiempo entre dos llamadas seguidas
+    del mismo simulador) como un evento de la fase `name` con cells=1, así
+    que los percentiles de la fase son los de la latencia por paso. El
+    primer paso de cada simulador solo fija la referencia.
+    """
+
+    def __init__(self, profiler, name="paso"):
+        self.profiler = profiler
+        self.name = name
+        self.sim = None
+        self.last = None
+
+    def __call__(self, sim):
+        now = time.perf_counter()
+        if sim is self.sim:
+            self.profiler.record(self.name, now - self.last, cells=1)
+        self.sim = sim
+        self.last = now
@@ -0,0 +1,109 @@
+import numpy as np
+
+# Coeficientes del par embebido Dormand–Prince 5(4)
+_C = np.array([0.0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1.0, 1.0])
+_A = [
+    [],
+    [1 / 5],
+    [3 / 40, 9 / 40],
+    [44 / 45, -56 / 15, 32 / 9],
+    [19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729],
+    [9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656],
+    [35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84],
+]
+_B5 = np.array([35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84, 0.0])
+_B4 = np.array([5179 / 57600, 0.0, 7571 / 16695, 393 / 640,
+                -92097 / 339200, 187 / 2100, 1 / 40])
+_E = _B5 - _B4
+
+
+def _rms(x):
+    return np.sqrt(np.mean(x * x))
+
+
+def dopri5(f, y0, t_end, t_eval, rtol=1e-6, atol=1e-6, max_step=np.inf):
+    """
+    Integra y' = f(t, y) en [0, t_end] con el par Runge–Kutta embebido
+    Dormand–Prince 5(4) y paso adaptativo controlado por el error local.
+
+    La solución se interpola (Hermite cúbico) sobre t_eval, de modo que el
+    paso interno puede ser mucho mayor que el espaciado de la malla de salida.
+
+    Args:
+        f: Función f(t, y) -> arreglo con las derivadas.
+        y0: Estado inicial.
+        t_end: Tiempo final de integración.
+        t_eval: Tiempos ordenados en [0, t_end] donde se reporta la solución.
+        rtol, atol: Tolerancias relativa y absoluta del error local.
+        max_step: Paso máximo permitido.
+
+    Returns:
+        Tupla (y_eval, n_evals, n_steps): estados en t_eval con shape
+        (len(t_eval), len(y0)), evaluaciones del lado derecho y pasos aceptados.
+    """
+    y = np.asarray(y0, dtype=float)
+    t_eval = np.asarray(t_eval, dtype=float)
+    y_eval = np.empty((len(t_eval), len(y)))
+
+    t = 0.0
+    k1 = np.asarray(f(t, y), dtype=float)
+    n_evals = 1
+    n_steps = 0
+
+    # Paso inicial (heurística de Hairer–Nørsett–Wanner)
+    scale = atol + rtol * np.abs(y)
+    d0, d1 = _rms(y / scale), _rms(k1 / scale)
+    h0 = 1e-6 if d0 < 1e-5 or d1 < 1e-5 else 0.01 * d0 / d1
+    h0 = min(h0, t_end)
+    k_probe = np.asarray(f(t + h0, y + h0 * k1), dtype=float)
+    n_evals += 1
+    d2 = _rms((k_probe - k1) / scale) / h0
+    if max(d1, d2) <= 1e-15:
+        h1 = max(1e-6, h0 * 1e-3)
+    else:
+        h1 = (0.01 / max(d1, d2)) ** (1 / 5)
+    h = min(100 * h0, h1, max_step)
+
+    # Salidas en t <= 0
+    idx = 0
+    while idx < len(t_eval) and t_eval[idx] <= t:
+        y_eval[idx] = y
+        idx += 1
+
+    K = np.empty((7, len(y)))
+    while t < t_end:
+        h = min(h, t_end - t, max_step)
+
+        K[0] = k1
+        for s in range(1, 7):
+            y_stage = y + h * np.dot(_A[s], K[:s])
+            K[s] = f(t + _C[s] * h, y_stage)
+        n_evals += 6
+
+        y_new = y + h * np.dot(_B5, K)
+        err = h * np.dot(_E, K)
+        scale = atol + rtol * np.maximum(np.abs(y), np.abs(y_new))
+        err_norm = _rms(err / scale)
+
+        if err_norm <= 1.0:
+            t_new = t + h
+            # Interpolación de Hermite sobre los puntos de salida del paso
+            while idx < len(t_eval) and t_eval[idx] <= t_new:
+                theta = (t_eval[idx] - t) / h
+                h00 = (1 + 2 * theta) * (1 - theta) ** 2
+                h10 = theta * (1 - theta) ** 2
+                h01 = theta ** 2 * (3 - 2 * theta)
+                h11 = theta ** 2 * (theta - 1)
+                y_eval[idx] = h00 * y + h10 * h * K[0] + h01 * y_new + h11 * h * K[6]
+                idx += 1
+
+            t, y, k1 = t_new, y_new, K[6].copy()
+            n_steps += 1
+            factor = 10.0 if err_norm == 0 else min(10.0, 0.9 * err_norm ** -0.2)
+        else:
+            factor = max(0.2, 0.9 * err_norm ** -0.2)
+        h *= factor
+
+    # Puntos fuera del horizonte (por redondeo) toman el último estado
+    y_eval[idx:] = y
+    return y_eval, n_evals, n_steps
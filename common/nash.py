@@ -0,0 +1,616 @@
+import numpy as np
+from itertools import combinations
+from scipy.optimize import linprog
+
+def support_enumeration(A, B):
+    """
+    Encuentra el Equilibrio de Nash en estrategias mixtas para un juego bimatricial (A, B)
+    usando el método de Enumeración de Soportes.
+    
+    Args:
+        A: Matriz de payoffs del Jugador 1 (Atacante)
+        B: Matriz de payoffs del Jugador 2 (Defensor)
+        
+    Returns:
+        Lista de tuplas (p, q), donde p es la estrategia del J1 y q del J2.
+    """
+    m, n = A.shape
+    equilibria = []
+
+    # Iterar sobre todos los tamaños de soporte posibles k
+    for k in range(1, min(m, n) + 1):
+        # Iterar sobre todas las combinaciones de k estrategias para cada jugador
+        for support_row in combinations(range(m), k):
+            for support_col in combinations(range(n), k):
+                
+                try:
+                    beta_mat = B[np.ix_(support_row, support_col)].T
+                    # Agregamos restricción de suma = 1
+                    left_side_p = np.vstack([beta_mat, np.ones((1, k))])
+                    right_side_p = np.append(np.zeros(k), 1.0)
+                    
+                    # Como el sistema puede ser sobredeterminado con la restricción de suma,
+                    # usamos mínimos cuadrados si k < n, o solución directa si cuadra.
+                    # Simplificación para soporte k: Resolver B_sub.T * p = const
+                    
+                    # Método robusto:
+                    M_p = np.zeros((k+1, k+1))
+                    M_p[:-1, :-1] = beta_mat
+                    M_p[:-1, -1] = -1 # constante v
+                    M_p[-1, :-1] = 1  # suma p = 1
+                    M_p[-1, -1] = 0
+                    
+                    rhs_p = np.zeros(k+1)
+                    rhs_p[-1] = 1
+                    
+                    sol_p = np.linalg.solve(M_p, rhs_p)
+                    p_sub = sol_p[:-1]
+                    val_v = sol_p[-1]
+                    
+                    # Resolver q (Estrategia del Defensor) usando la matriz A (Atacante)
+                    M_q = np.zeros((k+1, k+1))
+                    M_q[:-1, :-1] = A[np.ix_(support_row, support_col)]
+                    M_q[:-1, -1] = -1 # constante u
+                    M_q[-1, :-1] = 1  # suma q = 1
+                    M_q[-1, -1] = 0
+                    
+                    rhs_q = np.zeros(k+1)
+                    rhs_q[-1] = 1
+                    
+                    sol_q = np.linalg.solve(M_q, rhs_q)
+                    q_sub = sol_q[:-1]
+                    val_u = sol_q[-1]
+                    
+                    # Verificar si las probabilidades son válidas (>= 0)
+                    if np.all(p_sub >= -1e-10) and np.all(q_sub >= -1e-10):
+                        # Construir vectores completos
+                        p = np.zeros(m)
+                        p[list(support_row)] = p_sub
+                        p = np.maximum(p, 0) # Limpiar ruido numérico negativo
+                        p /= p.sum() # Renormalizar
+                        
+                        q = np.zeros(n)
+                        q[list(support_col)] = q_sub
+                        q = np.maximum(q, 0)
+                        q /= q.sum()
+                        
+                        # VERIFICAR CONDICIÓN DE MEJOR RESPUESTA (NASH)
+                        # Nadie debe tener incentivo de cambiar a una estrategia fuera del soporte
+                        
+                        # Payoff esperado del Atacante si juega contra q
+                        payoff_A = np.dot(A, q)
+                        # El payoff en el soporte debe ser >= payoff fuera del soporte
+                        max_payoff_A = np.max(payoff_A)
+                        current_payoff_A = np.dot(p, payoff_A) # Debería ser val_u aproximadamente
+                        
+                        # Payoff esperado del Defensor si J1 juega p
+                        payoff_B = np.dot(p, B)
+                        max_payoff_B = np.max(payoff_B)
+                        current_payoff_B = np.dot(payoff_B, q)
+                        
+                        tol = 1e-6
+                        if (abs(max_payoff_A - current_payoff_A) < tol) and \
+                           (abs(max_payoff_B - current_payoff_B) < tol):
+                            
+                            # Evitar duplicados
+                            is_new = True
+                            for ep, eq in equilibria:
+                                if np.allclose(p, ep) and np.allclose(q, eq):
+                                    is_new = False
+                                    break
+                            if is_new:
+                                equilibria.append((p, q))
+                                
+                except np.linalg.LinAlgError:
+                    continue
+
+    return equilibria
+
+
+def _well_conditioned(M, tol):
+    """
+    Máscara de sistemas no singulares: razón de Hadamard
+    |det M| / prod(||fila_i||) >= tol (invariante a la escala, 0 si M es singular).
+    """
+    return np.abs(np.linalg.det(M)) >= tol * np.prod(np.linalg.norm(M, axis=2), axis=1)
+
+
+def _support_systems(P_sub, k):
+    """
+    Sistemas (k+1)x(k+1) apilados [[P_sub, -1], [1, 0]] para cada soporte.
+    P_sub tiene shape (pares, k, k).
+    """
+    M = np.zeros((len(P_sub), k + 1, k + 1))
+    M[:, :-1, :-1] = P_sub
+    M[:, :-1, -1] = -1
+    M[:, -1, :-1] = 1
+    return M
+
+
+def support_enumeration_batched(A, B, tol=1e-6, cond_tol=1e-12, batch_size=65536):
+    """
+    Enumeración de soportes vectorizada: mismos equilibrios y mismo orden
+    que support_enumeration.
+
+    Para cada tamaño k se arman los sistemas de todos los pares de soportes
+    como un arreglo apilado y se resuelven con una sola llamada a
+    np.linalg.solve. Los sistemas singulares o casi singulares se descartan
+    con una máscara (ver _well_conditioned) en lugar de capturar LinAlgError. Factibilidad,
+    condición de mejor respuesta y eliminación de duplicados (conjunto de
+    hashes redondeados) también son vectorizadas.
+
+    Returns:
+        Lista de tuplas (p, q), donde p es la estrategia del J1 y q del J2.
+    """
+    A = np.asarray(A, dtype=float)
+    B = np.asarray(B, dtype=float)
+    m, n = A.shape
+    equilibria = []
+    seen = set()
+
+    for k in range(1, min(m, n) + 1):
+        rows = np.array(list(combinations(range(m), k)))
+        cols = np.array(list(combinations(range(n), k)))
+        # Pares en el mismo orden que los ciclos anidados (fila externa, columna interna)
+        pairs = np.arange(len(rows) * len(cols))
+
+        for start in range(0, len(pairs), batch_size):
+            chunk = pairs[start:start + batch_size]
+            sr = rows[chunk // len(cols)]          # (pares, k)
+            sc = cols[chunk % len(cols)]           # (pares, k)
+            A_sub = A[sr[:, :, None], sc[:, None, :]]
+            B_sub = B[sr[:, :, None], sc[:, None, :]]
+
+            M_p = _support_systems(np.swapaxes(B_sub, 1, 2), k)
+            M_q = _support_systems(A_sub, k)
+            ok = _well_conditioned(M_p, cond_tol) & _well_conditioned(M_q, cond_tol)
+            if not ok.any():
+                continue
+            sr, sc, M_p, M_q = sr[ok], sc[ok], M_p[ok], M_q[ok]
+
+            rhs = np.zeros((len(sr), k + 1, 1))
+            rhs[:, -1] = 1
+            p_sub = np.linalg.solve(M_p, rhs)[:, :-1, 0]
+            q_sub = np.linalg.solve(M_q, rhs)[:, :-1, 0]
+
+            # Probabilidades válidas (>= 0)
+            ok = np.all(p_sub >= -1e-10, axis=1) & np.all(q_sub >= -1e-10, axis=1)
+            if not ok.any():
+                continue
+            sr, sc, p_sub, q_sub = sr[ok], sc[ok], p_sub[ok], q_sub[ok]
+
+            idx = np.arange(len(sr))[:, None]
+            p = np.zeros((len(sr), m))
+            p[idx, sr] = np.maximum(p_sub, 0)
+            q = np.zeros((len(sr), n))
+            q[idx, sc] = np.maximum(q_sub, 0)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                p /= p.sum(axis=1, keepdims=True)
+                q /= q.sum(axis=1, keepdims=True)
+
+            # Condición de mejor respuesta para ambos jugadores
+            payoff_A = q @ A.T
+            payoff_B = p @ B
+            gap_A = payoff_A.max(axis=1) - np.einsum("ij,ij->i", p, payoff_A)
+            gap_B = payoff_B.max(axis=1) - np.einsum("ij,ij->i", q, payoff_B)
+            nash = (np.abs(gap_A) < tol) & (np.abs(gap_B) < tol)
+
+            # Duplicados por hash de las estrategias redondeadas
+            keys = np.round(np.hstack([p, q]), 8) + 0.0
+            for i in np.flatnonzero(nash):
+                key = keys[i].tobytes()
+                if key not in seen:
+                    seen.add(key)
+                    equilibria.append((p[i], q[i]))
+
+    return equilibria
+
+def _lexicographic_min_ratio(T, entering, slack_columns, tol=1e-12):
+    """
+    Fila de salida del pivoteo al entrar la etiqueta `entering`: mínimo
+    cociente rhs / columna, con desempate lexicográfico sobre las columnas de
+    holgura iniciales (evita ciclos en juegos degenerados).
+    """
+    column = T[:, entering]
+    rows = np.flatnonzero(column > tol)
+    if len(rows) == 0:
+        raise ValueError(f"Columna de pivoteo no acotada al entrar la etiqueta {entering}: "
+                         "el juego no es no-degenerado")
+    for c in [-1] + list(slack_columns):
+        ratios = T[rows, c] / column[rows]
+        best = ratios.min()
+        rows = rows[ratios <= best + tol * max(1.0, abs(best))]
+        if len(rows) == 1:
+            break
+    return rows[0]
+
+
+def _pivot(T, basis, entering, slack_columns):
+    """Introduce la variable `entering` a la base y devuelve la etiqueta que sale."""
+    row = _lexicographic_min_ratio(T, entering, slack_columns)
+    T[row] /= T[row, entering]
+    others = np.arange(len(T)) != row
+    T[others] -= np.outer(T[others, entering], T[row])
+    leaving = basis[row]
+    basis[row] = entering
+    return leaving
+
+
+def lemke_howson(A, B, initial_label=0):
+    """
+    Un equilibrio de Nash por pivoteo complementario (Lemke–Howson).
+
+    Se trabaja con los politopos de mejor respuesta
+        P = {x >= 0 : B^T x <= 1}   (etiquetas i de x_i = 0, m + j de (B^T x)_j = 1)
+        Q = {y >= 0 : A y <= 1}     (etiquetas i de (A y)_i = 1, m + j de y_j = 0)
+    partiendo del punto artificial (0, 0). Se suelta la etiqueta initial_label
+    (0..m-1 estrategias del atacante, m..m+n-1 del defensor) y se pivotea
+    alternando entre P y Q hasta recuperarla.
+
+    Args:
+        A: Matriz de payoffs del Jugador 1 (Atacante)
+        B: Matriz de payoffs del Jugador 2 (Defensor)
+        initial_label: Etiqueta que se suelta al inicio.
+
+    Returns:
+        Tupla (p, q) con las estrategias mixtas del equilibrio.
+    """
+    A = np.asarray(A, dtype=float)
+    B = np.asarray(B, dtype=float)
+    m, n = A.shape
+    if not 0 <= initial_label < m + n:
+        raise ValueError(f"Etiqueta inicial fuera de rango: {initial_label}")
+
+    # Los politopos requieren payoffs positivos; desplazar no cambia los equilibrios
+    A = A - A.min() + 1.0
+    B = B - B.min() + 1.0
+
+    # Columnas: etiquetas 0..m+n-1 y al final el lado derecho
+    P = np.hstack([B.T, np.eye(n), np.ones((n, 1))])
+    Q = np.hstack([np.eye(m), A, np.ones((m, 1))])
+    basis_P = list(range(m, m + n))
+    basis_Q = list(range(m))
+    slack_P = list(range(m, m + n))
+    slack_Q = list(range(m))
+
+    # La etiqueta soltada entra a la base del politopo donde es no básica
+    entering = initial_label
+    in_P = initial_label < m
+    while True:
+        try:
+            if in_P:
+                leaving = _pivot(P, basis_P, entering, slack_P)
+            else:
+                leaving = _pivot(Q, basis_Q, entering, slack_Q)
+        except ValueError as err:
+            raise ValueError(f"{err} (juego {m}x{n}, etiqueta inicial {initial_label})") from err
+        if leaving == initial_label:
+            break
+        entering = leaving
+        in_P = not in_P
+
+    x = np.zeros(m)
+    for row, label in enumerate(basis_P):
+        if label < m:
+            x[label] = P[row, -1]
+    y = np.zeros(n)
+    for row, label in enumerate(basis_Q):
+        if label >= m:
+            y[label - m] = Q[row, -1]
+
+    x = np.maximum(x, 0)
+    y = np.maximum(y, 0)
+    return x / x.sum(), y / y.sum()
+
+
+def _polytope_vertices(G, h, dim, tol):
+    """
+    Vértices del politopo acotado {z : G z <= h} recorriendo bases vecinas
+    (BFS) desde la base de las primeras `dim` restricciones.
+
+    Una base es un conjunto de `dim` restricciones activas con G_S invertible.
+    Desde cada base se suelta una restricción, se avanza por la arista y se
+    agregan todas las restricciones que empatan en el cociente mínimo, así
+    que los vértices degenerados (más de `dim` restricciones activas) se
+    recorren por todas sus bases. Solo se visitan bases alcanzables, en vez
+    de probar todas las combinaciones de restricciones.
+
+    Returns:
+        Lista de (z, etiquetas activas) sin vértices repetidos.
+    """
+    start = tuple(range(dim))
+    visited = {start}
+    queue = [start]
+    vertices = {}
+    while queue:
+        S = queue.pop()
+        G_inv = np.linalg.inv(G[list(S)])
+        z = G_inv @ h[list(S)]
+        slack = h - G @ z
+
+        key = tuple(np.round(z, 9) + 0.0)
+        if key not in vertices:
+            vertices[key] = (z, frozenset(np.flatnonzero(slack <= tol)))
+
+        # Cocientes de todas las aristas a la vez: columna a = soltar S[a]
+        rates = -(G @ G_inv)
+        rates[list(S)] = 0.0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            steps = np.where(rates > tol, np.maximum(slack, 0)[:, None] / rates, np.inf)
+        best = steps.min(axis=0)
+        for a, entering in zip(*np.nonzero(steps.T <= best[:, None] + tol)):
+            neighbour = tuple(sorted(S[:a] + S[a + 1:] + (entering,)))
+            if neighbour not in visited:
+                visited.add(neighbour)
+                queue.append(neighbour)
+    return list(vertices.values())
+
+
+def _rank(M, tol=1e-9):
+    """Rango numérico de M (valores singulares relativos al mayor)."""
+    if M.size == 0:
+        return 0
+    sv = np.linalg.svd(M, compute_uv=False)
+    return int((sv > tol * max(sv[0], 1.0)).sum())
+
+
+def _complementary_vertices(A, needed, optional, tol):
+    """
+    Vértices y de Q = {y >= 0 : A y <= 1} con todas las etiquetas `needed`
+    (i < m: (A y)_i = 1; m + j: y_j = 0).
+
+    Las columnas con etiqueta m + j requerida son cero, así que el sistema se
+    arma solo sobre las columnas libres. En juegos degenerados las
+    ecuaciones de `needed` pueden ser dependientes (o más que las
+    incógnitas): se agregan tantas etiquetas `optional` como le falten de
+    rango al sistema y se aceptan los subsistemas de rango completo y
+    consistentes, que son los vértices de la cara complementaria.
+    """
+    m, n = A.shape
+    free = np.array([j for j in range(n) if m + j not in needed], dtype=int)
+    rows = [i for i in needed if i < m]
+    if len(free) == 0:
+        return []
+
+    # Ecuaciones disponibles sobre las columnas libres: filas de A (rhs 1)
+    # seguidas de y_j = 0 (rhs 0); etiqueta -> fila de E
+    E = np.vstack([A[:, free], np.eye(len(free))])
+    e_rhs = np.concatenate([np.ones(m), np.zeros(len(free))])
+    row_of = {i: i for i in range(m)}
+    row_of.update({m + j: m + k for k, j in enumerate(free)})
+
+    base = [row_of[i] for i in sorted(rows)]
+    extra = len(free) - _rank(E[base])
+    candidates = [row_of[label] for label in sorted(optional) if label in row_of]
+    found = {}
+    for added in combinations(candidates, extra):
+        idx = base + list(added)
+        M, rhs = E[idx], e_rhs[idx]
+        try:
+            if len(idx) == len(free):
+                y_free = np.linalg.solve(M, rhs)
+            else:
+                y_free = np.linalg.lstsq(M, rhs, rcond=None)[0]
+        except np.linalg.LinAlgError:
+            continue
+        if np.abs(M @ y_free - rhs).max(initial=0.0) > 1e-9:
+            continue
+        y = np.zeros(n)
+        y[free] = y_free
+        # El rango solo se revisa para los puntos factibles (los menos)
+        if (np.all(y >= -tol) and np.all(A @ y <= 1 + tol)
+                and _rank(M) == len(free)):
+            found.setdefault(tuple(np.round(y, 9) + 0.0), y)
+    return list(found.values())
+
+
+def vertex_enumeration(A, B, tol=1e-9):
+    """
+    Todos los equilibrios extremos del juego bimatricial (A, B), incluyendo
+    juegos degenerados y soportes de distinto tamaño.
+
+    Con payoffs positivos se usan los politopos de mejor respuesta
+        P = {x >= 0 : B^T x <= 1},   Q = {y >= 0 : A y <= 1}
+    con etiquetas 0..m-1 (estrategias del atacante) y m..m+n-1 (del
+    defensor). Un par de vértices (x, y) != (0, 0) cuyas etiquetas cubren
+    todas es un equilibrio. Se enumeran los vértices del politopo de menor
+    dimensión y, para cada uno, la cara complementaria del otro: en un
+    juego no degenerado es un único sistema; en uno degenerado es una cara
+    cuyos vértices se obtienen agregando etiquetas activas sobrantes.
+
+    En juegos degenerados los equilibrios forman componentes convexas; se
+    devuelven sus vértices (equilibrios extremos).
+
+    Returns:
+        Lista de tuplas (p, q), donde p es la estrategia del J1 y q del J2.
+    """
+    A = np.asarray(A, dtype=float)
+    B = np.asarray(B, dtype=float)
+    m, n = A.shape
+    if m > n:
+        # Se enumera siempre el politopo de menor dimensión
+        return [(p, q) for q, p in vertex_enumeration(B.T, A.T, tol)]
+
+    # Transformación afín positiva a [1, 2]: no cambia los equilibrios y deja
+    # las tolerancias en una escala fija
+    A = (A - A.min()) / (np.ptp(A) or 1.0) + 1.0
+    B = (B - B.min()) / (np.ptp(B) or 1.0) + 1.0
+    labels = frozenset(range(m + n))
+
+    # P: filas 0..m-1 son -x_i <= 0 (etiqueta i), filas m+j son (B^T x)_j <= 1
+    G_P = np.vstack([-np.eye(m), B.T])
+    h_P = np.concatenate([np.zeros(m), np.ones(n)])
+
+    equilibria = []
+    seen = set()
+    for x, tight_P in _polytope_vertices(G_P, h_P, m, tol):
+        if x.sum() <= tol:
+            continue
+        # y debe tener todas las etiquetas que le faltan a x
+        needed = labels - tight_P
+        for y in _complementary_vertices(A, needed, tight_P, tol):
+            if y.sum() <= tol:
+                continue
+            p = np.maximum(x, 0) / np.maximum(x, 0).sum()
+            q = np.maximum(y, 0) / np.maximum(y, 0).sum()
+            key = (np.round(np.concatenate([p, q]), 8) + 0.0).tobytes()
+            if key not in seen:
+                seen.add(key)
+                equilibria.append((p, q))
+    return equilibria
+
+def _pure_dominated(P, tol):
+    """Filas de P estrictamente dominadas por otra fila (P[k] > P[i] + tol en todo)."""
+    beats = np.all(P[:, None, :] > P[None, :, :] + tol, axis=2)   # beats[k, i]
+    return beats.any(axis=0)
+
+
+def _mixed_dominated(P, i, tol):
+    """
+    ¿La fila i está estrictamente dominada por una mezcla de las demás filas?
+    Resuelve max eps s.a. sigma^T P_otras >= P[i] + eps, sigma en el simplex.
+    """
+    others = np.delete(P, i, axis=0)
+    k, n = others.shape
+    c = np.zeros(k + 1)
+    c[-1] = -1.0
+    A_ub = np.hstack([-others.T, np.ones((n, 1))])
+    A_eq = np.append(np.ones(k), 0.0)[None, :]
+    res = linprog(c, A_ub=A_ub, b_ub=-P[i], A_eq=A_eq, b_eq=[1.0],
+                  bounds=[(0, None)] * k + [(None, None)], method="highs")
+    return res.status == 0 and -res.fun > tol
+
+
+def eliminate_dominated(A, B, mixed=False, tol=0.0):
+    """
+    Eliminación iterada de estrategias estrictamente dominadas.
+
+    Alterna entre filas (con A) y columnas (con B) hasta que no se elimine
+    nada. Con mixed=True además prueba dominancia por estrategias mixtas
+    mediante programación lineal. La eliminación estricta conserva todos
+    los equilibrios de Nash del juego.
+
+    Returns:
+        (rows, cols): índices originales de las estrategias que sobreviven.
+    """
+    A = np.asarray(A, dtype=float)
+    B = np.asarray(B, dtype=float)
+    rows = np.arange(A.shape[0])
+    cols = np.arange(A.shape[1])
+
+    changed = True
+    while changed:
+        changed = False
+        for player in (0, 1):
+            if player == 0:
+                P = A[np.ix_(rows, cols)]
+            else:
+                P = B[np.ix_(rows, cols)].T
+            if len(P) < 2:
+                continue
+
+            dominated = _pure_dominated(P, tol)
+            if mixed and not dominated.any() and len(P) > 2:
+                dominated = np.array([_mixed_dominated(P, i, tol) for i in range(len(P))])
+                # Se elimina solo la primera de esta pasada: la mezcla que la domina
+                # podía usar otra dominada, así que las demás se vuelven a probar
+                # contra el juego ya reducido en la siguiente pasada
+                if dominated.any():
+                    dominated[np.flatnonzero(dominated)[1:]] = False
+
+            if dominated.any():
+                changed = True
+                if player == 0:
+                    rows = rows[~dominated]
+                else:
+                    cols = cols[~dominated]
+    return rows, cols
+
+
+def expand_equilibria(equilibria, rows, cols, shape):
+    """Lleva equilibrios del juego reducido a vectores p, q de largo completo."""
+    m, n = shape
+    expanded = []
+    for p_red, q_red in equilibria:
+        p = np.zeros(m)
+        p[rows] = p_red
+        q = np.zeros(n)
+        q[cols] = q_red
+        expanded.append((p, q))
+    return expanded
+
+def _reduced_label(label, rows, cols, shape):
+    """Traduce una etiqueta de Lemke–Howson del juego original al juego reducido."""
+    m, n = shape
+    if not 0 <= label < m + n:
+        raise ValueError(f"Etiqueta inicial fuera de rango: {label}")
+    if label < m:
+        survivors, offset, index = rows, 0, label
+    else:
+        survivors, offset, index = cols, len(rows), label - m
+    position = np.flatnonzero(survivors == index)
+    if len(position) == 0:
+        raise ValueError(f"La etiqueta inicial {label} corresponde a una estrategia "
+                         "dominada que fue eliminada")
+    return offset + int(position[0])
+
+
+def solve_nash(A, B, method="support", initial_label=None, eliminate=None):
+    """
+    Equilibrios de Nash del juego bimatricial (A, B).
+
+    Args:
+        A: Matriz de payoffs del Jugador 1 (Atacante)
+        B: Matriz de payoffs del Jugador 2 (Defensor)
+        method: "support" (enumeración de soportes vectorizada, todos los
+            equilibrios de soportes de igual tamaño), "support_loop" (la
+            misma enumeración soporte por soporte), "vertex" (enumeración de
+            vértices: todos los equilibrios extremos, también en juegos
+            degenerados o con soportes de distinto tamaño) o "lemke_howson"
+            (un equilibrio por pivoteo complementario, tiempo polinomial en
+            casos típicos).
+        initial_label: Para "lemke_howson": etiqueta inicial (int) o "all"
+            para arrancar desde todas las etiquetas y juntar los equilibrios
+            distintos encontrados. None usa la primera etiqueta del juego
+            que se resuelve.
+        eliminate: None, "pure" o "mixed". Si se indica, primero se eliminan
+            iterativamente las estrategias estrictamente dominadas (ver
+            eliminate_dominated) y los equilibrios del juego reducido se
+            devuelven con el largo original. Una initial_label entera se
+            refiere siempre al juego original y se traduce al reducido; si
+            su estrategia fue eliminada se lanza ValueError.
+
+    Returns:
+        Lista de tuplas (p, q), donde p es la estrategia del J1 y q del J2.
+    """
+    if eliminate is not None:
+        if eliminate not in ("pure", "mixed"):
+            raise ValueError(f"Modo de eliminación desconocido: {eliminate}")
+        A = np.asarray(A, dtype=float)
+        B = np.asarray(B, dtype=float)
+        rows, cols = eliminate_dominated(A, B, mixed=eliminate == "mixed")
+        if method == "lemke_howson" and initial_label not in (None, "all"):
+            initial_label = _reduced_label(initial_label, rows, cols, A.shape)
+        reduced = solve_nash(A[np.ix_(rows, cols)], B[np.ix_(rows, cols)],
+                             method, initial_label)
+        return expand_equilibria(reduced, rows, cols, A.shape)
+
+    if method == "support":
+        return support_enumeration_batched(A, B)
+    if method == "support_loop":
+        return support_enumeration(A, B)
+    if method == "vertex":
+        return vertex_enumeration(A, B)
+    if method == "lemke_howson":
+        m, n = np.shape(A)
+        if initial_label == "all":
+            labels = range(m + n)
+        else:
+            labels = [0 if initial_label is None else initial_label]
+        equilibria = []
+        for label in labels:
+            p, q = lemke_howson(A, B, label)
+            if not any(np.allclose(p, ep) and np.allclose(q, eq) for ep, eq in equilibria):
+                equilibria.append((p, q))
+        return equilibria
+    raise ValueError(f"Método de equilibrio desconocido: {method}")
@@ -0,0 +1,134 @@
+import os
+import time
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .cache import collect_outputs
+
+
+# Estado de cada proceso trabajador (se fija una vez en el initializer para no
+# reenviar la fábrica, la clase y las estrategias con cada tarea).
+_job = None
+
+
+def _init_worker(job):
+    global _job
+    _job = job
+
+
+def simulate_cell(model_factory, simulator_class, attacker, defender,
+                  initial_state, dt, total_time, sim_kwargs=None):
+    """Simula una celda (estrategia del atacante, estrategia del defensor)."""
+    model = model_factory(attacker, defender)
+    sim = simulator_class(model, initial_state, dt, total_time, **(sim_kwargs or {}))
+    sim.run()
+    return collect_outputs(sim)
+
+
+def _run_chunk(cells):
+    """Simula una lista de celdas (índices fila-mayor) y mide cada una."""
+    (factory, simulator_class, attackers, defenders, initial_state, dt, total_time,
+     sim_kwargs) = _job
+    n_def = len(defenders)
+    outputs = []
+    for k in cells:
+        start = time.perf_counter()
+        result = simulate_cell(factory, simulator_class, attackers[k // n_def],
+                               defenders[k % n_def], initial_state, dt, total_time,
+                               sim_kwargs)
+        result["seconds"] = time.perf_counter() - start
+        outputs.append(result)
+    return cells, outputs
+
+
+def _pool_context():
+    # "fork" evita volver a importar el script principal en cada trabajador
+    if "fork" in mp.get_all_start_methods():
+        return mp.get_context("fork")
+    return mp.get_context()
+
+
+def build_payoff_matrices(model_factory, simulator_class, attacker_strategies,
+                          defender_strategies, initial_state, dt=1.0,
+                          total_time=168.0, workers=None, chunksize=None, cache=None,
+                          profiler=None, sim_kwargs=None):
+    """
+    Construye las matrices de payoff del atacante y del defensor.
+
+    Args:
+        model_factory: Función (estrategia_atacante, estrategia_defensor) -> modelo.
+            Debe poder serializarse con pickle (definida a nivel de módulo).
+        simulator_class: Clase con la interfaz de Simulator: se construye como
+            simulator_class(model, initial_state, dt, total_time, **sim_kwargs)
+            y run() deja payoff_attacker y payoff_defender como atributos.
+        attacker_strategies: Estrategias de las filas.
+        defender_strategies: Estrategias de las columnas.
+        workers: Número de procesos (None = todos los núcleos, 1 = en serie).
+        chunksize: Celdas por tarea (None = ~4 tareas por proceso).
+        cache: SimulationCache opcional. Las celdas ya guardadas no se
+            simulan; solo las faltantes se reparten entre los procesos.
+        profiler: Profiler opcional (common.instrumentation). Cada celda
+            simulada se registra en la fase "celda" con el tiempo medido en
+            su proceso trabajador.
+        sim_kwargs: Argumentos extra del simulador (p. ej. steady_tol);
+            entran en la llave de la caché.
+
+    Returns:
+        (payoff_matrix_A, payoff_matrix_D) de shape (filas, columnas). El
+        resultado es idéntico al del doble ciclo en serie, sin importar el
+        número de procesos.
+    """
+    attackers = list(attacker_strategies)
+    defenders = list(defender_strategies)
+    n_cells = len(attackers) * len(defenders)
+    sim_kwargs = dict(sim_kwargs or {})
+    job = (model_factory, simulator_class, attackers, defenders,
+           initial_state, dt, total_time, sim_kwargs)
+
+    payoffs = np.empty((n_cells, 2))
+    pending = list(range(n_cells))
+    keys = {}
+    if cache is not None:
+        n_def = len(defenders)
+        pending = []
+        for k in range(n_cells):
+            model = model_factory(attackers[k // n_def], defenders[k % n_def])
+            keys[k] = cache.key(simulator_class, model, initial_state, dt, total_time,
+                                **sim_kwargs)
+            cached = cache.load(keys[k], trajectories=False)
+            if cached is None:
+                pending.append(k)
+            else:
+                payoffs[k] = cached["payoff_attacker"], cached["payoff_defender"]
+
+    if pending:
+        if workers is None:
+            workers = os.cpu_count() or 1
+        workers = max(1, min(workers, len(pending)))
+        if chunksize is None:
+            chunksize = max(1, -(-len(pending) // (4 * workers)))
+        chunks = [pending[s:s + chunksize] for s in range(0, len(pending), chunksize)]
+
+        if workers == 1:
+            _init_worker(job)
+            _collect(map(_run_chunk, chunks), payoffs, cache, keys, profiler)
+        else:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context(),
+                                     initializer=_init_worker, initargs=(job,)) as pool:
+                _collect(pool.map(_run_chunk, chunks), payoffs, cache, keys, profiler)
+
+    shape = (len(attackers), len(defenders))
+    return payoffs[:, 0].reshape(shape), payoffs[:, 1].reshape(shape)
+
+
+def _collect(results, payoffs, cache, keys, profiler=None):
+    # Solo el proceso principal escribe en la caché y en el profiler
+    for cells, outputs in results:
+        for k, result in zip(cells, outputs):
+            payoffs[k] = result["payoff_attacker"], result["payoff_defender"]
+            if profiler is not None:
+                profiler.record("celda", result["seconds"], cells=1)
+            if cache is not None:
+                cache.store(keys[k], result)
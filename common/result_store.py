@@ -0,0 +1,228 @@
+import csv
+import itertools
+import json
+import os
+
+import numpy as np
+
+from .scenarios import SYMBOLS
+
+# Índice del directorio: por arreglo, shape, dtype, ejes y metadatos
+INDEX = "index.json"
+
+
+def _plain(values):
+    if values is None:
+        return None
+    return [v.item() if isinstance(v, np.generic) else v for v in np.asarray(values).tolist()]
+
+
+def _position(axis, values, value):
+    """Índice de value en el eje (los números se comparan con tolerancia)."""
+    if values is None:
+        raise ValueError(f"El eje {axis!r} no tiene valores para seleccionar")
+    if isinstance(value, str):
+        matches = [k for k, v in enumerate(values) if v == value]
+    else:
+        matches = [k for k, v in enumerate(values)
+                   if not isinstance(v, str) and np.isclose(v, value, rtol=1e-12, atol=0.0)]
+    if not matches:
+        raise ValueError(f"{value!r} no está en el eje {axis!r}")
+    return matches[0]
+
+
+def axis_label(axis, value):
+    """Etiqueta de un valor de eje: "β=0.5" para parámetros, el valor tal cual para el resto."""
+    if isinstance(value, str):
+        return value
+    return f"{SYMBOLS.get(axis, axis)}={value:g}"
+
+
+class ResultStore:
+    """
+    Directorio de resultados binarios: un .npy por arreglo más un índice
+    JSON (index.json) con el shape, el dtype, los ejes y metadatos de cada
+    uno.
+
+    Los ejes son un diccionario ordenado {nombre: valores | None}, uno por
+    dimensión (None para ejes sin valores, como el número de muestra de una
+    trayectoria). Los tensores de payoff guardan un eje por parámetro, sin
+    etiquetas de texto: la matriz atacante x defensor es
+    tensor.reshape(tensor.shape[0], -1).
+
+    load() abre el arreglo con np.load(mmap_mode="r") (un np.memmap), así
+    que select() solo lee del disco las páginas del corte pedido. create()
+    devuelve un memmap escribible para llenar arreglos que no caben en
+    memoria. export_csv() escribe una vista CSV opcional.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        try:
+            with open(os.path.join(directory, INDEX), encoding="utf-8") as f:
+                self.index = json.load(f)
+        except (OSError, ValueError):
+            self.index = {}
+
+    def path(self, name):
+        return os.path.join(self.directory, name + ".npy")
+
+    def names(self):
+        return list(self.index)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def _register(self, name, shape, dtype, axes, meta):
+        axes = dict(axes) if axes is not None else {f"eje_{k}": None for k in range(len(shape))}
+        if len(axes) != len(shape):
+            raise ValueError(f"{name}: {len(axes)} ejes para un arreglo de {len(shape)} dimensiones")
+        for (axis, values), size in zip(axes.items(), shape):
+            if values is not None and len(values) != size:
+                raise ValueError(f"{name}: el eje {axis!r} tiene {len(values)} valores "
+                                 f"y la dimensión {size}")
+        self.index[name] = {"shape": list(shape), "dtype": np.dtype(dtype).str,
+                            "axes": {axis: _plain(values) for axis, values in axes.items()},
+                            "meta": meta}
+        path = os.path.join(self.directory, INDEX)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.index, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def save(self, name, array, axes=None, **meta):
+        """Guarda array (escritura atómica) con sus ejes {nombre: valores | None}."""
+        array = np.asarray(array)
+        path = self.path(name)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            np.save(f, array)
+        os.replace(tmp, path)
+        self._register(name, array.shape, array.dtype, axes, meta)
+
+    def create(self, name, shape, dtype=float, axes=None, **meta):
+        """Arreglo nuevo en disco, abierto como memmap escribible (llamar flush() al terminar)."""
+        array = np.lib.format.open_memmap(self.path(name), mode="w+", dtype=dtype,
+                                          shape=tuple(shape))
+        self._register(name, array.shape, array.dtype, axes, meta)
+        return array
+
+    def load(self, name, mmap=True):
+        if name not in self.index:
+            raise KeyError(f"{name!r} no está en {self.directory}")
+        return np.load(self.path(name), mmap_mode="r" if mmap else None)
+
+    def axes(self, name):
+        return dict(self.index[name]["axes"])
+
+    def meta(self, name):
+        return dict(self.index[name]["meta"])
+
+    def select(self, name, **selection):
+        """
+        Corte por valor de eje, p. ej. select("payoff_attacker", beta=2.0,
+        lambda_=[2, 5]). Un valor escalar elimina el eje; una lista lo
+        conserva con esos valores en ese orden.
+
+        Returns:
+            (arreglo, ejes) con los ejes que quedan tras el corte.
+        """
+        array = self.load(name)
+        axes = self.axes(name)
+        unknown = set(selection) - set(axes)
+        if unknown:
+            raise ValueError(f"{name} no tiene los ejes {', '.join(sorted(unknown))}")
+
+        # Primero los escalares (indexado básico: una vista del memmap, sin leer)
+        basic = []
+        remaining = {}
+        for axis, values in axes.items():
+            wanted = selection.get(axis)
+            if wanted is None:
+                basic.append(slice(None))
+                remaining[axis] = values
+            elif np.ndim(wanted) == 0:
+                basic.append(_position(axis, values, wanted))
+            else:
+                basic.append(slice(None))
+                remaining[axis] = values
+        array = array[tuple(basic)]
+
+        # Luego las listas, un eje a la vez (solo se leen las filas pedidas)
+        for k, axis in enumerate(list(remaining)):
+            wanted = selection.get(axis)
+            if wanted is not None:
+                positions = [_position(axis, remaining[axis], v) for v in wanted]
+                array = np.take(array, positions, axis=k)
+                remaining[axis] = [remaining[axis][p] for p in positions]
+        return array, remaining
+
+    def export_csv(self, name, path, labels=True, **selection):
+        """
+        Vista CSV de un arreglo (o de un corte, con los mismos argumentos
+        que select()). La primera dimensión son las filas y el producto de
+        las demás las columnas; con labels=True los valores de los ejes se
+        escriben como "β=0.5" y las columnas como "γ=2, r=2, λ=2". Las filas
+        se leen del memmap una a la vez.
+        """
+        array, axes = self.select(name, **selection)
+        if array.ndim == 1:
+            array = array[:, None]
+        names = list(axes)
+        row_axis, column_axes = names[0], names[1:]
+
+        def text(axis, value):
+            return axis_label(axis, value) if labels else value
+
+        if all(axes[a] is not None for a in column_axes):
+            header = [", ".join(str(text(a, v)) for a, v in zip(column_axes, values))
+                      for values in itertools.product(*(axes[a] for a in column_axes))]
+        else:
+            header = [f"c{k}" for k in range(int(np.prod(array.shape[1:])))]
+        rows = axes[row_axis]
+
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f, lineterminator="\n")
+            writer.writerow(([""] if rows is not None else []) + header)
+            for k in range(array.shape[0]):
+                values = [repr(float(v)) for v in np.asarray(array[k]).ravel()]
+                writer.writerow(([text(row_axis, rows[k])] if rows is not None else []) + values)
+        return path
+
+
+def save_payoffs(store, scenario, grid, A, D, csv=False):
+    """
+    Guarda las matrices atacante x defensor de un escenario como tensores
+    con un eje por parámetro (en el orden de common.scenarios.parameters).
+    Con csv=True escribe además payoff_attacker.csv y payoff_defender.csv.
+    """
+    from .scenarios import parameters
+
+    axes = {n: grid[n] for n in parameters(scenario)}
+    shape = [len(values) for values in axes.values()]
+    for name, matrix in (("payoff_attacker", A), ("payoff_defender", D)):
+        store.save(name, np.reshape(matrix, shape), axes, scenario=scenario)
+        if csv:
+            store.export_csv(name, os.path.join(store.directory, name + ".csv"))
+
+
+def load_payoffs(store, scenario, **selection):
+    """
+    Matrices guardadas con save_payoffs, restringidas a los valores de
+    `selection` ({parámetro: valor o lista}); solo se lee ese corte.
+
+    Returns:
+        (A, D, etiquetas del atacante, etiquetas del defensor).
+    """
+    from .scenarios import strategy_labels
+
+    saved = store.meta("payoff_attacker").get("scenario")
+    if saved != scenario:
+        raise ValueError(f"{store.directory} tiene matrices del escenario {saved}, no {scenario}")
+    # Las listas conservan todos los ejes, así la forma de matriz no cambia
+    selection = {n: np.atleast_1d(v).tolist() for n, v in selection.items()}
+    A, axes = store.select("payoff_attacker", **selection)
+    D, _ = store.select("payoff_defender", **selection)
+    return (A.reshape(A.shape[0], -1), D.reshape(D.shape[0], -1),
+            *strategy_labels(scenario, axes))
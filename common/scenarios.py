@@ -0,0 +1,103 @@
+"""
+Descripción común de los tres escenarios: parámetros de cada jugador,
+valores por defecto y construcción de modelos y simuladores.
+
+Los lib/ de los escenarios se importan dentro de las funciones para que
+importar este módulo no cargue NumPy (lo usa cli.py al arrancar).
+"""
+
+import itertools
+
+# Parámetros de cada escenario. Las filas de las matrices son las
+# estrategias del atacante y las columnas el producto de las del defensor
+# (en el orden de "defender"). "cell" son los valores por defecto de una
+# celda (los de main.py) y "grid" los de las mallas (los de los scripts de
+# análisis).
+SCENARIOS = {
+    "first": {
+        "attacker": ("beta",),
+        "defender": ("r",),
+        "cell": {"beta": 1.62, "r": 2.0},
+        "grid": {"beta": [0.5, 1.0, 1.5, 2.0, 2.5], "r": [0.5, 1.0, 2.0, 3.0, 5.0]},
+    },
+    "second": {
+        "attacker": ("beta",),
+        "defender": ("r", "gamma", "lambda_"),
+        "cell": {"beta": 1.62, "r": 2.0, "gamma": 1.0, "lambda_": 15.0},
+        "grid": {"beta": [0.5, 1.0, 1.62, 2.0], "r": [2.0], "gamma": [1.0],
+                 "lambda_": [1.0, 5.0, 10.0, 15.0, 20.0]},
+    },
+    "third": {
+        "attacker": ("beta",),
+        "defender": ("gamma", "r", "lambda_"),
+        "cell": {"beta": 1.62, "gamma": 5.0, "r": 5.0, "lambda_": 10.0},
+        "grid": {"beta": [0.5, 1.0, 1.5, 2.0], "gamma": [2.0, 4.0, 6.0],
+                 "r": [2.0, 5.0, 10.0], "lambda_": [2.0, 5.0, 10.0]},
+    },
+}
+
+SYMBOLS = {"beta": "β", "r": "r", "gamma": "γ", "lambda_": "λ"}
+
+
+def parameters(scenario):
+    """Nombres de los parámetros: primero los del atacante, luego los del defensor."""
+    return SCENARIOS[scenario]["attacker"] + SCENARIOS[scenario]["defender"]
+
+
+def label(names, values):
+    return ", ".join(f"{SYMBOLS[n]}={v:g}" for n, v in zip(names, values))
+
+
+def initial_state(scenario, N, I0):
+    """[S0, I0] en el primer escenario, [S0, I0, R0] en los otros dos."""
+    return [N - I0, I0] if scenario == "first" else [N - I0, I0, 0]
+
+
+def simulator_class(scenario):
+    """Simulador escalar del escenario."""
+    if scenario == "first":
+        from first_scenario.lib.simulation import Simulator
+        return Simulator
+    if scenario == "second":
+        from second_scenario.lib.simulation import Simulator
+        return Simulator
+    from third_scenario.lib.unified_simulation import UnifiedSimulator
+    return UnifiedSimulator
+
+
+def make_model(scenario, cell, N):
+    """Modelo de una celda {parámetro: valor}."""
+    if scenario == "first":
+        from first_scenario.lib.epidemic_model import EpidemicModel
+        return EpidemicModel(cell["beta"], cell["r"])
+    if scenario == "second":
+        from second_scenario.lib.epidemic_model import EpidemicModel
+        return EpidemicModel(cell["beta"], cell["r"], cell["gamma"], cell["lambda_"], N)
+    from third_scenario.lib.unified_model import UnifiedEpidemicModel
+    return UnifiedEpidemicModel(cell["beta"], cell["gamma"], cell["r"], cell["lambda_"])
+
+
+def cell_model(scenario, N, attacker, defender):
+    """
+    Fábrica para common.parallel.build_payoff_matrices: attacker y defender
+    son tuplas de valores en el orden de SCENARIOS. Usar con
+    functools.partial(cell_model, scenario, N) (se serializa con pickle).
+    """
+    spec = SCENARIOS[scenario]
+    cell = dict(zip(spec["attacker"], attacker))
+    cell.update(zip(spec["defender"], defender))
+    return make_model(scenario, cell, N)
+
+
+def strategies(scenario, grid):
+    """Estrategias (tuplas de valores) del atacante y del defensor sobre la malla {parámetro: lista}."""
+    spec = SCENARIOS[scenario]
+    return (list(itertools.product(*(grid[n] for n in spec["attacker"]))),
+            list(itertools.product(*(grid[n] for n in spec["defender"]))))
+
+
+def strategy_labels(scenario, grid):
+    spec = SCENARIOS[scenario]
+    attackers, defenders = strategies(scenario, grid)
+    return ([label(spec["attacker"], s) for s in attackers],
+            [label(spec["defender"], s) for s in defenders])
@@ -0,0 +1,224 @@
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+
+def block_generator(seed, block):
+    """
+    Generador de la réplica-bloque `block`.
+
+    Las réplicas se agrupan en bloques de tamaño fijo y cada bloque tiene su
+    propia semilla derivada de (seed, block). El resultado de una réplica solo
+    depende de (seed, block_size, índice de la réplica), así que rangos
+    distintos de réplicas pueden correrse en paralelo y volver a juntarse.
+    """
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(block,)))
+
+
+def simulate_ssa(transitions, x0, total_time, rng, n):
+    """
+    Algoritmo de Gillespie (SSA exacto) para n réplicas a la vez.
+
+    Args:
+        transitions: Lista de (origen, destino, rate_fn); rate_fn(X) recibe el
+            estado (n, compartimentos) y devuelve la tasa total de la transición.
+        x0: Estado inicial entero por compartimento.
+        total_time: Horizonte de simulación.
+        rng: Generador de NumPy del bloque.
+        n: Número de réplicas.
+
+    Returns:
+        (X, area, counts): estado final (n, C), integral ∫X dt (n, C) y número
+        de eventos por transición (n, K).
+    """
+    X = np.tile(np.asarray(x0, dtype=np.int64), (n, 1))
+    area = np.zeros(X.shape)
+    counts = np.zeros((n, len(transitions)), dtype=np.int64)
+    src = np.array([tr[0] for tr in transitions])
+    dst = np.array([tr[1] for tr in transitions])
+
+    # Se trabaja sobre copias compactas de las réplicas activas y se devuelven
+    # los resultados a los arreglos completos cuando una réplica termina.
+    ids = np.arange(n)
+    Xa, area_a, counts_a = X.copy(), area.copy(), counts.copy()
+    t = np.zeros(n)
+    while len(ids):
+        rates = np.column_stack([np.maximum(fn(Xa), 0.0) for _, _, fn in transitions])
+        a0 = rates.sum(axis=1)
+
+        u = rng.random((2, len(ids)))
+        with np.errstate(divide="ignore"):
+            tau = np.where(a0 > 0, -np.log(u[0]) / a0, np.inf)
+
+        # Réplicas sin eventos antes del horizonte: se cierra la integral y terminan
+        done = t + tau >= total_time
+        step = np.where(done, total_time - t, tau)
+        area_a += Xa * step[:, None]
+        t = t + step
+
+        # Elegir la transición proporcionalmente a su tasa
+        cum = np.cumsum(rates, axis=1)
+        k = np.minimum((cum < (u[1] * a0)[:, None]).sum(axis=1), len(transitions) - 1)
+        rows = np.flatnonzero(~done)
+        kk = k[rows]
+        Xa[rows, src[kk]] -= 1
+        Xa[rows, dst[kk]] += 1
+        counts_a[rows, kk] += 1
+
+        if done.any():
+            fin = ids[done]
+            X[fin], area[fin], counts[fin] = Xa[done], area_a[done], counts_a[done]
+            keep = ~done
+            ids, Xa, area_a, counts_a, t = ids[keep], Xa[keep], area_a[keep], counts_a[keep], t[keep]
+    return X, area, counts
+
+
+def simulate_tau(transitions, x0, total_time, rng, n, tau):
+    """
+    Tau-leaping binomial para n réplicas a la vez.
+
+    En cada salto, cada compartimento pierde Bin(X_c, min(1, H_c*tau))
+    individuos, con H_c la suma de las tasas por individuo de sus transiciones
+    de salida evaluadas en el punto medio predicho del salto; las salidas se
+    reparten entre transiciones con binomiales condicionales. La media de eventos
+    coincide con la del tau-leaping de Poisson, pero el estado nunca se vuelve
+    negativo.
+
+    Returns:
+        (X, area, counts) como en simulate_ssa (area con regla del trapecio).
+    """
+    X = np.tile(np.asarray(x0, dtype=np.int64), (n, 1))
+    area = np.zeros(X.shape)
+    counts = np.zeros((n, len(transitions)), dtype=np.int64)
+    n_comp = X.shape[1]
+
+    t = 0.0
+    while t < total_time:
+        h = min(tau, total_time - t)
+
+        # Tasa por individuo de cada transición (total / tamaño del origen),
+        # evaluada en el punto medio predicho del salto para reducir el sesgo
+        # de la media.
+        drift = np.zeros(X.shape)
+        for source, target, fn in transitions:
+            rate = np.maximum(fn(X), 0.0)
+            drift[:, source] -= rate
+            drift[:, target] += rate
+        X_mid = np.maximum(X + 0.5 * h * drift, 0.0)
+
+        hazards = []
+        for source, _, fn in transitions:
+            size = X_mid[:, source]
+            with np.errstate(invalid="ignore", divide="ignore"):
+                hazards.append(np.where(size > 0, np.maximum(fn(X_mid), 0.0) / size, 0.0))
+
+        delta = np.zeros_like(X)
+        for c in range(n_comp):
+            outgoing = [k for k, tr in enumerate(transitions) if tr[0] == c]
+            if not outgoing:
+                continue
+            remaining_hazard = sum(hazards[k] for k in outgoing)
+            remaining = rng.binomial(X[:, c], np.minimum(remaining_hazard * h, 1.0))
+            for k in outgoing:
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    share = np.where(remaining_hazard > 0,
+                                     hazards[k] / remaining_hazard, 0.0)
+                events = rng.binomial(remaining, np.clip(share, 0.0, 1.0))
+                remaining_hazard = remaining_hazard - hazards[k]
+                remaining = remaining - events
+
+                counts[:, k] += events
+                delta[:, c] -= events
+                delta[:, transitions[k][1]] += events
+
+        X_new = X + delta
+        area += 0.5 * (X + X_new) * h
+        X = X_new
+        t += h
+    return X, area, counts
+
+
+def summarize(values, z=1.96):
+    """Media e intervalo de confianza normal (nivel 95% por defecto)."""
+    values = np.asarray(values, dtype=float)
+    mean = float(values.mean())
+    half = z * values.std(ddof=1) / np.sqrt(len(values)) if len(values) > 1 else 0.0
+    return {"mean": mean, "ci_low": mean - half, "ci_high": mean + half}
+
+
+class ReplicatedSimulator(ABC):
+    """
+    Parte genérica de los simuladores estocásticos de los escenarios: reparte
+    las réplicas en bloques de block_size (cada uno con su propia semilla, ver
+    block_generator), los simula con SSA o tau-leaping y resume los payoffs.
+
+    Las subclases definen COMPARTMENTS, transitions() (lista de (origen,
+    destino, rate_fn) para simulate_ssa / simulate_tau) y payoffs(X, area,
+    counts), que devuelve un diccionario de arreglos por réplica con la clave
+    "extinct".
+
+    method:
+        "ssa"  - Gillespie exacto (recomendado para N pequeño).
+        "tau"  - tau-leaping binomial con paso tau (para N grande).
+        "auto" - "ssa" si N <= ssa_max_nodes, si no "tau".
+    """
+
+    COMPARTMENTS = ()
+
+    def __init__(self, model, initial_state, total_time=168.0, method="auto",
+                 tau=0.1, seed=0, block_size=256, ssa_max_nodes=2000):
+        self.model = model
+        self.x0 = [int(round(v)) for v in initial_state]
+        self.N = sum(self.x0)
+        self.total_time = total_time
+        self.tau = tau
+        self.seed = seed
+        self.block_size = block_size
+
+        if method == "auto":
+            method = "ssa" if self.N <= ssa_max_nodes else "tau"
+        if method not in ("ssa", "tau"):
+            raise ValueError(f"Método estocástico desconocido: {method}")
+        self.method = method
+
+    @abstractmethod
+    def transitions(self):
+        """Lista de (origen, destino, rate_fn) del modelo."""
+
+    @abstractmethod
+    def payoffs(self, X, area, counts):
+        """Diccionario de arreglos por réplica (incluye "extinct")."""
+
+    def simulate_block(self, block):
+        rng = block_generator(self.seed, block)
+        if self.method == "ssa":
+            return simulate_ssa(self.transitions(), self.x0, self.total_time,
+                                rng, self.block_size)
+        return simulate_tau(self.transitions(), self.x0, self.total_time,
+                            rng, self.block_size, self.tau)
+
+    def run(self, replicates=1000, first_replicate=0):
+        """
+        Simula las réplicas first_replicate, ..., first_replicate + replicates - 1.
+
+        Returns:
+            Diccionario con "replicates" (arreglos por réplica), "summary"
+            (media e IC 95% de cada cantidad) y "extinction_probability".
+        """
+        last = first_replicate + replicates
+        first_block = first_replicate // self.block_size
+        last_block = (last - 1) // self.block_size
+
+        parts = [self.payoffs(*self.simulate_block(b))
+                 for b in range(first_block, last_block + 1)]
+        offset = first_replicate - first_block * self.block_size
+        per_replicate = {key: np.concatenate([p[key] for p in parts])[offset:offset + replicates]
+                         for key in parts[0]}
+
+        summary = {key: summarize(values) for key, values in per_replicate.items()
+                   if key != "extinct"}
+        return {
+            "replicates": per_replicate,
+            "summary": summary,
+            "extinction_probability": float(per_replicate["extinct"].mean()),
+        }
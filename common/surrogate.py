@@ -0,0 +1,208 @@
+import numpy as np
+from scipy.linalg import cho_factor, cho_solve, solve_triangular
+from scipy.optimize import minimize
+
+
+def latin_hypercube(n, bounds, rng):
+    """n puntos de un hipercubo latino dentro de bounds [(lo, hi), ...]."""
+    bounds = np.asarray(bounds, dtype=float)
+    d = len(bounds)
+    u = (rng.permuted(np.tile(np.arange(n), (d, 1)), axis=1).T + rng.random((n, d))) / n
+    return bounds[:, 0] + u * (bounds[:, 1] - bounds[:, 0])
+
+
+def matern52(X1, X2, length_scale):
+    """Kernel Matérn 5/2 con escala por dimensión (varianza unitaria)."""
+    a = X1 / length_scale
+    b = X2 / length_scale
+    sq = (a * a).sum(axis=1)[:, None] + (b * b).sum(axis=1)[None, :] - 2.0 * a @ b.T
+    s = np.sqrt(5.0 * np.maximum(sq, 0.0))
+    return (1.0 + s + s * s / 3.0) * np.exp(-s)
+
+
+class GaussianProcess:
+    """
+    Regresión con proceso gaussiano (kernel Matérn 5/2 ARD) en NumPy/SciPy.
+
+    Las entradas se escalan a [0, 1] con los límites del problema y las
+    salidas se estandarizan. Las escalas de longitud y el ruido se ajustan
+    maximizando la verosimilitud marginal (L-BFGS-B sobre sus logaritmos);
+    el primer ajuste prueba además `restarts` puntos iniciales aleatorios y
+    los siguientes parten de los hiperparámetros anteriores.
+    """
+
+    def __init__(self, bounds, noise=1e-6, restarts=2, seed=0):
+        self.bounds = np.asarray(bounds, dtype=float)
+        self.length_scale = np.full(len(self.bounds), 0.3)
+        self.noise = noise
+        self.restarts = restarts
+        self.rng = np.random.default_rng(seed)
+        self.fitted = False
+
+    def _unit(self, X):
+        lo, hi = self.bounds[:, 0], self.bounds[:, 1]
+        return (np.asarray(X, dtype=float) - lo) / (hi - lo)
+
+    def _neg_log_likelihood(self, log_params, Z, t):
+        length_scale, noise = np.exp(log_params[:-1]), np.exp(log_params[-1])
+        K = matern52(Z, Z, length_scale) + (noise + 1e-10) * np.eye(len(Z))
+        try:
+            L, lower = cho_factor(K, lower=True)
+        except np.linalg.LinAlgError:
+            return 1e25
+        alpha = cho_solve((L, lower), t)
+        return 0.5 * t @ alpha + np.log(np.diag(L)).sum()
+
+    def fit(self, X, y, optimize=True):
+        self.Z = self._unit(X)
+        y = np.asarray(y, dtype=float)
+        self.y_mean = y.mean()
+        self.y_std = y.std() or 1.0
+        self.t = (y - self.y_mean) / self.y_std
+
+        if optimize and len(self.Z) > 2:
+            d = self.Z.shape[1]
+            bounds = [(np.log(1e-3), np.log(10.0))] * d + [(np.log(1e-10), np.log(1e-1))]
+            starts = [np.append(np.log(self.length_scale), np.log(self.noise))]
+            if not self.fitted:
+                starts += [np.append(self.rng.uniform(np.log(0.05), np.log(2.0), d), np.log(1e-6))
+                           for _ in range(self.restarts)]
+            best = None
+            for x0 in starts:
+                res = minimize(self._neg_log_likelihood, x0, args=(self.Z, self.t),
+                               method="L-BFGS-B", bounds=bounds)
+                if best is None or res.fun < best.fun:
+                    best = res
+            self.length_scale = np.exp(best.x[:-1])
+            self.noise = float(np.exp(best.x[-1]))
+
+        self._factorize()
+        self.fitted = True
+        return self
+
+    def _factorize(self):
+        K = matern52(self.Z, self.Z, self.length_scale)
+        K[np.diag_indices_from(K)] += self.noise + 1e-10
+        self.L = np.linalg.cholesky(K)
+        self.alpha = cho_solve((self.L, True), self.t)
+        self.L_inv = solve_triangular(self.L, np.eye(len(K)), lower=True)
+
+    def posterior_factor(self, Z):
+        """V = L^-1 K(X, Z): la covarianza posterior es K(Z, Z) - V^T V."""
+        return self.L_inv @ matern52(self._unit(Z), self.Z, self.length_scale).T
+
+    def predict(self, X, return_std=False, chunk_size=4096):
+        """
+        Media (y desviación estándar) predictiva. Se evalúa por bloques de
+        chunk_size puntos para acotar la memoria en mallas densas.
+        """
+        Zs = self._unit(X)
+        mean = np.empty(len(Zs))
+        std = np.empty(len(Zs)) if return_std else None
+        for start in range(0, len(Zs), chunk_size):
+            block = slice(start, start + chunk_size)
+            Ks = matern52(Zs[block], self.Z, self.length_scale)
+            mean[block] = Ks @ self.alpha
+            if return_std:
+                v = self.L_inv @ Ks.T
+                std[block] = np.sqrt(np.maximum(1.0 - np.einsum("ij,ij->j", v, v), 0.0))
+        mean = self.y_mean + self.y_std * mean
+        if return_std:
+            return mean, self.y_std * std
+        return mean
+
+
+class Surrogate:
+    """
+    Modelo sustituto de un payoff simulado, con aprendizaje activo.
+
+    simulate(points) recibe un arreglo (k, d) de parámetros y devuelve los k
+    payoffs (por ejemplo, un lote de UnifiedBatchSimulator). Se parte de un
+    hipercubo latino de n_initial puntos; refine() pide nuevas simulaciones
+    donde la incertidumbre predictiva es mayor, en lotes elegidos con
+    reducción greedy de varianza, hasta agotar el presupuesto o bajar de tol.
+    """
+
+    def __init__(self, simulate, bounds, n_initial=None, batch_size=10,
+                 n_candidates=4096, seed=0):
+        self.simulate = simulate
+        self.bounds = np.asarray(bounds, dtype=float)
+        self.batch_size = batch_size
+        self.n_candidates = n_candidates
+        self.rng = np.random.default_rng(seed)
+        self.gp = GaussianProcess(self.bounds, seed=seed)
+
+        n_initial = n_initial or 10 * len(self.bounds)
+        self.X = np.empty((0, len(self.bounds)))
+        self.y = np.empty(0)
+        self.add(latin_hypercube(n_initial, self.bounds, self.rng))
+
+    @property
+    def n_simulations(self):
+        return len(self.y)
+
+    def add(self, points):
+        """Simula los puntos, los agrega y reajusta el proceso gaussiano."""
+        points = np.atleast_2d(points)
+        self.X = np.vstack([self.X, points])
+        self.y = np.concatenate([self.y, np.asarray(self.simulate(points), dtype=float)])
+        self.gp.fit(self.X, self.y)
+
+    def select(self):
+        """
+        Lote de puntos de mayor incertidumbre. Tras cada elección la varianza
+        posterior de los candidatos se actualiza como si ese punto ya
+        estuviera simulado (Cholesky pivoteado de la covarianza posterior; no
+        depende de los valores y), así el lote no se amontona en un solo lugar.
+
+        Returns:
+            (puntos, desviación estándar máxima antes de elegir el lote).
+        """
+        gp = self.gp
+        candidates = latin_hypercube(self.n_candidates, self.bounds, self.rng)
+        V = gp.posterior_factor(candidates)
+        var = np.maximum(1.0 - np.einsum("ij,ij->j", V, V), 0.0)
+        max_std = gp.y_std * float(np.sqrt(var.max()))
+
+        U = np.empty((0, len(candidates)))
+        chosen = []
+        for _ in range(min(self.batch_size, len(candidates))):
+            k = int(np.argmax(var))
+            chosen.append(candidates[k])
+            kernel_k = matern52(gp._unit(candidates), gp._unit(candidates[k:k + 1]),
+                                gp.length_scale)[:, 0]
+            cov = kernel_k - V.T @ V[:, k] - U.T @ U[:, k]
+            u = cov / np.sqrt(var[k] + gp.noise + 1e-10)
+            U = np.vstack([U, u])
+            var = np.maximum(var - u * u, 0.0)
+            var[k] = -np.inf
+        return np.array(chosen), max_std
+
+    def refine(self, max_simulations=300, tol=None):
+        """
+        Agrega lotes de simulaciones hasta max_simulations en total o hasta
+        que la desviación estándar máxima estimada sea <= tol.
+
+        Returns:
+            Desviación estándar máxima sobre los candidatos del último lote.
+        """
+        max_std = np.inf
+        while self.n_simulations < max_simulations:
+            points, max_std = self.select()
+            if tol is not None and max_std <= tol:
+                break
+            self.add(points[:max_simulations - self.n_simulations])
+        return max_std
+
+    def predict(self, X, return_std=False, chunk_size=4096):
+        return self.gp.predict(X, return_std=return_std, chunk_size=chunk_size)
+
+    def predict_grid(self, *axes, return_std=False, chunk_size=4096):
+        """Predicción sobre la malla producto de los ejes (shape len(ax0) x len(ax1) x ...)."""
+        grids = np.meshgrid(*(np.asarray(a, dtype=float) for a in axes), indexing="ij")
+        points = np.column_stack([g.ravel() for g in grids])
+        shape = grids[0].shape
+        if return_std:
+            mean, std = self.predict(points, True, chunk_size)
+            return mean.reshape(shape), std.reshape(shape)
+        return self.predict(points, chunk_size=chunk_size).reshape(shape)
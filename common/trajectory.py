@@ -0,0 +1,106 @@
+import numpy as np
+
+
+def remaining_times(time, total_time, dt):
+    """Tiempos que recorre el ciclo `while time < total_time: time += dt` desde time."""
+    times = []
+    while time < total_time:
+        time += dt
+        times.append(time)
+    return times
+
+
+class Trajectory:
+    """
+    Almacenamiento compacto de la trayectoria de un simulador.
+
+    Los muestreos se guardan en un buffer NumPy preasignado de shape
+    (capacidad, 1 + número de variables), con el tiempo en la columna 0.
+
+    Modos de registro (record):
+        "full"    - guarda todos los pasos.
+        k (int)   - guarda uno de cada k pasos (el último siempre se guarda);
+                    True/False no se aceptan como k.
+        "summary" - no guarda historia, solo el último estado.
+
+    Las ganancias no dependen de esta historia: los simuladores las acumulan
+    dentro de su ciclo de pasos.
+    """
+
+    __slots__ = ("columns", "every", "buffer", "size", "n_samples",
+                 "last_time", "last")
+
+    def __init__(self, columns, capacity, record="full"):
+        self.columns = ("t",) + tuple(columns)
+
+        if record == "full":
+            self.every = 1
+        elif record == "summary":
+            self.every = 0
+        elif isinstance(record, int) and not isinstance(record, bool) and record >= 1:
+            self.every = record
+        else:
+            raise ValueError(f"Modo de registro inválido: {record!r}")
+
+        rows = 0 if self.every == 0 else capacity // self.every + 2
+        self.buffer = np.empty((rows, len(self.columns)))
+        self.size = 0
+
+        self.n_samples = 0
+        self.last_time = 0.0
+        self.last = None
+
+    def append(self, t, *values):
+        """Registra el estado `values` en el tiempo t."""
+        self.n_samples += 1
+        self.last_time = t
+        self.last = values
+
+        if self.every and (self.n_samples - 1) % self.every == 0:
+            self._store(t, values)
+
+    def extend(self, times, *values):
+        """
+        Registra el mismo estado `values` en cada tiempo de times, como si se
+        llamara append() una vez por tiempo (extensión en estado estacionario).
+        """
+        if not len(times):
+            return
+        times = np.asarray(times, dtype=float)
+        first = self.n_samples
+        self.n_samples += len(times)
+        self.last_time = float(times[-1])
+        self.last = values
+
+        if self.every:
+            index = np.arange(first, self.n_samples)
+            stored = times[index % self.every == 0]
+            end = self.size + len(stored)
+            if end > len(self.buffer):
+                self.buffer = np.resize(self.buffer, (max(end, 2 * len(self.buffer) + 1),
+                                                      len(self.columns)))
+            self.buffer[self.size:end, 0] = stored
+            self.buffer[self.size:end, 1:] = values
+            self.size = end
+
+    def finalize(self):
+        """Asegura que el último estado quede guardado en modo decimado."""
+        if self.every > 1 and self.last is not None and (self.n_samples - 1) % self.every != 0:
+            self._store(self.last_time, self.last)
+
+    def _store(self, t, values):
+        if self.size == len(self.buffer):
+            # Solo ocurre si el redondeo de t agrega pasos extra
+            self.buffer = np.resize(self.buffer, (2 * len(self.buffer) + 1, len(self.columns)))
+        row = self.buffer[self.size]
+        row[0] = t
+        row[1:] = values
+        self.size += 1
+
+    @property
+    def data(self):
+        """Vista (sin copia) de las filas registradas."""
+        return self.buffer[:self.size]
+
+    def column(self, name):
+        return self.buffer[:self.size, self.columns.index(name)]
@@ -2,10 +2,16 @@ import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
-from lib.simulation import Simulator
-from lib.epidemic_model import EpidemicModel
-from lib.nash import solve_nash
 import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.cache import SimulationCache
+from common.figures import FigureRenderer
+from common.nash import solve_nash
+from common.result_store import ResultStore
+from lib.simulation import Simulator, BatchSimulator
+from lib.epidemic_model import EpidemicModel
 
 # Configuración
 OUTPUT_DIR = "resultados"
@@ -19,16 +25,19 @@ S0 = N - I0
 TOTAL_TIME = 168.0 # 1 semana en horas
 DT = 1.0
 
-def run_and_plot_scenario(beta, r, title, filename):
-    initial_state = [S0, I0]
-    model = EpidemicModel(beta, r)
-    sim = Simulator(model, initial_state, DT, TOTAL_TIME)
-    sim.run()
-    
-    t = sim.t_values
-    S = sim.S_values
-    I = sim.I_values
-    
+# Las corridas individuales (con su trayectoria) se guardan en disco
+CACHE = SimulationCache(trajectories=True)
+
+# Matrices de payoff en .npy con índice de ejes (resultados/index.json); las
+# tablas CSV son una vista opcional
+STORE = ResultStore(OUTPUT_DIR)
+EXPORT_CSV = True
+
+# Las figuras se encolan y se generan juntas al final (en paralelo, saltando
+# las que no cambiaron)
+FIGURES = FigureRenderer()
+
+def plot_scenario(t, S, I, beta, r, title):
     plt.figure(figsize=(10, 6))
     plt.plot(t, S, 'b--', label='Susceptible', linewidth=2)
     plt.plot(t, I, 'r:', label='Infected', linewidth=2)
@@ -40,9 +49,14 @@ def run_and_plot_scenario(beta, r, title, filename):
     plt.ylabel("Nodes")
     plt.grid(True, alpha=0.3)
     plt.legend()
-    plt.savefig(os.path.join(OUTPUT_DIR, filename))
-    plt.close()
-    print(f"Generada: {filename}")
+
+def run_and_plot_scenario(beta, r, title, filename):
+    initial_state = [S0, I0]
+    model = EpidemicModel(beta, r)
+    trajectory = CACHE.run(Simulator, model, initial_state, DT, TOTAL_TIME)["trajectory"]
+
+    FIGURES.submit(os.path.join(OUTPUT_DIR, filename), plot_scenario,
+                   trajectory["t"], trajectory["S"], trajectory["I"], beta, r, title)
 
 run_and_plot_scenario(beta=1.62, r=0.5, title="Figura 5: Alta Propagación", filename="figura_5_high_spread.png")
 
@@ -57,46 +71,73 @@ print("\nSimulando Matriz de Payoffs...")
 attacker_betas = [0.5, 1.0, 1.5, 2.0, 2.5] # Estrategias del Atacante (filas)
 defender_rs = [0.5, 1.0, 2.0, 3.0, 5.0]    # Estrategias del Defensor (columnas)
 
-payoff_matrix_A = np.zeros((len(attacker_betas), len(defender_rs)))
-payoff_matrix_D = np.zeros((len(attacker_betas), len(defender_rs)))
+# Todas las celdas (beta, r) se simulan juntas como arreglos
+batch = BatchSimulator.from_grid(attacker_betas, defender_rs, [S0, I0], DT, TOTAL_TIME)
+batch.run()
+
+payoff_matrix_A = batch.payoff_attacker
+payoff_matrix_D = batch.payoff_defender
 
-for i, beta in enumerate(attacker_betas):
-    for j, r in enumerate(defender_rs):
-        model = EpidemicModel(beta, r)
-        sim = Simulator(model, [S0, I0], DT, TOTAL_TIME)
-        sim.run()
-        
-        payoff_matrix_A[i, j] = sim.payoff_attacker
-        payoff_matrix_D[i, j] = sim.payoff_defender
+# Guardar las matrices (y las tablas CSV, con los valores de β y r como etiquetas)
+axes = {"beta": attacker_betas, "r": defender_rs}
+for name, matrix, filename in (("payoff_attacker", payoff_matrix_A, "tabla_payoff_atacante.csv"),
+                               ("payoff_defender", payoff_matrix_D, "tabla_payoff_defensor.csv")):
+    STORE.save(name, matrix, axes, scenario="first")
+    if EXPORT_CSV:
+        STORE.export_csv(name, os.path.join(OUTPUT_DIR, filename), labels=False)
+print("Tablas de payoff guardadas.")
 
-# Guardar en CSV
 df_A = pd.DataFrame(payoff_matrix_A, index=attacker_betas, columns=defender_rs)
 df_D = pd.DataFrame(payoff_matrix_D, index=attacker_betas, columns=defender_rs)
 
-df_A.to_csv(os.path.join(OUTPUT_DIR, "tabla_payoff_atacante.csv"))
-df_D.to_csv(os.path.join(OUTPUT_DIR, "tabla_payoff_defensor.csv"))
-print("Tablas de payoff guardadas.")
-
 # Graficar Heatmaps 
-fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 6))
+def plot_heatmaps(df_A, df_D):
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 6))
+
+    sns.heatmap(df_A, annot=True, cmap="Reds", fmt=".2f", ax=ax1)
+    ax1.set_title("Payoff Atacante (Infección - Costo)")
+    ax1.set_ylabel("Beta (Atacante)")
+    ax1.set_xlabel("R (Defensor)")
 
-sns.heatmap(df_A, annot=True, cmap="Reds", fmt=".2f", ax=ax1)
-ax1.set_title("Payoff Atacante (Infección - Costo)")
-ax1.set_ylabel("Beta (Atacante)")
-ax1.set_xlabel("R (Defensor)")
+    sns.heatmap(df_D, annot=True, cmap="Greens", fmt=".2f", ax=ax2)
+    ax2.set_title("Payoff Defensor (Salud - Costo)")
+    ax2.set_ylabel("Beta (Atacante)")
+    ax2.set_xlabel("R (Defensor)")
 
-sns.heatmap(df_D, annot=True, cmap="Greens", fmt=".2f", ax=ax2)
-ax2.set_title("Payoff Defensor (Salud - Costo)")
-ax2.set_ylabel("Beta (Atacante)")
-ax2.set_xlabel("R (Defensor)")
+FIGURES.submit(os.path.join(OUTPUT_DIR, "tabla_3_heatmaps.png"), plot_heatmaps, df_A, df_D)
 
-plt.savefig(os.path.join(OUTPUT_DIR, "tabla_3_heatmaps.png"))
-plt.close()
+
+def plot_response(strategies, payoffs, expected, style, title, xlabel):
+    plt.figure(figsize=(10, 6))
+    plt.plot(strategies, payoffs, style, linewidth=2)
+    plt.axhline(y=expected, color='k', linestyle='--', label='Payoff Equilibrio')
+    plt.title(title)
+    plt.xlabel(xlabel)
+    plt.ylabel("Payoff Esperado")
+    plt.grid(True)
+    plt.legend()
+
+def plot_mixed_strategies(attacker_betas, defender_rs, eq_p, eq_q):
+    plt.figure(figsize=(12, 5))
+    
+    plt.subplot(1, 2, 1)
+    plt.bar([str(b) for b in attacker_betas], eq_p, color='red', alpha=0.7)
+    plt.title("Estrategia Mixta Atacante (Nash)")
+    plt.xlabel("Beta")
+    plt.ylabel("Probabilidad")
+    
+    plt.subplot(1, 2, 2)
+    plt.bar([str(r) for r in defender_rs], eq_q, color='green', alpha=0.7)
+    plt.title("Estrategia Mixta Defensor (Nash)")
+    plt.xlabel("R (Recuperación)")
+    
+    plt.tight_layout()
 
 
 #Equilibrio de Nash
 print("\nCalculando Equilibrio de Nash...")
-equilibria = solve_nash(payoff_matrix_A, payoff_matrix_D)
+# Las estrategias estrictamente dominadas se eliminan antes de enumerar soportes
+equilibria = solve_nash(payoff_matrix_A, payoff_matrix_D, eliminate="pure")
 
 if not equilibria:
     print("No se encontró equilibrio puro o mixto simple.")
@@ -116,47 +157,26 @@ else:
 
     payoffs_def_vs_r = np.dot(eq_p, payoff_matrix_D) # Promedio ponderado por estrategia de atacante
     
-    plt.figure(figsize=(10, 6))
-    plt.plot(defender_rs, payoffs_def_vs_r, 'g-o', linewidth=2)
-    plt.axhline(y=expected_payoff_D, color='k', linestyle='--', label='Payoff Equilibrio')
-    plt.title("Figura 8: Payoff del Defensor vs Tasa de Recuperación (R)\n(Ante estrategia de equilibrio del Atacante)")
-    plt.xlabel("Tasa de Recuperación (r)")
-    plt.ylabel("Payoff Esperado")
-    plt.grid(True)
-    plt.legend()
-    plt.savefig(os.path.join(OUTPUT_DIR, "figura_8_nash_defensor.png"))
-    plt.close()
+    FIGURES.submit(os.path.join(OUTPUT_DIR, "figura_8_nash_defensor.png"), plot_response,
+                   defender_rs, payoffs_def_vs_r, expected_payoff_D, 'g-o',
+                   "Figura 8: Payoff del Defensor vs Tasa de Recuperación (R)\n(Ante estrategia de equilibrio del Atacante)",
+                   "Tasa de Recuperación (r)")
 
     # Eje X: Beta (Atacante), Eje Y: Payoff Atacante
     payoffs_att_vs_beta = np.dot(payoff_matrix_A, eq_q)
     
-    plt.figure(figsize=(10, 6))
-    plt.plot(attacker_betas, payoffs_att_vs_beta, 'r-o', linewidth=2)
-    plt.axhline(y=expected_payoff_A, color='k', linestyle='--', label='Payoff Equilibrio')
-    plt.title("Figura 9: Payoff del Atacante vs Tasa de Infección (Beta)\n(Ante estrategia de equilibrio del Defensor)")
-    plt.xlabel("Tasa de Infección (Beta)")
-    plt.ylabel("Payoff Esperado")
-    plt.grid(True)
-    plt.legend()
-    plt.savefig(os.path.join(OUTPUT_DIR, "figura_9_nash_atacante.png"))
-    plt.close()
+    FIGURES.submit(os.path.join(OUTPUT_DIR, "figura_9_nash_atacante.png"), plot_response,
+                   attacker_betas, payoffs_att_vs_beta, expected_payoff_A, 'r-o',
+                   "Figura 9: Payoff del Atacante vs Tasa de Infección (Beta)\n(Ante estrategia de equilibrio del Defensor)",
+                   "Tasa de Infección (Beta)")
 
     # Gráfica Extra: Visualización de las estrategias mixtas
-    plt.figure(figsize=(12, 5))
-    
-    plt.subplot(1, 2, 1)
-    plt.bar([str(b) for b in attacker_betas], eq_p, color='red', alpha=0.7)
-    plt.title("Estrategia Mixta Atacante (Nash)")
-    plt.xlabel("Beta")
-    plt.ylabel("Probabilidad")
-    
-    plt.subplot(1, 2, 2)
-    plt.bar([str(r) for r in defender_rs], eq_q, color='green', alpha=0.7)
-    plt.title("Estrategia Mixta Defensor (Nash)")
-    plt.xlabel("R (Recuperación)")
-    
-    plt.tight_layout()
-    plt.savefig(os.path.join(OUTPUT_DIR, "nash_estrategias_mixtas.png"))
-    plt.close()
+    FIGURES.submit(os.path.join(OUTPUT_DIR, "nash_estrategias_mixtas.png"),
+                   plot_mixed_strategies, attacker_betas, defender_rs, eq_p, eq_q)
+
+for path, status in FIGURES.flush().items():
+    print(f"{'Generada' if status == 'generada' else 'Sin cambios'}: {os.path.basename(path)}")
 
+print("\n" + CACHE.report())
+print(FIGURES.report())
 print("\nAnálisis completo finalizado. Revisa la carpeta 'resultados'.")
\ No newline at end of file
@@ -1,5 +1,12 @@
+import numpy as np
+
+
 class EpidemicModel:
     """Base general para modelos tipo SIR/SIS/etc."""
+
+    # Parámetros y coeficientes de costo respecto a los que se derivan los payoffs
+    PARAMETERS = ("beta", "r")
+    COST_COEFFICIENTS = ("cost_attacker_coeff", "cost_defender_coeff")
     
     def __init__(self, beta, r):
         self.beta = beta
@@ -14,6 +21,10 @@ class EpidemicModel:
         self.cost_attacker = self.get_cost_attacker()
         self.cost_defender = self.get_cost_defender()
     
+    def infections_per_dt(self, S, I, N):
+        """Número de nodos que se infectan por unidad de tiempo"""
+        return self.beta * (I / N) * S
+
     def disinfections_per_dt(self, I):
         """Número de nodos que se recuperan por unidad de tiempo"""
         return self.r * I
@@ -34,4 +45,26 @@ class EpidemicModel:
     def dI_dt(self, S, I, N):
         """Ecuación diferencial para I (Modelo SIS)"""
         # dI/dt = beta*(I/N)*S - r*I
-        return self.beta * (I / N) * S - self.r * I
\ No newline at end of file
+        return self.beta * (I / N) * S - self.r * I
+
+    def jacobian(self, S, I, N):
+        """Derivadas de (dS/dt, dI/dt) respecto a (S, I)."""
+        a = self.beta * I / N
+        b = self.beta * S / N
+        return np.array([[-a, self.r - b],
+                         [a, b - self.r]])
+
+    def parameter_jacobian(self, S, I, N):
+        """Derivadas de (dS/dt, dI/dt) respecto a (beta, r)."""
+        infections = I * S / N
+        return np.array([[-infections, I],
+                         [infections, -I]])
+
+    def cost_gradients(self):
+        """Derivadas de los costos respecto a PARAMETERS + COST_COEFFICIENTS."""
+        return {
+            "attacker": {"beta": self.cost_attacker_coeff, "r": 0.0,
+                         "cost_attacker_coeff": self.beta, "cost_defender_coeff": 0.0},
+            "defender": {"beta": 0.0, "r": self.cost_defender_coeff,
+                         "cost_attacker_coeff": 0.0, "cost_defender_coeff": self.r},
+        }
@@ -0,0 +1,130 @@
+import numpy as np
+
+from .epidemic_model import EpidemicModel
+
+
+class ExactSimulator:
+    """
+    Solución analítica del modelo SIS de EpidemicModel.
+
+    Con S + I = N la dinámica de I es logística:
+        dI/dt = a*I - c*I^2,   a = beta - r,   c = beta / N
+    cuya solución es
+        I(t) = I0 * e^(a t) / (1 + c*I0*(e^(a t) - 1)/a)
+    y su integral
+        ∫_0^T I dt = ln(1 + c*I0*(e^(a T) - 1)/a) / c.
+
+    Las ganancias y payoffs se obtienen en O(1) por celda, sin pasos de tiempo.
+    beta, r y el estado inicial pueden ser arreglos (se evalúa toda la malla).
+    Se incluyen el caso límite beta == r (a = 0) y el régimen de extinción (a < 0).
+    """
+
+    def __init__(self, model, initial_state, total_time=168.0):
+        self.model = model
+        self.beta = np.asarray(model.beta, dtype=float)
+        self.r = np.asarray(model.r, dtype=float)
+
+        S0, I0 = initial_state
+        self.I0 = np.asarray(I0, dtype=float)
+        self.N = np.asarray(S0, dtype=float) + self.I0
+
+        self.total_time = total_time
+
+    @classmethod
+    def from_grid(cls, betas, rs, initial_state, total_time=168.0):
+        """Evalúa el producto cartesiano betas x rs (filas beta, columnas r)."""
+        B, R = np.meshgrid(np.asarray(betas, dtype=float),
+                           np.asarray(rs, dtype=float), indexing="ij")
+        return cls(EpidemicModel(B, R), initial_state, total_time)
+
+    def _terms(self, t):
+        """
+        Devuelve a, c, e = exp(-|a| t) y psi = (1 - e) / |a| (psi -> t si a -> 0).
+        Trabajar con -|a| evita el desbordamiento de exp(a t) cuando a*t es grande.
+        """
+        t = np.asarray(t, dtype=float)
+        a = self.beta - self.r
+        c = self.beta / self.N
+        abs_a = np.abs(a)
+        x = abs_a * t
+        e = np.exp(-x)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            psi = np.where(x < 1e-12, t * (1 - 0.5 * x), -np.expm1(-x) / abs_a)
+        return a, c, e, psi
+
+    def infected(self, t):
+        """I(t) exacto."""
+        a, c, e, psi = self._terms(t)
+        growth = self.I0 / (e + c * self.I0 * psi)        # a > 0
+        decay = self.I0 * e / (1 + c * self.I0 * psi)     # a <= 0
+        return np.where(a > 0, growth, decay)
+
+    def susceptible(self, t):
+        """S(t) = N - I(t)."""
+        return self.N - self.infected(t)
+
+    def integral_infected(self, T):
+        """∫_0^T I(t) dt exacto."""
+        a, c, e, psi = self._terms(T)
+        z = c * self.I0 * psi
+        with np.errstate(invalid="ignore", divide="ignore"):
+            growth = (a * T + np.log(e + z)) / c
+            # Para c*I0*psi pequeño log1p(z)/c -> I0*psi (incluye beta = 0)
+            decay = np.where(z > 1e-12, np.log1p(z) / c, self.I0 * psi)
+        return np.where(a > 0, growth, decay)
+
+    def run(self):
+        """
+        Calcula ganancias, costos y payoffs igual que Simulator.run pero con las
+        integrales exactas.
+
+        Returns:
+            Diccionario con las ganancias, costos y payoffs (escalares o matrices).
+        """
+        T = self.total_time
+        shape = np.broadcast(self.beta, self.r, self.N).shape
+
+        gain_attacker = self.integral_infected(T) / (self.N * T)
+        self.gain_attacker = np.where(np.abs(gain_attacker) < 1e10, gain_attacker, 0.0)
+        self.gain_defender = 1.0 - self.gain_attacker
+
+        self.cost_attacker = np.broadcast_to(self.model.cost_attacker, shape)
+        self.cost_defender = np.broadcast_to(self.model.cost_defender, shape)
+
+        payoff_attacker = self.gain_attacker - self.cost_attacker
+        payoff_defender = self.gain_defender - self.cost_defender
+        self.payoff_attacker = np.where(np.abs(payoff_attacker) < 1e10, payoff_attacker, -1e6)
+        self.payoff_defender = np.where(np.abs(payoff_defender) < 1e10, payoff_defender, -1e6)
+
+        return {
+            "gain_attacker": self.gain_attacker,
+            "gain_defender": self.gain_defender,
+            "cost_attacker": self.cost_attacker,
+            "cost_defender": self.cost_defender,
+            "payoff_attacker": self.payoff_attacker,
+            "payoff_defender": self.payoff_defender,
+        }
+
+    def cross_check(self, simulator):
+        """
+        Compara una corrida ya ejecutada de Simulator (mismo modelo y estado
+        inicial) contra la solución exacta.
+
+        Returns:
+            Diccionario con el error máximo de I(t)/N sobre t_values y los
+            errores absolutos de ganancias y payoffs.
+        """
+        if not hasattr(self, "gain_attacker"):
+            self.run()
+
+        t = np.asarray(simulator.t_values)
+        I_exact = self.infected(t)
+        I_sim = np.asarray(simulator.I_values)
+
+        return {
+            "max_error_I_fraction": float(np.max(np.abs(I_sim - I_exact) / self.N)),
+            "error_gain_attacker": float(abs(simulator.gain_attacker - self.gain_attacker)),
+            "error_gain_defender": float(abs(simulator.gain_defender - self.gain_defender)),
+            "error_payoff_attacker": float(abs(simulator.payoff_attacker - self.payoff_attacker)),
+            "error_payoff_defender": float(abs(simulator.payoff_defender - self.payoff_defender)),
+        }
@@ -0,0 +1,234 @@
+import math
+
+import numpy as np
+import scipy.sparse as sp
+
+from common.trajectory import Trajectory
+
+from .simulation import Simulator
+
+SUSCEPTIBLE, INFECTED, REMOVED = 0, 1, 2
+
+
+class NetworkSimulator:
+    """
+    Simulación por nodo sobre una red (matriz de adyacencia dispersa CSR).
+
+    Cada nodo guarda su estado en un arreglo uint8 (0=S, 1=I, 2=R). En cada paso
+    la presión de infección se calcula con un producto matriz-vector disperso:
+
+        presion_i = (A x_I)_i / grado_i
+
+    es decir, la fracción de vecinos infectados. En un grafo completo esto
+    coincide con el término I/N del modelo bien mezclado, y:
+
+        P(S -> I) = beta * presion * dt
+        P(S -> R) = gamma * dt
+        P(I -> S) = r * dt
+        P(I -> R) = lambda_ * dt
+
+    (truncadas a 1), de modo que el valor esperado de cada paso coincide con el
+    paso de Euler de Simulator.
+
+    gamma y lambda_ se toman del modelo si existen (SIR con remoción); con
+    EpidemicModel son 0 y la dinámica es SIS.
+
+    Expone las mismas salidas que Simulator (gain_attacker, gain_defender,
+    cost_*, payoff_*), con las mismas protecciones contra NaN/Inf (ganancia 0,
+    payoff -1e6), por lo que sirve para llenar matrices de payoff.
+
+    initial_infected / initial_removed fijan qué nodos empiezan en I y en R;
+    deben tener exactamente I0 y R0 nodos distintos. Los que no se den se
+    sortean entre los nodos restantes.
+    """
+
+    __slots__ = ("model", "adjacency", "weights", "state", "n_nodes", "dt",
+                 "total_time", "time", "rng", "trajectory", "record",
+                 "n_S", "n_I", "n_R", "area_attacker", "area_defender",
+                 "total_infections", "total_disinfections", "total_immunisations",
+                 "total_removals",
+                 "gain_attacker", "gain_defender", "cost_attacker", "cost_defender",
+                 "payoff_attacker", "payoff_defender")
+
+    def __init__(self, model, initial_state, dt=1.0, total_time=168.0, *,
+                 adjacency, seed=0, initial_infected=None, initial_removed=None,
+                 record="full"):
+        self.model = model
+        self.adjacency = sp.csr_matrix(adjacency)
+        self.n_nodes = self.adjacency.shape[0]
+        if sum(initial_state) != self.n_nodes:
+            raise ValueError("El estado inicial debe sumar el número de nodos de la red")
+
+        # Matriz normalizada por filas: W = D^-1 A (nodos aislados quedan en 0)
+        degree = np.asarray(self.adjacency.sum(axis=1)).ravel()
+        inv_degree = np.divide(1.0, degree, out=np.zeros_like(degree, dtype=float),
+                               where=degree > 0)
+        self.weights = sp.diags(inv_degree.astype(np.float32)) @ self.adjacency.astype(np.float32)
+        self.weights = self.weights.tocsr()
+
+        self.dt = dt
+        self.total_time = total_time
+        self.time = 0.0
+        self.rng = np.random.default_rng(seed)
+        self.record = record
+
+        # Asignación inicial de estados
+        S0, I0 = int(initial_state[0]), int(initial_state[1])
+        R0 = int(initial_state[2]) if len(initial_state) > 2 else 0
+        self.state = np.full(self.n_nodes, SUSCEPTIBLE, dtype=np.uint8)
+        initial_infected = self.check_nodes(initial_infected, I0, "initial_infected")
+        initial_removed = self.check_nodes(initial_removed, R0, "initial_removed")
+        if initial_infected is not None and initial_removed is not None and \
+                np.intersect1d(initial_infected, initial_removed).size:
+            raise ValueError("initial_infected e initial_removed no pueden compartir nodos")
+
+        # Los nodos no fijados se sortean entre los que quedan libres
+        fixed = np.concatenate([nodes for nodes in (initial_infected, initial_removed)
+                                if nodes is not None] or [np.empty(0, dtype=np.intp)])
+        free = self.rng.permutation(np.setdiff1d(np.arange(self.n_nodes), fixed))
+        if initial_infected is None:
+            initial_infected, free = free[:I0], free[I0:]
+        if initial_removed is None:
+            initial_removed = free[:R0]
+        self.state[initial_infected] = INFECTED
+        self.state[initial_removed] = REMOVED
+
+        self.n_I = int(np.count_nonzero(self.state == INFECTED))
+        self.n_R = int(np.count_nonzero(self.state == REMOVED))
+        self.n_S = self.n_nodes - self.n_I - self.n_R
+
+        capacity = math.ceil(self.total_time / self.dt) + 1
+        self.trajectory = Trajectory(("S", "I", "R"), capacity, record)
+        self.trajectory.append(0.0, self.n_S, self.n_I, self.n_R)
+
+        self.area_attacker = 0.0
+        self.area_defender = 0.0
+        self.total_infections = 0
+        self.total_disinfections = 0
+        self.total_immunisations = 0
+        self.total_removals = 0
+
+    def check_nodes(self, nodes, expected, name):
+        """Valida una lista de nodos iniciales: tamaño, rango y sin repetidos."""
+        if nodes is None:
+            return None
+        nodes = np.asarray(nodes, dtype=np.intp).ravel()
+        if len(np.unique(nodes)) != len(nodes):
+            raise ValueError(f"{name} tiene nodos repetidos")
+        if len(nodes) != expected:
+            raise ValueError(f"{name} tiene {len(nodes)} nodos, pero el estado inicial "
+                             f"indica {expected}")
+        if len(nodes) and (nodes.min() < 0 or nodes.max() >= self.n_nodes):
+            raise ValueError(f"{name} contiene nodos fuera de la red")
+        return nodes
+
+    @property
+    def t_values(self):
+        return self.trajectory.column("t")
+
+    @property
+    def S_values(self):
+        return self.trajectory.column("S")
+
+    @property
+    def I_values(self):
+        return self.trajectory.column("I")
+
+    @property
+    def R_values(self):
+        return self.trajectory.column("R")
+
+    def step(self):
+        m = self.model
+        dt = self.dt
+        gamma = getattr(m, "gamma", 0.0)
+        lambda_ = getattr(m, "lambda_", 0.0)
+
+        state = self.state
+        susceptible = state == SUSCEPTIBLE
+        infected = state == INFECTED
+
+        # Presión de infección: fracción de vecinos infectados (mat-vec disperso)
+        pressure = self.weights @ infected.astype(np.float32)
+
+        # Un único uniforme por nodo reparte las transiciones en competencia:
+        # S: [0, p_inf) -> I, [p_inf, p_inf + p_imm) -> R
+        # I: [0, r dt) -> S, [r dt, (r + lambda_) dt) -> R
+        u = self.rng.random(self.n_nodes, dtype=np.float32)
+
+        p_inf = m.beta * dt * pressure
+        p_leave_S = np.minimum(p_inf + gamma * dt, 1.0)
+        leave_S = susceptible & (u < p_leave_S)
+        new_infected = leave_S & (u < p_inf)
+        new_immune = leave_S & ~new_infected
+
+        p_dis = min(m.r * dt, 1.0)
+        p_leave_I = min((m.r + lambda_) * dt, 1.0)
+        leave_I = infected & (u < p_leave_I)
+        disinfected = leave_I & (u < p_dis)
+        removed = leave_I & ~disinfected
+
+        state[new_infected] = INFECTED
+        state[new_immune] = REMOVED
+        state[disinfected] = SUSCEPTIBLE
+        state[removed] = REMOVED
+
+        n_inf = int(np.count_nonzero(new_infected))
+        n_imm = int(np.count_nonzero(new_immune))
+        n_dis = int(np.count_nonzero(disinfected))
+        n_rem = int(np.count_nonzero(removed))
+        self.total_infections += n_inf
+        self.total_immunisations += n_imm
+        self.total_disinfections += n_dis
+        self.total_removals += n_rem
+
+        prev_I, prev_SR = self.n_I, self.n_S + self.n_R
+        self.n_S += n_dis - n_inf - n_imm
+        self.n_I += n_inf - n_dis - n_rem
+        self.n_R += n_imm + n_rem
+
+        # Ganancias acumuladas con la regla del trapecio
+        N = self.n_nodes
+        self.area_attacker += 0.5 * (prev_I + self.n_I) / N * dt
+        self.area_defender += 0.5 * (prev_SR + self.n_S + self.n_R) / N * dt
+
+        self.time += dt
+        self.trajectory.append(self.time, self.n_S, self.n_I, self.n_R)
+
+    def compute_defender_cost(self):
+        m = self.model
+        if hasattr(m, "cost_disinfection"):
+            # Modelo de parches: costo por evento
+            return (self.total_disinfections * m.cost_disinfection +
+                    self.total_immunisations * m.cost_immunisation +
+                    self.total_removals * m.cost_combined)
+        return m.cost_defender
+
+    # Mismas protecciones que el modelo bien mezclado
+    compute_gain = Simulator.compute_gain
+    compute_attacker_payoff = Simulator.compute_attacker_payoff
+    compute_defender_payoff = Simulator.compute_defender_payoff
+
+    def run(self):
+        """Corre la simulación completa y devuelve las mismas salidas que Simulator."""
+        while self.time < self.total_time:
+            self.step()
+        self.trajectory.finalize()
+
+        self.gain_attacker = self.compute_gain(self.area_attacker)
+        self.gain_defender = self.compute_gain(self.area_defender)
+        self.cost_attacker = self.model.cost_attacker
+        self.cost_defender = self.compute_defender_cost()
+        self.payoff_attacker = self.compute_attacker_payoff()
+        self.payoff_defender = self.compute_defender_payoff()
+
+        return {
+            "gain_attacker": self.gain_attacker,
+            "gain_defender": self.gain_defender,
+            "cost_attacker": self.cost_attacker,
+            "cost_defender": self.cost_defender,
+            "payoff_attacker": self.payoff_attacker,
+            "payoff_defender": self.payoff_defender,
+            "total_infections": self.total_infections,
+            "total_disinfections": self.total_disinfections,
+        }
@@ -1,8 +1,79 @@
+import copy
+import math
+
+import numpy as np
+
+from common.integrators import dopri5
+from common.trajectory import Trajectory, remaining_times
+
+from .epidemic_model import EpidemicModel
+
+
 class Simulator:
-    """Simulación dinámica con pasos discretos."""
+    """
+    Simulación dinámica con pasos discretos.
+
+    method="euler" usa Euler explícito con paso fijo dt. method="rk45" integra
+    con Dormand–Prince de paso adaptativo (tolerancias rtol/atol) y solo usa dt
+    como malla de salida donde se interpolan los valores para las ganancias.
+
+    record controla cuánto de la trayectoria se guarda (ver Trajectory):
+    "full", cada k pasos (entero k) o "summary" (sin historia).
+
+    Las ganancias se acumulan dentro del ciclo de pasos (regla del trapecio),
+    así que run() nunca necesita la historia guardada. metrics permite agregar
+    integrandos extra {nombre: f(sim)}; su promedio temporal queda en
+    metric_values al terminar run().
+
+    Con sensitivities=True (solo method="euler") se propagan junto al estado
+    las sensibilidades d(S, I)/d(beta, r) del mapa de Euler discreto, incluido
+    el recorte y la renormalización, y run() deja en gain_gradients y
+    payoff_gradients las derivadas exactas de las ganancias y payoffs respecto
+    a los parámetros y a los coeficientes de costo del modelo.
+
+    Con steady_tol (solo method="euler") el ciclo se detiene cuando la norma
+    de la derivada, max(|dS/dt|, |dI/dt|) / N, queda bajo steady_tol y no
+    crece durante steady_steps pasos seguidos: desde ahí el estado ya no
+    cambia, así que el resto del horizonte se suma analíticamente a las
+    integrales y a la trayectoria. steady_time guarda el tiempo en que se
+    detuvo (None si no llegó al estado estacionario).
+
+    observers es una secuencia de funciones f(sim) que se llaman después de
+    cada paso (y de cada muestra de salida con rk45); sin observadores el
+    ciclo solo paga una comprobación por paso.
+    """
+
+    __slots__ = ("model", "method", "rtol", "atol", "record", "metrics", "observers",
+                 "sensitivities",
+                 "steady_tol", "steady_steps", "steady_count", "steady_time", "rate",
+                 "S", "I", "N", "dt", "total_time", "time",
+                 "trajectory", "total_disinfections", "n_rhs_evals", "n_steps",
+                 "area_attacker", "area_defender", "metric_areas", "metric_values",
+                 "prev_integrands", "X", "d_area_attacker", "d_area_defender",
+                 "gain_gradients", "payoff_gradients",
+                 "gain_attacker", "gain_defender", "cost_attacker", "cost_defender",
+                 "payoff_attacker", "payoff_defender")
     
-    def __init__(self, model, initial_state, dt=1.0, total_time=168.0):
+    def __init__(self, model, initial_state, dt=1.0, total_time=168.0,
+                 method="euler", rtol=1e-6, atol=1e-6, record="full", metrics=None,
+                 sensitivities=False, steady_tol=None, steady_steps=5, observers=None):
+        if method not in ("euler", "rk45"):
+            raise ValueError(f"Método de integración desconocido: {method}")
+        if sensitivities and method != "euler":
+            raise ValueError("Las sensibilidades se propagan con el método euler")
+        if steady_tol is not None and method != "euler":
+            raise ValueError("La detección de estado estacionario usa el método euler")
+
         self.model = model
+        self.method = method
+        self.rtol = rtol
+        self.atol = atol
+        self.record = record
+        self.metrics = dict(metrics or {})
+        self.observers = tuple(observers or ())
+        self.sensitivities = sensitivities
+        self.steady_tol = steady_tol
+        self.steady_steps = steady_steps
         
         # Estado poblacional (no por nodo)
         self.S, self.I = initial_state
@@ -15,17 +86,103 @@ class Simulator:
         self.initialize_statistics()
 
     def initialize_statistics(self):
-        self.t_values = [0.0]
-        self.S_values = [self.S]
-        self.I_values = [self.I]
-        self.history = [(0.0, self.S, self.I)]
+        capacity = math.ceil(self.total_time / self.dt) + 1
+        self.trajectory = Trajectory(("S", "I"), capacity, self.record)
+        self.trajectory.append(0.0, self.S, self.I)
         self.total_disinfections = 0
+        self.n_rhs_evals = 0
+        self.n_steps = 0
+
+        # Pasos seguidos con derivada pequeña y no creciente
+        self.steady_count = 0
+        self.steady_time = None
+        self.rate = math.inf
+
+        # Integrales acumuladas en el ciclo (regla del trapecio)
+        self.area_attacker = 0.0
+        self.area_defender = 0.0
+        self.metric_areas = dict.fromkeys(self.metrics, 0.0)
+        self.prev_integrands = self.integrands()
+
+        if self.sensitivities:
+            # X[i, k] = d(estado_i)/d(parámetro_k); el estado inicial no depende de ellos
+            n_params = len(self.model.PARAMETERS)
+            self.X = np.zeros((2, n_params))
+            self.d_area_attacker = np.zeros(n_params)
+            self.d_area_defender = np.zeros(n_params)
+
+    def integrands(self):
+        """Valores instantáneos de P_att = I/N, P_def = S/N y de las métricas extra."""
+        values = (self.I / self.N, self.S / self.N)
+        if self.metrics:
+            values += tuple(f(self) for f in self.metrics.values())
+        return values
+
+    def accumulate(self, dt):
+        """Suma el último intervalo de longitud dt a las integrales (trapecio)."""
+        current = self.integrands()
+        prev = self.prev_integrands
+        self.area_attacker += 0.5 * (prev[0] + current[0]) * dt
+        self.area_defender += 0.5 * (prev[1] + current[1]) * dt
+        for k, name in enumerate(self.metrics, start=2):
+            self.metric_areas[name] += 0.5 * (prev[k] + current[k]) * dt
+        self.prev_integrands = current
+
+    def propagate_sensitivities(self):
+        """
+        Avanza X = d(S, I)/d(parámetros) con la derivada del paso de Euler que
+        step() está por dar, desde el estado actual:
+            X' = R C [(Id + dt J) X + dt F]
+        con J y F las derivadas del modelo, C la del recorte (0 en la cota
+        activa) y R la de la renormalización S + I = N.
+        """
+        m = self.model
+        dt, N = self.dt, self.N
+        S, I = self.S, self.I
+
+        X = self.X + dt * (m.jacobian(S, I, N) @ self.X + m.parameter_jacobian(S, I, N))
+
+        y = np.array([S + m.dS_dt(S, I, N) * dt, I + m.dI_dt(S, I, N) * dt])
+        X[(y <= 0.0) | (y >= N)] = 0.0
+        y = np.clip(y, 0.0, N)
+
+        total = y.sum()
+        if total > 0:
+            X = N * (X / total - np.outer(y, X.sum(axis=0)) / total ** 2)
+
+        self.d_area_attacker += 0.5 * (self.X[1] + X[1]) / N * dt
+        self.d_area_defender += 0.5 * (self.X[0] + X[0]) / N * dt
+        self.X = X
+
+    def compute_payoff_gradients(self):
+        """Derivadas de ganancias y payoffs respecto a parámetros y coeficientes de costo."""
+        m = self.model
+        names = m.PARAMETERS + m.COST_COEFFICIENTS
+        cost_gradients = m.cost_gradients()
+        self.gain_gradients = {}
+        self.payoff_gradients = {}
+        for player, area, d_area, payoff in (
+                ("attacker", self.area_attacker, self.d_area_attacker, self.payoff_attacker),
+                ("defender", self.area_defender, self.d_area_defender, self.payoff_defender)):
+            # Donde las protecciones contra valores inválidos actuaron, la derivada es 0
+            d_gain = dict.fromkeys(names, 0.0)
+            if abs(area / self.total_time) < 1e10:
+                d_gain.update(zip(m.PARAMETERS, (d_area / self.total_time).tolist()))
+            self.gain_gradients[player] = d_gain
+            self.payoff_gradients[player] = {
+                name: d_gain[name] - cost_gradients[player][name] if payoff != -1e6 else 0.0
+                for name in names}
 
     def step(self):
         """Avanza la simulación un paso en el tiempo."""
+        if self.sensitivities:
+            self.propagate_sensitivities()
         
         dS = self.model.dS_dt(self.S, self.I, self.N)
         dI = self.model.dI_dt(self.S, self.I, self.N)
+        self.n_rhs_evals += 1
+        if self.steady_tol is not None:
+            self.track_steady(max(abs(dS), abs(dI)) / self.N)
         
         # Actualizamos estado con método de Euler
         self.S += dS * self.dt 
@@ -47,34 +204,72 @@ class Simulator:
 
         self.time += self.dt
 
+        self.accumulate(self.dt)
         self.register_history()
+        if self.observers:
+            for observer in self.observers:
+                observer(self)
  
-    def register_history(self):
-        self.t_values.append(self.time)
-        self.S_values.append(self.S)
-        self.I_values.append(self.I)
-        self.history.append((self.time, self.S, self.I))
+    def track_steady(self, rate):
+        """Cuenta los pasos seguidos con derivada bajo steady_tol y no creciente."""
+        if rate < self.steady_tol and rate <= self.rate:
+            self.steady_count += 1
+        else:
+            self.steady_count = 0
+        self.rate = rate
 
-    def compute_gain(self, P):
+    def extend_steady(self):
         """
-        Calcula G = (1/T) * ∫ P(t) dt usando regla del trapecio.
-        P es una lista de valores P(t).
+        Termina el horizonte sin integrar: con el estado fijo los integrandos
+        son constantes, así que cada integral suma su valor actual por el
+        tiempo restante y la trayectoria repite el estado en los tiempos que
+        habría recorrido el ciclo.
         """
-        total_area = 0.0
+        times = remaining_times(self.time, self.total_time, self.dt)
+        if not times:
+            return
+        span = times[-1] - self.time
+        current = self.prev_integrands
+        self.area_attacker += current[0] * span
+        self.area_defender += current[1] * span
+        for k, name in enumerate(self.metrics, start=2):
+            self.metric_areas[name] += current[k] * span
+        self.total_disinfections += self.model.disinfections_per_dt(self.I) * self.dt * len(times)
+        if self.sensitivities:
+            self.d_area_attacker += self.X[1] / self.N * span
+            self.d_area_defender += self.X[0] / self.N * span
+
+        self.trajectory.extend(times, self.S, self.I)
+        self.steady_time = self.time
+        self.time = times[-1]
+
+    def register_history(self):
+        self.trajectory.append(self.time, self.S, self.I)
+
+    # Vistas de la trayectoria registrada (arreglos sin copia)
+    @property
+    def t_values(self):
+        return self.trajectory.column("t")
 
-        # Regla del trapecio sobre todos los intervalos
-        for i in range(1, len(self.t_values)):
-            t_prev = self.t_values[i-1]
-            t_curr = self.t_values[i]
+    @property
+    def S_values(self):
+        return self.trajectory.column("S")
 
-            P_prev = P[i-1]
-            P_curr = P[i]
+    @property
+    def I_values(self):
+        return self.trajectory.column("I")
 
-            dt = t_curr - t_prev
-            area = 0.5 * (P_prev + P_curr) * dt
-            total_area += area
+    @property
+    def history(self):
+        """Filas (t, S, I) registradas."""
+        return self.trajectory.data
 
-        gain = total_area / self.total_time
+    def compute_gain(self, area):
+        """
+        Calcula G = (1/T) * ∫ P(t) dt, donde area es la integral (trapecio)
+        acumulada paso a paso en accumulate().
+        """
+        gain = area / self.total_time
         
         # Protección contra NaN/Inf
         if not (abs(gain) < 1e10):  # Detectar NaN o valores muy grandes
@@ -86,16 +281,14 @@ class Simulator:
         """
         El atacante controla I(t)/N.
         """
-        P_att = [I / self.N for I in self.I_values]
-        return self.compute_gain(P_att)
+        return self.compute_gain(self.area_attacker)
     
     def compute_gain_defender(self):
         """
         El defensor controla S(t)/N.
         (en el modelo simple SI)
         """
-        P_def = [S / self.N for S in self.S_values]
-        return self.compute_gain(P_def)
+        return self.compute_gain(self.area_defender)
 
     def compute_defender_cost(self):
         """
@@ -130,13 +323,75 @@ class Simulator:
             return -1e6  # Penalización grande pero finita
         return payoff
 
+    def output_times(self):
+        """Malla de tiempos que recorrería el ciclo de Euler (0, dt, 2dt, ...)."""
+        times = [0.0]
+        t = 0
+        while t < self.total_time:
+            t += self.dt
+            times.append(t)
+        return times
+
+    def rhs(self, t, y):
+        """
+        Lado derecho aumentado: (dS/dt, dI/dt) más las cuadraturas de las
+        desinfecciones, I/N y S/N, para obtener los totales y las ganancias
+        sin depender de la malla de salida.
+        """
+        S, I = y[0], y[1]
+        return np.array([
+            self.model.dS_dt(S, I, self.N),
+            self.model.dI_dt(S, I, self.N),
+            self.model.disinfections_per_dt(I),
+            I / self.N,
+            S / self.N,
+        ])
+
+    def run_adaptive(self):
+        """
+        Integra con paso adaptativo y llena t_values/S_values/I_values en la
+        misma malla que usaría Euler, interpolando la salida densa.
+        """
+        t_values = self.output_times()
+        y_eval, n_evals, n_steps = dopri5(
+            self.rhs, [self.S, self.I, 0.0, 0.0, 0.0], t_values[-1], t_values,
+            rtol=self.rtol, atol=self.atol)
+
+        self.n_rhs_evals += n_evals
+        self.n_steps = n_steps
+
+        S_values = np.clip(y_eval[:, 0], 0.0, self.N)
+        I_values = np.clip(y_eval[:, 1], 0.0, self.N)
+        for t, S, I in zip(t_values[1:], S_values[1:], I_values[1:]):
+            t_prev = self.time
+            self.time, self.S, self.I = t, float(S), float(I)
+            self.accumulate(t - t_prev)
+            self.register_history()
+            if self.observers:
+                for observer in self.observers:
+                    observer(self)
+
+        # Las ganancias usan las cuadraturas exactas, no el trapecio sobre la malla
+        self.total_disinfections = float(y_eval[-1, 2])
+        self.area_attacker = float(y_eval[-1, 3])
+        self.area_defender = float(y_eval[-1, 4])
+
     def run(self):
         """Corre la simulación completa."""
-        while self.time < self.total_time:
-            self.step()
-        
+        if self.method == "rk45":
+            self.run_adaptive()
+        else:
+            while self.time < self.total_time:
+                self.step()
+                if self.steady_count >= self.steady_steps:
+                    self.extend_steady()
+            self.n_steps = self.trajectory.n_samples - 1
+        self.trajectory.finalize()
+
         self.gain_attacker = self.compute_gain_attacker()
         self.gain_defender = self.compute_gain_defender()
+        self.metric_values = {name: area / self.total_time
+                              for name, area in self.metric_areas.items()}
 
         self.cost_defender = self.compute_defender_cost()
         self.cost_attacker = self.compute_attacker_cost()
@@ -144,3 +399,193 @@ class Simulator:
         self.payoff_attacker = self.compute_attacker_payoff()
         self.payoff_defender = self.compute_defender_payoff()
 
+        if self.sensitivities:
+            self.compute_payoff_gradients()
+
+
+
+class BatchSimulator:
+    """
+    Versión vectorizada de Simulator: avanza toda una malla de celdas (beta, r)
+    a la vez usando arreglos de NumPy en lugar de floats escalares.
+
+    El modelo recibido debe tener beta y r como arreglos (mismo shape o
+    broadcastables); EpidemicModel funciona tal cual porque sus ecuaciones y
+    costos son aritmética elemento a elemento.
+
+    Con steady_tol cada celda deja de integrarse cuando llega al estado
+    estacionario (mismo criterio que Simulator) y su horizonte restante se
+    suma analíticamente; las celdas detenidas salen del lote, así que los
+    pasos siguientes solo avanzan las que siguen cambiando. steady_time
+    guarda, por celda, el tiempo en que se detuvo (NaN si no se detuvo).
+    """
+
+    # Estado por celda que se compacta al retirar celdas estacionarias
+    CELL_STATE = ("S", "I", "N", "area_attacker", "area_defender", "total_disinfections")
+
+    def __init__(self, model, initial_state, dt=1.0, total_time=168.0,
+                 steady_tol=None, steady_steps=5):
+        self.model = model
+        self.steady_tol = steady_tol
+        self.steady_steps = steady_steps
+
+        shape = np.broadcast(np.asarray(model.beta), np.asarray(model.r)).shape
+        S0, I0 = initial_state
+        self.S = np.broadcast_to(np.asarray(S0, dtype=float), shape).copy()
+        self.I = np.broadcast_to(np.asarray(I0, dtype=float), shape).copy()
+        self.N = self.S + self.I
+
+        self.dt = dt
+        self.total_time = total_time
+        self.time = 0
+
+        # Integrales acumuladas (regla del trapecio) de I/N y S/N
+        self.area_attacker = np.zeros(shape)
+        self.area_defender = np.zeros(shape)
+        self.total_disinfections = np.zeros(shape)
+
+    @classmethod
+    def from_grid(cls, betas, rs, initial_state, dt=1.0, total_time=168.0, **kwargs):
+        """
+        Construye el simulador para el producto cartesiano betas x rs.
+        Las filas corresponden a beta (atacante) y las columnas a r (defensor).
+        """
+        B, R = np.meshgrid(np.asarray(betas, dtype=float),
+                           np.asarray(rs, dtype=float), indexing="ij")
+        return cls(EpidemicModel(B, R), initial_state, dt, total_time, **kwargs)
+
+    def step(self):
+        """Avanza todas las celdas un paso en el tiempo (mismo esquema que Simulator.step)."""
+        P_att_prev = self.I / self.N
+        P_def_prev = self.S / self.N
+
+        dS = self.model.dS_dt(self.S, self.I, self.N)
+        dI = self.model.dI_dt(self.S, self.I, self.N)
+        if self.steady_tol is not None:
+            self.rate = np.fmax(np.abs(dS), np.abs(dI)) / self.N
+
+        S = self.S + dS * self.dt
+        I = self.I + dI * self.dt
+
+        # Mismo recorte que max(0, min(N, x)) en la versión escalar
+        S = np.fmax(0.0, np.fmin(self.N, S))
+        I = np.fmax(0.0, np.fmin(self.N, I))
+
+        # Normalizar para mantener S + I = N
+        total = S + I
+        with np.errstate(invalid="ignore", divide="ignore"):
+            self.S = np.where(total > 0, (S / total) * self.N, S)
+            self.I = np.where(total > 0, (I / total) * self.N, I)
+
+        self.total_disinfections += self.model.disinfections_per_dt(self.I) * self.dt
+
+        self.area_attacker += 0.5 * (P_att_prev + self.I / self.N) * self.dt
+        self.area_defender += 0.5 * (P_def_prev + self.S / self.N) * self.dt
+
+        self.time += self.dt
+
+    def run_until_steady(self):
+        """
+        Ciclo de run() con detección de estado estacionario por celda.
+
+        Las celdas se aplanan y el lote activo es una copia del simulador con
+        solo las celdas que siguen cambiando (y un modelo con sus parámetros).
+        Cuando una celda cumple el criterio se escribe de vuelta, se le suma
+        el resto del horizonte y sale del lote.
+        """
+        shape = self.S.shape
+        times = remaining_times(self.time, self.total_time, self.dt)
+        end_time = times[-1] if times else self.time
+        cells = {name: np.broadcast_to(getattr(self, name), shape).ravel().copy()
+                 for name in self.CELL_STATE}
+        params = {name: np.broadcast_to(getattr(self.model, name), shape).ravel()
+                  for name in self.model.PARAMETERS}
+        self.steady_time = np.full(cells["S"].size, np.nan)
+
+        active = copy.copy(self)
+        active.model = copy.copy(self.model)
+        index = np.arange(cells["S"].size)
+        for name in self.CELL_STATE:
+            setattr(active, name, cells[name].copy())
+        for name in params:
+            setattr(active.model, name, params[name])
+        active.rate = np.full(index.size, np.inf)
+        count = np.zeros(index.size, dtype=int)
+
+        n_steps = 0
+        while active.time < active.total_time and index.size:
+            rate = active.rate
+            active.step()
+            n_steps += 1
+            count = np.where((active.rate < self.steady_tol) & (active.rate <= rate), count + 1, 0)
+
+            done = count >= self.steady_steps
+            if done.any():
+                cell = index[done]
+                disinfections = active.model.disinfections_per_dt(active.I)[done]
+                for name in self.CELL_STATE:
+                    cells[name][cell] = getattr(active, name)[done]
+
+                # Estado fijo: integrandos constantes durante el resto del horizonte
+                S, I, N = cells["S"][cell], cells["I"][cell], cells["N"][cell]
+                span = end_time - active.time
+                cells["area_attacker"][cell] += I / N * span
+                cells["area_defender"][cell] += S / N * span
+                cells["total_disinfections"][cell] += disinfections * self.dt * (len(times) - n_steps)
+                self.steady_time[cell] = active.time
+
+                keep = ~done
+                index, count = index[keep], count[keep]
+                for name in self.CELL_STATE + ("rate",):
+                    setattr(active, name, getattr(active, name)[keep])
+                for name in params:
+                    setattr(active.model, name, getattr(active.model, name)[keep])
+
+        for name in self.CELL_STATE:
+            cells[name][index] = getattr(active, name)
+            setattr(self, name, cells[name].reshape(shape))
+        self.steady_time = self.steady_time.reshape(shape)
+        self.time = end_time
+
+    def compute_gain(self, area):
+        gain = area / self.total_time
+        # Protección contra NaN/Inf
+        return np.where(np.abs(gain) < 1e10, gain, 0.0)
+
+    def compute_payoff(self, gain, cost):
+        payoff = gain - cost
+        # Protección contra valores inválidos
+        return np.where(np.abs(payoff) < 1e10, payoff, -1e6)
+
+    def run(self):
+        """
+        Corre la simulación completa para todas las celdas.
+
+        Returns:
+            Diccionario con las matrices de ganancias, costos y payoffs.
+        """
+        if self.steady_tol is None:
+            while self.time < self.total_time:
+                self.step()
+        else:
+            self.run_until_steady()
+
+        shape = self.S.shape
+        self.gain_attacker = self.compute_gain(self.area_attacker)
+        self.gain_defender = self.compute_gain(self.area_defender)
+
+        self.cost_attacker = np.broadcast_to(self.model.cost_attacker, shape)
+        self.cost_defender = np.broadcast_to(self.model.cost_defender, shape)
+
+        self.payoff_attacker = self.compute_payoff(self.gain_attacker, self.cost_attacker)
+        self.payoff_defender = self.compute_payoff(self.gain_defender, self.cost_defender)
+
+        return {
+            "gain_attacker": self.gain_attacker,
+            "gain_defender": self.gain_defender,
+            "cost_attacker": self.cost_attacker,
+            "cost_defender": self.cost_defender,
+            "payoff_attacker": self.payoff_attacker,
+            "payoff_defender": self.payoff_defender,
+            "total_disinfections": self.total_disinfections,
+        }
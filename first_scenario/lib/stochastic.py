@@ -0,0 +1,38 @@
+from common.stochastic import ReplicatedSimulator
+
+
+class StochasticSimulator(ReplicatedSimulator):
+    """
+    Versión estocástica (nodos enteros) del modelo SIS de EpidemicModel.
+
+    Las transiciones usan las mismas funciones de tasa del modelo:
+        S -> I  con infections_per_dt(S, I, N)
+        I -> S  con disinfections_per_dt(I)
+
+    Los métodos ("ssa", "tau", "auto"), los bloques de réplicas y run()
+    vienen de common.stochastic.ReplicatedSimulator.
+    """
+
+    COMPARTMENTS = ("S", "I")
+
+    def transitions(self):
+        m, N = self.model, self.N
+        return [
+            (0, 1, lambda X: m.infections_per_dt(X[:, 0], X[:, 1], N)),
+            (1, 0, lambda X: m.disinfections_per_dt(X[:, 1])),
+        ]
+
+    def payoffs(self, X, area, counts):
+        """Ganancias, costos y payoffs por réplica (mismas definiciones que Simulator)."""
+        T = self.total_time
+        gain_attacker = area[:, 1] / (self.N * T)
+        gain_defender = area[:, 0] / (self.N * T)
+        return {
+            "gain_attacker": gain_attacker,
+            "gain_defender": gain_defender,
+            "payoff_attacker": gain_attacker - self.model.cost_attacker,
+            "payoff_defender": gain_defender - self.model.cost_defender,
+            "total_infections": counts[:, 0],
+            "total_disinfections": counts[:, 1],
+            "extinct": X[:, 1] == 0,
+        }
@@ -1,3 +1,7 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from lib.simulation import Simulator
 from lib.epidemic_model import EpidemicModel
 
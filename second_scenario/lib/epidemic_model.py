@@ -9,6 +9,7 @@ class EpidemicModel:
       dR/dt = λ*I + γ*S
 
     This class also exposes the event rates for:
+      - infection (S → I)
       - disinfection only (I → S)
       - immunisation only (S → R)
       - disinfection + immunisation (I → R)
@@ -42,6 +43,10 @@ class EpidemicModel:
         return self.lambda_ * I + self.gamma * S
 
     # ================== Event rate functions ==================
+    def infections_per_dt(self, S, I):
+        # Infection: S → I
+        return self.beta * (I / self.N) * S
+
     def disinfections_only_per_dt(self, I):
         # Disinfection-only: I → S
         return self.r * I
@@ -1,4 +1,9 @@
-import pandas as pd
+import math
+
+import numpy as np
+
+from common.integrators import dopri5
+from common.trajectory import Trajectory, remaining_times
 
 class Simulator:
     """
@@ -8,12 +13,61 @@ class Simulator:
       - Costs
       - Payoffs
       - Event counts (disinfection, immunisation, combined actions)
+
+    With method="rk45" the ODEs are integrated with an adaptive
+    Dormand–Prince 5(4) pair instead (tolerances rtol/atol); dt is then only
+    the output grid the dense solution is interpolated onto.
+
+    `record` selects how much of the trajectory is kept (see Trajectory):
+    "full", every k-th step (integer k) or "summary" (no history; run() then
+    returns "history": None and never imports pandas).
+
+    Gains and event counters are accumulated inside the step loop (gains with
+    the trapezoid rule), so run() never needs the stored history. Extra
+    integrands can be passed as `metrics` = {name: f(sim)}; their time averages
+    are returned under "metrics".
+
+    With steady_tol (method="euler" only) the loop stops once
+    max(|dS/dt|, |dI/dt|, |dR/dt|) / N stays below steady_tol without growing
+    for steady_steps consecutive steps: from there on the state no longer
+    changes, so the rest of the horizon is added analytically to the
+    integrals, the event counters and the trajectory. steady_time holds the
+    time at which the loop stopped (None if it never reached steady state).
+
+    `observers` is a sequence of callables f(sim) invoked after every step
+    (after every output sample with rk45); without observers the loop only
+    pays one check per step.
     """
 
-    def __init__(self, model, initial_state, dt=1.0, total_time=168.0):
+    __slots__ = ("model", "dt", "total_time", "method", "rtol", "atol", "record",
+                 "metrics", "observers", "steady_tol", "steady_steps", "steady_count",
+                 "steady_time", "rate", "S", "I", "R", "N", "time", "trajectory",
+                 "total_disinfections_only", "total_immunisations_from_S",
+                 "total_disinf_and_imm", "n_rhs_evals", "n_steps",
+                 "area_attacker", "area_defender", "metric_areas", "metric_values",
+                 "prev_integrands",
+                 "gain_attacker", "gain_defender", "cost_attacker", "cost_defender",
+                 "payoff_attacker", "payoff_defender")
+
+    def __init__(self, model, initial_state, dt=1.0, total_time=168.0,
+                 method="euler", rtol=1e-6, atol=1e-6, record="full", metrics=None,
+                 steady_tol=None, steady_steps=5, observers=None):
+        if method not in ("euler", "rk45"):
+            raise ValueError(f"Unknown integration method: {method}")
+        if steady_tol is not None and method != "euler":
+            raise ValueError("Steady-state detection requires the euler method")
+
         self.model = model
         self.dt = dt
         self.total_time = total_time
+        self.method = method
+        self.rtol = rtol
+        self.atol = atol
+        self.record = record
+        self.metrics = dict(metrics or {})
+        self.observers = tuple(observers or ())
+        self.steady_tol = steady_tol
+        self.steady_steps = steady_steps
 
         # Initial state (S, I, R)
         self.S, self.I, self.R = initial_state
@@ -23,18 +77,46 @@ class Simulator:
         self.initialize_statistics()
 
     def initialize_statistics(self):
-        self.t_values = [0.0]
-        self.S_values = [self.S]
-        self.I_values = [self.I]
-        self.R_values = [self.R]
-
-        self.history = [(0.0, self.S, self.I, self.R)]
+        capacity = math.ceil(self.total_time / self.dt) + 1
+        self.trajectory = Trajectory(("S", "I", "R"), capacity, self.record)
+        self.trajectory.append(0.0, self.S, self.I, self.R)
 
         # Continuous counters for event rates
         self.total_disinfections_only = 0.0
         self.total_immunisations_from_S = 0.0
         self.total_disinf_and_imm = 0.0
 
+        self.n_rhs_evals = 0
+        self.n_steps = 0
+
+        # Consecutive steps with a small, non-growing derivative
+        self.steady_count = 0
+        self.steady_time = None
+        self.rate = math.inf
+
+        # Running (trapezoid) integrals of the gain integrands and extra metrics
+        self.area_attacker = 0.0
+        self.area_defender = 0.0
+        self.metric_areas = dict.fromkeys(self.metrics, 0.0)
+        self.prev_integrands = self.integrands()
+
+    def integrands(self):
+        """Instantaneous I/N, (S+R)/N and extra metric values."""
+        values = (self.I / self.N, (self.S + self.R) / self.N)
+        if self.metrics:
+            values += tuple(f(self) for f in self.metrics.values())
+        return values
+
+    def accumulate(self, dt):
+        """Add the last interval of length dt to the running integrals."""
+        current = self.integrands()
+        prev = self.prev_integrands
+        self.area_attacker += 0.5 * (prev[0] + current[0]) * dt
+        self.area_defender += 0.5 * (prev[1] + current[1]) * dt
+        for k, name in enumerate(self.metrics, start=2):
+            self.metric_areas[name] += 0.5 * (prev[k] + current[k]) * dt
+        self.prev_integrands = current
+
     def step(self):
         S, I, R = self.S, self.I, self.R
         m = self.model
@@ -43,6 +125,9 @@ class Simulator:
         dS = m.dS_dt(S, I)
         dI = m.dI_dt(S, I)
         dR = m.dR_dt(S, I)
+        self.n_rhs_evals += 1
+        if self.steady_tol is not None:
+            self.track_steady(max(abs(dS), abs(dI), abs(dR)) / self.N)
 
         self.S += dS * self.dt
         self.I += dI * self.dt
@@ -61,28 +146,145 @@ class Simulator:
         # Update time
         self.time += self.dt
 
-        self.t_values.append(self.time)
-        self.S_values.append(self.S)
-        self.I_values.append(self.I)
-        self.R_values.append(self.R)
+        self.accumulate(self.dt)
+        self.trajectory.append(self.time, self.S, self.I, self.R)
+        if self.observers:
+            for observer in self.observers:
+                observer(self)
+
+    def track_steady(self, rate):
+        """Count consecutive steps whose derivative is below steady_tol and not growing."""
+        if rate < self.steady_tol and rate <= self.rate:
+            self.steady_count += 1
+        else:
+            self.steady_count = 0
+        self.rate = rate
+
+    def extend_steady(self):
+        """
+        Finish the horizon without integrating: with the state fixed the
+        integrands and event rates are constant, so each integral and counter
+        grows by its current value times the remaining time, and the
+        trajectory repeats the state at the times the loop would have visited.
+        """
+        times = remaining_times(self.time, self.total_time, self.dt)
+        if not times:
+            return
+        span = times[-1] - self.time
+        current = self.prev_integrands
+        self.area_attacker += current[0] * span
+        self.area_defender += current[1] * span
+        for k, name in enumerate(self.metrics, start=2):
+            self.metric_areas[name] += current[k] * span
+
+        m = self.model
+        steps = self.dt * len(times)
+        self.total_disinfections_only += m.disinfections_only_per_dt(self.I) * steps
+        self.total_immunisations_from_S += m.immunisations_from_S_per_dt(self.S) * steps
+        self.total_disinf_and_imm += m.disinfection_and_immunisation_per_dt(self.I) * steps
+
+        self.trajectory.extend(times, self.S, self.I, self.R)
+        self.steady_time = self.time
+        self.time = times[-1]
+
+    # ========== Recorded trajectory (array views, no copies) ==========
+    @property
+    def t_values(self):
+        return self.trajectory.column("t")
+
+    @property
+    def S_values(self):
+        return self.trajectory.column("S")
 
-        self.history.append((self.time, self.S, self.I, self.R))
+    @property
+    def I_values(self):
+        return self.trajectory.column("I")
+
+    @property
+    def R_values(self):
+        return self.trajectory.column("R")
+
+    @property
+    def history(self):
+        """Recorded (time, S, I, R) rows."""
+        return self.trajectory.data
+
+    def history_frame(self):
+        """Recorded history as a pandas DataFrame (pandas is only imported here)."""
+        import pandas as pd
+        return pd.DataFrame({
+            "time": self.t_values,
+            "S": self.S_values,
+            "I": self.I_values,
+            "R": self.R_values
+        })
+
+    # ========== Adaptive integration ==========
+    def output_times(self):
+        """Time grid the Euler loop would visit (0, dt, 2dt, ...)."""
+        times = [0.0]
+        t = 0.0
+        while t < self.total_time:
+            t += self.dt
+            times.append(t)
+        return times
+
+    def rhs(self, t, y):
+        """
+        Augmented right-hand side: dS, dI, dR plus quadratures of the event
+        rates and of the gain integrands I/N and (S+R)/N.
+        """
+        S, I, R = y[0], y[1], y[2]
+        m = self.model
+        return np.array([
+            m.dS_dt(S, I),
+            m.dI_dt(S, I),
+            m.dR_dt(S, I),
+            m.disinfections_only_per_dt(I),
+            m.immunisations_from_S_per_dt(S),
+            m.disinfection_and_immunisation_per_dt(I),
+            I / self.N,
+            (S + R) / self.N,
+        ])
+
+    def run_adaptive(self):
+        t_values = self.output_times()
+        y0 = [self.S, self.I, self.R, 0.0, 0.0, 0.0, 0.0, 0.0]
+        y_eval, n_evals, n_steps = dopri5(
+            self.rhs, y0, t_values[-1], t_values, rtol=self.rtol, atol=self.atol)
+
+        self.n_rhs_evals += n_evals
+        self.n_steps = n_steps
+
+        states = np.maximum(y_eval[:, :3], 0)
+        for t, (S, I, R) in zip(t_values[1:], states[1:]):
+            t_prev = self.time
+            self.S, self.I, self.R = float(S), float(I), float(R)
+            self.time = t
+            self.accumulate(t - t_prev)
+            self.trajectory.append(t, self.S, self.I, self.R)
+            if self.observers:
+                for observer in self.observers:
+                    observer(self)
+
+        # Counters and gains come from the exact quadratures, not the grid
+
+        (self.total_disinfections_only,
+         self.total_immunisations_from_S,
+         self.total_disinf_and_imm,
+         self.area_attacker,
+         self.area_defender) = (float(v) for v in y_eval[-1, 3:])
 
     # ========== Gain and cost calculations ==========
-    def compute_time_average(self, P_list):
-        total_area = 0
-        for i in range(1, len(self.t_values)):
-            dt = self.t_values[i] - self.t_values[i-1]
-            total_area += 0.5 * (P_list[i] + P_list[i-1]) * dt
-        return total_area / self.total_time
+    def compute_time_average(self, area):
+        # `area` is the running integral accumulated in accumulate()
+        return area / self.total_time
 
     def compute_gain_attacker(self):
-        P = [I / self.N for I in self.I_values]
-        return self.compute_time_average(P)
+        return self.compute_time_average(self.area_attacker)
 
     def compute_gain_defender(self):
-        P = [(S + R) / self.N for S, R in zip(self.S_values, self.R_values)]
-        return self.compute_time_average(P)
+        return self.compute_time_average(self.area_defender)
 
     def compute_defender_cost(self):
         m = self.model
@@ -97,12 +299,21 @@ class Simulator:
 
     # ========== Main simulation loop ==========
     def run(self):
-        while self.time < self.total_time:
-            self.step()
+        if self.method == "rk45":
+            self.run_adaptive()
+        else:
+            while self.time < self.total_time:
+                self.step()
+                if self.steady_count >= self.steady_steps:
+                    self.extend_steady()
+            self.n_steps = self.trajectory.n_samples - 1
+        self.trajectory.finalize()
 
         # Gains
         self.gain_attacker = self.compute_gain_attacker()
         self.gain_defender = self.compute_gain_defender()
+        self.metric_values = {name: self.compute_time_average(area)
+                              for name, area in self.metric_areas.items()}
 
         # Costs
         self.cost_attacker = self.compute_attacker_cost()
@@ -112,16 +323,8 @@ class Simulator:
         self.payoff_attacker = self.gain_attacker - self.cost_attacker
         self.payoff_defender = self.gain_defender - self.cost_defender
 
-        # History DataFrame
-        df = pd.DataFrame({
-            "time": self.t_values,
-            "S": self.S_values,
-            "I": self.I_values,
-            "R": self.R_values
-        })
-
         return {
-            "history": df,
+            "history": self.history_frame() if self.trajectory.every else None,
             "gain_attacker": self.gain_attacker,
             "gain_defender": self.gain_defender,
             "cost_attacker": self.cost_attacker,
@@ -131,4 +334,7 @@ class Simulator:
             "total_disinfections_only": self.total_disinfections_only,
             "total_immunisations_from_S": self.total_immunisations_from_S,
             "total_disinf_and_imm": self.total_disinf_and_imm,
+            "n_rhs_evals": self.n_rhs_evals,
+            "steady_time": self.steady_time,
+            "metrics": self.metric_values,
         }
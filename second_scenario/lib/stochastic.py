@@ -0,0 +1,50 @@
+from common.stochastic import ReplicatedSimulator
+
+
+class StochasticSimulator(ReplicatedSimulator):
+    """
+    Versión estocástica (nodos enteros) del modelo Patch-and-Removal de
+    EpidemicModel.
+
+    Las transiciones usan las mismas funciones de tasa del modelo:
+        S -> I  con infections_per_dt(S, I)
+        I -> S  con disinfections_only_per_dt(I)
+        S -> R  con immunisations_from_S_per_dt(S)
+        I -> R  con disinfection_and_immunisation_per_dt(I)
+
+    Los métodos ("ssa", "tau", "auto"), los bloques de réplicas y run()
+    vienen de common.stochastic.ReplicatedSimulator.
+    """
+
+    COMPARTMENTS = ("S", "I", "R")
+
+    def transitions(self):
+        m = self.model
+        return [
+            (0, 1, lambda X: m.infections_per_dt(X[:, 0], X[:, 1])),
+            (1, 0, lambda X: m.disinfections_only_per_dt(X[:, 1])),
+            (0, 2, lambda X: m.immunisations_from_S_per_dt(X[:, 0])),
+            (1, 2, lambda X: m.disinfection_and_immunisation_per_dt(X[:, 1])),
+        ]
+
+    def payoffs(self, X, area, counts):
+        """Ganancias, costos y payoffs por réplica (mismas definiciones que Simulator)."""
+        m = self.model
+        T = self.total_time
+        gain_attacker = area[:, 1] / (self.N * T)
+        gain_defender = (area[:, 0] + area[:, 2]) / (self.N * T)
+        cost_defender = (counts[:, 1] * m.cost_disinfection +
+                         counts[:, 2] * m.cost_immunisation +
+                         counts[:, 3] * m.cost_combined)
+        return {
+            "gain_attacker": gain_attacker,
+            "gain_defender": gain_defender,
+            "cost_defender": cost_defender,
+            "payoff_attacker": gain_attacker - m.cost_attacker,
+            "payoff_defender": gain_defender - cost_defender,
+            "total_infections": counts[:, 0],
+            "total_disinfections_only": counts[:, 1],
+            "total_immunisations_from_S": counts[:, 2],
+            "total_disinf_and_imm": counts[:, 3],
+            "extinct": X[:, 1] == 0,
+        }
@@ -1,4 +1,8 @@
+import os
+import sys
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.result_store import ResultStore
 from lib.epidemic_model import EpidemicModel
 from lib.simulation import Simulator
 
@@ -16,6 +20,11 @@ r = 2
 gamma = 1
 lam = 15      
 
+# The history is stored as .npy plus an axes index (history_patch_removal/);
+# the CSV file is an optional view of it
+STORE = ResultStore("history_patch_removal")
+EXPORT_CSV = True
+
 model = EpidemicModel(beta, r, gamma, lam, N)
 
 sim = Simulator(model, initial_state=(S0, I0, R0), dt=dt, total_time=TOTAL_TIME)
@@ -33,6 +42,9 @@ print("Disinfections:", result["total_disinfections_only"])
 print("Immunisations from S:", result["total_immunisations_from_S"])
 print("Disinfection + Immunisation:", result["total_disinf_and_imm"])
 
-history = result["history"]
-history.to_csv("history_patch_removal.csv", index=False)
-print("\nFile 'history_patch_removal.csv' generated.")
\ No newline at end of file
+STORE.save("history", sim.history, {"sample": None, "variable": ["time", "S", "I", "R"]},
+           beta=beta, r=r, gamma=gamma, lam=lam)
+print("\nHistory saved in 'history_patch_removal/'.")
+if EXPORT_CSV:
+    STORE.export_csv("history", "history_patch_removal.csv")
+    print("File 'history_patch_removal.csv' generated.")
\ No newline at end of file
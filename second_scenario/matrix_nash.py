@@ -1,6 +1,15 @@
 # game_matrix_patch_removal.py
 
+import os
+import sys
+
 import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.cache import SimulationCache
+from common.instrumentation import Profiler
+from common.nash import eliminate_dominated
+from common.parallel import build_payoff_matrices
 from lib.epidemic_model import EpidemicModel
 from lib.simulation import Simulator
 
@@ -17,28 +26,14 @@ S0 = N - I0
 R0 = 0
 r = 2
 gamma = 1
+WORKERS = None    # None = all cores, 1 = serial
+CACHE = SimulationCache()
+PROFILER = Profiler()    # per-phase and per-cell timings, printed at the end
 
-# Matrices for payoffs
-attacker_matrix = np.zeros((len(beta_values), len(lambda_values)))
-defender_matrix = np.zeros((len(beta_values), len(lambda_values)))
-
-
-for i, beta in enumerate(beta_values):
-    for j, lam in enumerate(lambda_values):
 
-        model = EpidemicModel(beta, r, gamma, lam, N)
-        sim = Simulator(model, initial_state=(S0, I0, R0),
-                               dt=dt, total_time=TOTAL_TIME)
-        result = sim.run()
+def make_model(beta, lam):
+    return EpidemicModel(beta, r, gamma, lam, N)
 
-        attacker_matrix[i][j] = result["payoff_attacker"]
-        defender_matrix[i][j] = result["payoff_defender"]
-
-print("\n===== Attacker Payoff Matrix =====")
-print(attacker_matrix)
-
-print("\n===== Defender Payoff Matrix =====")
-print(defender_matrix)
 
 def find_nash_equilibrium(A, D):
     """
@@ -64,13 +59,38 @@ def find_nash_equilibrium(A, D):
     return nash_points
 
 
-nash = find_nash_equilibrium(attacker_matrix, defender_matrix)
-
-print("\n===== Nash Equilibrium Points (indexes) =====")
-print(nash)
-
-if nash:
-    for (i, j) in nash:
-        print(f"\nNASH at β={beta_values[i]}, λ={lambda_values[j]}")
-else:
-    print("\nNo pure strategy Nash equilibrium found.")
+# Guarded: with the spawn start method the pool workers re-import this script
+if __name__ == "__main__":
+    # Matrices for payoffs (one cell per (beta, lambda) pair, spread over a process pool)
+    with PROFILER.phase("matrices", cells=len(beta_values) * len(lambda_values)):
+        attacker_matrix, defender_matrix = build_payoff_matrices(
+            make_model, Simulator, beta_values, lambda_values,
+            initial_state=(S0, I0, R0), dt=dt, total_time=TOTAL_TIME, workers=WORKERS,
+            cache=CACHE, profiler=PROFILER)
+
+    print("\n===== Attacker Payoff Matrix =====")
+    print(attacker_matrix)
+
+    print("\n===== Defender Payoff Matrix =====")
+    print(defender_matrix)
+
+    # Strictly dominated strategies never appear in an equilibrium: search the reduced game
+    with PROFILER.phase("nash"):
+        rows, cols = eliminate_dominated(attacker_matrix, defender_matrix)
+        nash = [(int(rows[i]), int(cols[j])) for i, j in
+                find_nash_equilibrium(attacker_matrix[np.ix_(rows, cols)],
+                                      defender_matrix[np.ix_(rows, cols)])]
+    print(f"\nUndominated strategies: β={[beta_values[i] for i in rows]}, "
+          f"λ={[lambda_values[j] for j in cols]}")
+
+    print("\n===== Nash Equilibrium Points (indexes) =====")
+    print(nash)
+
+    if nash:
+        for (i, j) in nash:
+            print(f"\nNASH at β={beta_values[i]}, λ={lambda_values[j]}")
+    else:
+        print("\nNo pure strategy Nash equilibrium found.")
+
+    print("\n" + CACHE.report())
+    print(PROFILER.report())
@@ -0,0 +1,41 @@
+import itertools
+
+import numpy as np
+
+from first_scenario.lib.epidemic_model import EpidemicModel
+from first_scenario.lib.simulation import BatchSimulator, Simulator
+from third_scenario.lib.unified_model import UnifiedEpidemicModel
+from third_scenario.lib.unified_simulation import UnifiedSimulator, sweep, to_matrix
+
+OUTPUTS = ("gain_attacker", "gain_defender", "payoff_attacker", "payoff_defender")
+
+
+def test_sis_batch_matches_scalar_cells():
+    betas, rs = [0.0, 0.5, 1.62, 4.0], [0.5, 2.0, 5.0]
+    grid = BatchSimulator.from_grid(betas, rs, [9985, 15], dt=1.0, total_time=168.0).run()
+    assert grid["payoff_attacker"].shape == (4, 3)
+
+    for i, beta in enumerate(betas):
+        for j, r in enumerate(rs):
+            sim = Simulator(EpidemicModel(beta, r), [9985, 15], dt=1.0, total_time=168.0)
+            sim.run()
+            for name in OUTPUTS:
+                assert np.isclose(grid[name][i, j], getattr(sim, name), rtol=1e-12)
+            assert np.isclose(grid["total_disinfections"][i, j], sim.total_disinfections)
+
+
+def test_unified_sweep_matches_scalar_cells():
+    betas, gammas, rs, lambdas = [0.5, 1.62], [0.0, 5.0], [1.0, 5.0], [0.0, 10.0]
+    result = sweep(betas, gammas, rs, lambdas, [9985, 15, 0], dt=1.0, total_time=50.0)
+    matrix = to_matrix(result["payoff_defender"])
+    assert matrix.shape == (2, 8)
+
+    # Columnas en el orden de los ciclos anidados gamma -> r -> lambda
+    for i, beta in enumerate(betas):
+        for j, (gamma, r, lambda_) in enumerate(itertools.product(gammas, rs, lambdas)):
+            sim = UnifiedSimulator(UnifiedEpidemicModel(beta, gamma, r, lambda_),
+                                   [9985, 15, 0], dt=1.0, total_time=50.0)
+            sim.run()
+            assert np.isclose(matrix[i, j], sim.payoff_defender, rtol=1e-12)
+            assert np.isclose(to_matrix(result["payoff_attacker"])[i, j],
+                              sim.payoff_attacker, rtol=1e-12)
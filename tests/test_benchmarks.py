@@ -0,0 +1,40 @@
+import numpy as np
+
+from benchmarks import harness
+from benchmarks.suite import payoff_games
+from common.nash import solve_nash
+
+
+def test_measure_bounds_repetitions():
+    calls = []
+    timing = harness.measure(lambda: calls.append(1), budget=0.0, min_repeat=3, max_repeat=5)
+    # Calentamiento más las repeticiones medidas
+    assert timing["repeat"] == 3 and len(calls) == 4
+    assert 0.0 <= timing["seconds"] <= timing["median"]
+
+
+def test_compare_flags_regressions_against_saved_baseline(tmp_path):
+    path = tmp_path / "baseline.json"
+    harness.save(str(path), [{"name": "a", "seconds": 1.0}, {"name": "b", "seconds": 1.0}],
+                 quick=True)
+    baseline = harness.load(str(path))
+    assert baseline["meta"]["quick"] is True
+
+    rows = harness.compare([{"name": "a", "seconds": 1.2}, {"name": "b", "seconds": 1.3},
+                            {"name": "nuevo", "seconds": 9.0}], baseline)
+    assert [(row["name"], row["regression"]) for row in rows] == [("a", False), ("b", True)]
+
+
+def test_suite_games_match_the_scripts():
+    # Las constantes del suite deben seguir reproduciendo los juegos de los scripts
+    games = payoff_games()
+    (p, q), = solve_nash(*games["analyze_nash"], method="vertex")
+    assert np.allclose(p, [0.732, 0, 0, 0, 0.268], atol=1e-3)
+    assert np.allclose(q, [0, 0, 0.536, 0.464, 0], atol=1e-3)
+
+    (p, q), = solve_nash(*games["matrix_nash"], method="vertex")
+    assert p.argmax() == 0 and q.argmax() == 0
+
+    (p, q), = solve_nash(*games["analyze_case"], method="vertex")
+    assert games["analyze_case"][0].shape == (4, 27)
+    assert p.argmax() == 3 and q.argmax() == 18
@@ -0,0 +1,48 @@
+import os
+
+import numpy as np
+
+from common.cache import OUTPUTS, SimulationCache
+from first_scenario.lib.epidemic_model import EpidemicModel
+from first_scenario.lib.simulation import Simulator
+
+
+def _disk_size(directory):
+    return sum(entry.stat().st_size for entry in os.scandir(directory)
+               if entry.name.endswith(".npz"))
+
+
+def test_hit_returns_the_simulated_outputs(tmp_path):
+    cache = SimulationCache(str(tmp_path), trajectories=True)
+    first = cache.run(Simulator, EpidemicModel(1.62, 2.0), [9985, 15], total_time=20.0)
+    again = cache.run(Simulator, EpidemicModel(1.62, 2.0), [9985, 15], total_time=20.0)
+    cache.run(Simulator, EpidemicModel(1.62, 2.5), [9985, 15], total_time=20.0)
+
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+    for name in OUTPUTS:
+        assert again[name] == first[name]
+    for name, column in first["trajectory"].items():
+        assert np.array_equal(again["trajectory"][name], column)
+
+
+def test_eviction_keeps_recently_used_entries_and_running_size(tmp_path):
+    cache = SimulationCache(str(tmp_path))
+    keys = []
+    for k, beta in enumerate([0.5, 1.0, 1.5, 2.0, 2.5]):
+        model = EpidemicModel(beta, 1.0)
+        keys.append(cache.key(Simulator, model, [9985, 15], 1.0, 20.0))
+        cache.run(Simulator, model, [9985, 15], total_time=20.0)
+        # mtimes explícitos: el LRU no depende de la resolución del reloj
+        os.utime(cache.path(keys[-1]), (k, k))
+    entry_size = os.path.getsize(cache.path(keys[0]))
+    assert cache.size == _disk_size(tmp_path) == 5 * entry_size
+
+    # Un acierto renueva la entrada más antigua
+    assert cache.load(keys[0]) is not None
+    cache.max_bytes = 3 * entry_size
+    cache.run(Simulator, EpidemicModel(3.0, 1.0), [9985, 15], total_time=20.0)
+
+    assert cache.evictions == 3
+    assert cache.size == _disk_size(tmp_path) <= cache.max_bytes
+    remaining = [os.path.exists(cache.path(key)) for key in keys]
+    assert remaining == [True, False, False, False, True]
@@ -0,0 +1,35 @@
+import numpy as np
+
+from common import nash
+from third_scenario.lib import double_oracle as do
+
+
+class MatrixOracle:
+    """Oráculo sobre matrices fijas: las estrategias son índices de fila/columna."""
+
+    def __init__(self, A, D):
+        self.A = np.asarray(A, dtype=float)
+        self.D = np.asarray(D, dtype=float)
+        self.n_simulations = 0
+
+    def payoffs(self, attackers, defenders):
+        idx = np.ix_([int(a) for a in attackers], [int(d) for d in defenders])
+        return self.A[idx], self.D[idx]
+
+
+def test_double_oracle_falls_back_to_lemke_howson(monkeypatch):
+    # Piedra, papel o tijera: único equilibrio uniforme
+    A = np.array([[0, -1, 1], [1, 0, -1], [-1, 1, 0]])
+
+    def solve_nash(A, B, method="support", **kwargs):
+        # Simula un método que no encuentra equilibrios en el juego restringido
+        return [] if method == "support" else nash.solve_nash(A, B, method, **kwargs)
+
+    monkeypatch.setattr(do, "solve_nash", solve_nash)
+    result = do.double_oracle(MatrixOracle(A, -A), [0, 1, 2], [0, 1, 2], method="support")
+
+    p = np.zeros(3)
+    p[[int(a) for a in result["attackers"]]] = result["p"]
+    q = np.zeros(3)
+    q[[int(d) for d in result["defenders"]]] = result["q"]
+    assert np.allclose(p, 1 / 3) and np.allclose(q, 1 / 3)
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from first_scenario.lib.epidemic_model import EpidemicModel
+from first_scenario.lib.exact_solution import ExactSimulator
+from first_scenario.lib.simulation import Simulator
+
+
+# Crecimiento, caso límite beta == r y extinción
+@pytest.mark.parametrize("beta, r", [(1.62, 2.0), (2.0, 0.5), (1.0, 1.0), (0.5, 3.0)])
+def test_exact_solution_matches_rk45(beta, r):
+    model = EpidemicModel(beta, r)
+    initial_state = [9985, 15]
+
+    sim = Simulator(model, initial_state, dt=1.0, total_time=168.0,
+                    method="rk45", rtol=1e-10, atol=1e-10)
+    sim.run()
+    errors = ExactSimulator(model, initial_state, total_time=168.0).cross_check(sim)
+
+    assert errors["max_error_I_fraction"] < 1e-7
+    assert errors["error_gain_attacker"] < 1e-8
+    assert errors["error_gain_defender"] < 1e-8
+    assert errors["error_payoff_attacker"] < 1e-8
+    assert errors["error_payoff_defender"] < 1e-8
+
+
+def test_exact_solution_on_grid_matches_scalar_runs():
+    betas, rs = [0.5, 1.0, 2.5], [0.5, 1.0, 3.0]
+    grid = ExactSimulator.from_grid(betas, rs, [9985, 15]).run()
+    for i, beta in enumerate(betas):
+        for j, r in enumerate(rs):
+            cell = ExactSimulator(EpidemicModel(beta, r), [9985, 15]).run()
+            assert np.isclose(grid["payoff_attacker"][i, j], cell["payoff_attacker"])
+            assert np.isclose(grid["payoff_defender"][i, j], cell["payoff_defender"])
+
+
+def test_integral_matches_quadrature_of_closed_form():
+    sim = ExactSimulator.from_grid([0.0, 0.8, 1.0, 3.0], [1.0], [9985, 15], total_time=30.0)
+    t = np.linspace(0.0, 30.0, 30001)
+    I = sim.infected(t[:, None, None])
+    quadrature = np.sum(0.5 * (I[1:] + I[:-1]) * np.diff(t)[:, None, None], axis=0)
+    assert np.allclose(sim.integral_infected(30.0), quadrature, rtol=1e-7)
+
+
+def test_extreme_rates_stay_finite():
+    # a*T = 5e4: exp(a T) desbordaría, la forma con exp(-|a| T) no
+    result = ExactSimulator.from_grid([300.0, 1e-9], [1e-9, 300.0], [9985, 15]).run()
+    for name in ("gain_attacker", "gain_defender", "payoff_attacker", "payoff_defender"):
+        assert np.all(np.isfinite(result[name]))
+    assert np.isclose(result["gain_attacker"][0, 0], 1.0, atol=1e-3)
+    assert result["gain_attacker"][1, 1] < 1e-5
@@ -0,0 +1,36 @@
+import os
+
+from common.cache import SimulationCache
+from common.experiment import run_experiment
+
+CONFIG = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                      "experiments", "caso4.toml")
+
+
+def _run(path, cache):
+    return run_experiment(str(path), workers=1, cache=cache)
+
+
+def test_changing_one_defender_value_resimulates_only_new_cells(tmp_path):
+    with open(CONFIG, encoding="utf-8") as f:
+        text = f.read()
+    assert "r = [2, 5, 10]" in text
+    path = tmp_path / "caso4.toml"
+    path.write_text(text, encoding="utf-8")
+    cache = SimulationCache(str(tmp_path / "cache"))
+
+    experiment, status = _run(path, cache)
+    assert set(status.values()) == {"ejecutada"}
+    assert experiment.result("matrices")["simulated"] == 108
+
+    # Sin cambios no se repite ninguna etapa
+    _, status = _run(path, cache)
+    assert set(status.values()) == {"sin cambios"}
+
+    # Cambiar un valor de r: solo las 4 x 3 x 3 = 36 celdas de la columna nueva
+    path.write_text(text.replace("r = [2, 5, 10]", "r = [2, 5, 12]"), encoding="utf-8")
+    experiment, status = _run(path, cache)
+    assert experiment.result("matrices")["simulated"] == 36
+    assert experiment.result("matrices")["payoff_attacker"].shape == (4, 27)
+    assert status["matrices"] == "ejecutada"
+    assert status["casos"] == "sin cambios"
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from third_scenario.lib.fictitious_play import FictitiousPlay
+
+CONFIG = {"initial_state": [990, 10, 0], "total_time": 20.0, "grid_points": 5,
+          "defender_grid": 2}
+
+
+def test_resumed_run_matches_uninterrupted_run(tmp_path):
+    path = tmp_path / "fp.json"
+    straight = FictitiousPlay(**CONFIG)
+    straight.run(4)
+
+    first = FictitiousPlay(**CONFIG)
+    first.run(2)
+    first.save(path)
+    resumed = FictitiousPlay.load(path, **CONFIG)
+    resumed.run(2)
+
+    assert resumed.iteration == 4
+    assert resumed.attackers == straight.attackers
+    assert resumed.defenders == straight.defenders
+    for got, expected in zip(resumed.history, straight.history):
+        assert got["exploitability"] == pytest.approx(expected["exploitability"])
+
+
+def test_result_reports_the_measured_strategies():
+    fp = FictitiousPlay(**CONFIG)
+    result = fp.run(3)
+    last = fp.history[-1]
+
+    # La brecha se midió antes de la última actualización
+    assert np.array_equal(result["p"], last["p"]) and np.array_equal(result["q"], last["q"])
+    assert len(result["attackers"]) == len(result["p"])
+    assert np.isclose(result["p"].sum(), 1.0) and np.isclose(result["q"].sum(), 1.0)
+    assert result["exploitability"] == last["exploitability"] >= 0.0
+
+
+def test_checkpoint_with_other_configuration_is_rejected(tmp_path):
+    path = tmp_path / "fp.json"
+    fp = FictitiousPlay(**CONFIG)
+    fp.run(1)
+    fp.save(path)
+
+    with pytest.raises(ValueError, match="total_time"):
+        FictitiousPlay.load(path, **dict(CONFIG, total_time=30.0))
+    with pytest.raises(ValueError, match="k0"):
+        FictitiousPlay.load(path, **dict(CONFIG, k0=0.02))
@@ -0,0 +1,40 @@
+import os
+
+import matplotlib
+import matplotlib.pyplot as plt
+import numpy as np
+
+from common.figures import FigureRenderer
+
+
+def draw_line(values, title):
+    plt.plot(values)
+    plt.title(title)
+
+
+def _flush(directory, values, title, workers=1):
+    renderer = FigureRenderer(workers=workers)
+    renderer.submit(os.path.join(directory, "linea.png"), draw_line, values, title)
+    return list(renderer.flush().values())
+
+
+def test_unchanged_figures_are_skipped(tmp_path):
+    values = np.arange(5.0)
+    assert _flush(tmp_path, values, "a") == ["generada"]
+    assert _flush(tmp_path, values, "a") == ["sin cambios"]
+    # Cambia un argumento (también el título): se vuelve a dibujar
+    assert _flush(tmp_path, values, "b") == ["generada"]
+    assert _flush(tmp_path, values + 1, "b") == ["generada"]
+    # El archivo se borró o se modificó a mano
+    os.remove(tmp_path / "linea.png")
+    assert _flush(tmp_path, values + 1, "b") == ["generada"]
+
+
+def test_serial_rendering_uses_agg(tmp_path):
+    plt.switch_backend("svg")
+    try:
+        _flush(tmp_path, np.arange(3.0), "serie", workers=1)
+        assert matplotlib.get_backend().lower() == "agg"
+    finally:
+        plt.switch_backend("Agg")
+    assert (tmp_path / "linea.png").exists()
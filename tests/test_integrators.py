@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from common.integrators import dopri5
+from second_scenario.lib.epidemic_model import EpidemicModel
+from second_scenario.lib.simulation import Simulator
+
+
+def test_dopri5_matches_exponential_decay():
+    t_eval = np.linspace(0.0, 10.0, 101)
+    y, n_evals, n_steps = dopri5(lambda t, y: -np.array([1.0, 0.2]) * y, [1.0, 2.0],
+                                 10.0, t_eval, rtol=1e-8, atol=1e-8)
+
+    assert np.allclose(y[:, 0], np.exp(-t_eval), atol=1e-6)
+    assert np.allclose(y[:, 1], 2.0 * np.exp(-0.2 * t_eval), atol=1e-6)
+    # La salida densa permite pasos internos mayores que la malla de salida
+    assert n_steps < len(t_eval) - 1
+
+
+def test_rk45_matches_fine_euler_on_patch_model():
+    model = EpidemicModel(1.62, 2.0, 1.0, 1.0, 10000)
+    state = [9985, 15, 0]
+    adaptive = Simulator(model, state, dt=1.0, total_time=20.0, method="rk45",
+                         rtol=1e-9, atol=1e-9).run()
+    fine = Simulator(model, state, dt=1e-3, total_time=20.0, record="summary").run()
+
+    assert len(adaptive["history"]) == 21
+    for name in ("gain_attacker", "gain_defender", "payoff_attacker", "payoff_defender"):
+        assert adaptive[name] == pytest.approx(fine[name], rel=1e-3)
+
+
+def test_steady_state_needs_euler():
+    with pytest.raises(ValueError):
+        Simulator(EpidemicModel(1.0, 1.0, 1.0, 1.0, 100), [90, 10, 0],
+                  method="rk45", steady_tol=1e-6)
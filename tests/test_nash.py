@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from common.nash import solve_nash
+
+
+def _as_set(equilibria):
+    return {tuple(np.round(np.concatenate([p, q]), 8) + 0.0) for p, q in equilibria}
+
+
+def test_vertex_degenerate_dependent_labels():
+    # Las ecuaciones de las etiquetas del defensor son dependientes: los
+    # equilibrios extremos con p = (0.5, 0.5) solo aparecen completando el
+    # rango con etiquetas opcionales.
+    A = [[2, 0, 0, 0], [0, 1, 0, 0]]
+    B = [[1, 1, 2, 1], [0, 1, 1, 2]]
+    expected = {
+        (0.0, 1.0, 0.0, 0.0, 0.0, 1.0),
+        (1.0, 0.0, 0.0, 0.0, 1.0, 0.0),
+        (0.5, 0.5, 0.0, 0.0, 1.0, 0.0),
+        (0.5, 0.5, 0.0, 0.0, 0.0, 1.0),
+    }
+    assert _as_set(solve_nash(A, B, method="vertex")) == expected
+
+
+def _random_game(rng, m, n):
+    # Payoffs continuos: el juego es no degenerado con probabilidad 1
+    return rng.normal(size=(m, n)), rng.normal(size=(m, n))
+
+
+def test_support_loop_and_vertex_agree_on_nondegenerate_games():
+    rng = np.random.default_rng(0)
+    for _ in range(40):
+        m, n = rng.integers(2, 6, size=2)
+        A, B = _random_game(rng, m, n)
+        support = _as_set(solve_nash(A, B, method="support"))
+        assert support
+        assert _as_set(solve_nash(A, B, method="support_loop")) == support
+        assert _as_set(solve_nash(A, B, method="vertex")) == support
+
+
+def test_lemke_howson_returns_mutual_best_responses():
+    rng = np.random.default_rng(1)
+    for _ in range(40):
+        m, n = rng.integers(2, 7, size=2)
+        A, B = _random_game(rng, m, n)
+        for p, q in solve_nash(A, B, method="lemke_howson", initial_label="all"):
+            assert np.isclose(p.sum(), 1.0) and np.isclose(q.sum(), 1.0)
+            assert np.all(p >= -1e-12) and np.all(q >= -1e-12)
+            # Ninguna estrategia pura mejora el payoff esperado
+            assert p @ A @ q >= (A @ q).max() - 1e-9
+            assert p @ B @ q >= (p @ B).max() - 1e-9
+
+
+def test_lemke_howson_label_refers_to_original_game_after_elimination():
+    # La fila 0 está estrictamente dominada por la fila 2
+    A = np.array([[0.0, 0.0, 0.0], [3.0, 1.0, 0.0], [1.0, 2.0, 1.0], [0.5, 0.5, 4.0]])
+    B = np.array([[1.0, 0.0, 2.0], [0.0, 2.0, 1.0], [2.0, 0.0, 1.0], [1.0, 3.0, 0.0]])
+    rows, cols = np.arange(1, 4), np.arange(3)
+    reduced_A, reduced_B = A[np.ix_(rows, cols)], B[np.ix_(rows, cols)]
+
+    for label, reduced_label in [(2, 1), (3, 2), (5, 4)]:
+        (p, q), = solve_nash(A, B, method="lemke_howson", initial_label=label,
+                             eliminate="pure")
+        (p_red, q_red), = solve_nash(reduced_A, reduced_B, method="lemke_howson",
+                                     initial_label=reduced_label)
+        assert p[0] == 0.0
+        assert np.allclose(p[rows], p_red) and np.allclose(q, q_red)
+
+
+def test_lemke_howson_rejects_label_of_eliminated_strategy():
+    A = [[0.0, 0.0], [1.0, 1.0]]
+    B = [[1.0, 0.0], [0.0, 1.0]]
+    with pytest.raises(ValueError, match="eliminada"):
+        solve_nash(A, B, method="lemke_howson", initial_label=0, eliminate="pure")
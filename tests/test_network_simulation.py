@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from first_scenario.lib.epidemic_model import EpidemicModel
+from first_scenario.lib.network_simulation import INFECTED, REMOVED, NetworkSimulator
+from first_scenario.lib.simulation import Simulator
+from second_scenario.lib.epidemic_model import EpidemicModel as PatchModel
+
+
+def _complete_graph(n):
+    return np.ones((n, n)) - np.eye(n)
+
+
+def test_complete_graph_matches_mean_field():
+    # En un grafo completo la red se comporta como el modelo bien mezclado
+    n = 500
+    model = EpidemicModel(2.0, 0.5)
+    state = [n - 50, 50]
+    reference = Simulator(model, state, dt=0.1, total_time=20.0)
+    reference.run()
+
+    runs = [NetworkSimulator(model, state, dt=0.1, total_time=20.0,
+                             adjacency=_complete_graph(n), seed=seed).run()
+            for seed in range(8)]
+    for name in ("gain_attacker", "gain_defender", "payoff_attacker", "payoff_defender"):
+        mean = np.mean([run[name] for run in runs])
+        assert mean == pytest.approx(getattr(reference, name), abs=0.03)
+
+
+def test_explicit_infected_keeps_removed_nodes():
+    n = 50
+    model = PatchModel(1.0, 1.0, 0.5, 0.5, n)
+    sim = NetworkSimulator(model, [40, 5, 5], adjacency=_complete_graph(n),
+                           initial_infected=[0, 1, 2, 3, 4])
+
+    assert np.flatnonzero(sim.state == INFECTED).tolist() == [0, 1, 2, 3, 4]
+    # Los R0 nodos removidos se sortean entre los restantes, no se descartan
+    removed = np.flatnonzero(sim.state == REMOVED)
+    assert len(removed) == 5 and removed.min() >= 5
+    assert (sim.n_S, sim.n_I, sim.n_R) == (40, 5, 5)
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"initial_infected": [0, 1]},
+    {"initial_infected": [0, 0, 1]},
+    {"initial_infected": [0, 1, 50]},
+    {"initial_removed": [7]},
+    {"initial_infected": [0, 1, 2], "initial_removed": [2, 3]},
+])
+def test_inconsistent_initial_nodes_are_rejected(kwargs):
+    n = 50
+    model = PatchModel(1.0, 1.0, 0.5, 0.5, n)
+    with pytest.raises(ValueError):
+        NetworkSimulator(model, [45, 3, 2], adjacency=_complete_graph(n), **kwargs)
+
+
+def test_invalid_payoffs_use_mean_field_guard():
+    model = EpidemicModel(1.0, 1.0)
+    model.cost_attacker = np.nan
+    model.cost_defender = np.inf
+    result = NetworkSimulator(model, [45, 5], dt=1.0, total_time=5.0,
+                              adjacency=_complete_graph(50)).run()
+
+    assert result["payoff_attacker"] == -1e6
+    assert result["payoff_defender"] == -1e6
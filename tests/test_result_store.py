@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from common.result_store import ResultStore, load_payoffs, save_payoffs
+
+AXES = {"beta": [0.5, 1.0, 1.5], "gamma": [2.0, 4.0], "r": [2.0, 5.0, 10.0]}
+
+
+def _store(tmp_path):
+    store = ResultStore(str(tmp_path))
+    tensor = np.arange(18, dtype=float).reshape(3, 2, 3)
+    store.save("payoff", tensor, AXES, scenario="third")
+    return store, tensor
+
+
+def test_select_by_axis_values(tmp_path):
+    store, tensor = _store(tmp_path)
+
+    # Un escalar elimina el eje; una lista lo conserva en el orden pedido
+    array, axes = store.select("payoff", beta=1.0, r=[10, 2])
+    assert np.array_equal(array, tensor[1][:, [2, 0]])
+    assert axes == {"gamma": [2.0, 4.0], "r": [10.0, 2.0]}
+    assert isinstance(store.load("payoff"), np.memmap)
+
+    # El índice se relee desde el disco
+    reopened = ResultStore(str(tmp_path))
+    assert reopened.meta("payoff") == {"scenario": "third"}
+    assert np.array_equal(reopened.select("payoff", gamma=4.0)[0], tensor[:, 1])
+
+    with pytest.raises(ValueError):
+        store.select("payoff", beta=3.0)
+    with pytest.raises(ValueError):
+        store.select("payoff", lambda_=1.0)
+
+
+def test_export_csv_writes_labelled_rows(tmp_path):
+    store, tensor = _store(tmp_path)
+    path = store.export_csv("payoff", str(tmp_path / "payoff.csv"), gamma=2.0)
+    with open(path, "rb") as f:
+        lines = f.read().decode("utf-8").split("\n")
+
+    assert lines[0] == ",r=2,r=5,r=10"
+    assert lines[1] == "β=0.5,0.0,1.0,2.0"
+    assert lines[3] == "β=1.5,12.0,13.0,14.0"
+    assert lines[4] == ""
+
+
+def test_payoff_matrices_round_trip(tmp_path):
+    store = ResultStore(str(tmp_path))
+    grid = {"beta": [0.5, 1.0], "r": [0.5, 1.0, 2.0]}
+    A, D = np.arange(6.0).reshape(2, 3), -np.arange(6.0).reshape(2, 3)
+    save_payoffs(store, "first", grid, A, D)
+
+    A_sel, D_sel, attackers, defenders = load_payoffs(store, "first", r=[1.0, 2.0])
+    assert np.array_equal(A_sel, A[:, 1:]) and np.array_equal(D_sel, D[:, 1:])
+    assert len(attackers) == 2 and len(defenders) == 2
+    with pytest.raises(ValueError):
+        load_payoffs(store, "second")
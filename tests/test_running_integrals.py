@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from first_scenario.lib.epidemic_model import EpidemicModel as SISModel
+from first_scenario.lib.simulation import Simulator as SISSimulator
+from second_scenario.lib.epidemic_model import EpidemicModel as PatchModel
+from second_scenario.lib.simulation import Simulator as PatchSimulator
+
+
+def _trapezoid(values, t):
+    return float(np.sum(0.5 * (values[1:] + values[:-1]) * np.diff(t)))
+
+
+def test_sis_gains_match_trapezoid_over_history():
+    sim = SISSimulator(SISModel(1.62, 2.0), [9985, 15], dt=0.5, total_time=40.0,
+                       metrics={"I2": lambda s: (s.I / s.N) ** 2})
+    sim.run()
+    t, N = sim.t_values, sim.N
+    fraction = sim.I_values / N
+
+    assert sim.gain_attacker == pytest.approx(_trapezoid(fraction, t) / 40.0, rel=1e-12)
+    assert sim.gain_defender == pytest.approx(_trapezoid(sim.S_values / N, t) / 40.0, rel=1e-12)
+    assert sim.metric_values["I2"] == pytest.approx(_trapezoid(fraction ** 2, t) / 40.0,
+                                                    rel=1e-12)
+
+
+def test_patch_gains_do_not_need_the_history():
+    model = PatchModel(3.0, 1.0, 0.1, 0.1, 10000)
+    full = PatchSimulator(model, [9985, 15, 0], dt=0.5, total_time=40.0).run()
+    summary = PatchSimulator(model, [9985, 15, 0], dt=0.5, total_time=40.0,
+                             record="summary").run()
+    history = full["history"]
+    t = history["time"].to_numpy()
+
+    assert summary["history"] is None
+    assert full["gain_attacker"] == pytest.approx(
+        _trapezoid(history["I"].to_numpy() / 10000, t) / 40.0, rel=1e-12)
+    for name in ("gain_attacker", "gain_defender", "cost_defender", "payoff_defender"):
+        assert summary[name] == full[name]
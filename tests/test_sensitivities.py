@@ -0,0 +1,49 @@
+import pytest
+
+from first_scenario.lib.epidemic_model import EpidemicModel
+from first_scenario.lib.simulation import Simulator
+from third_scenario.lib.unified_model import UnifiedEpidemicModel
+from third_scenario.lib.unified_simulation import UnifiedSimulator
+
+
+def _sis_model(beta, r, cost_attacker_coeff=0.05, cost_defender_coeff=0.05):
+    model = EpidemicModel(beta, r)
+    model.cost_attacker_coeff = cost_attacker_coeff
+    model.cost_defender_coeff = cost_defender_coeff
+    model.cost_attacker = model.get_cost_attacker()
+    model.cost_defender = model.get_cost_defender()
+    return model
+
+
+def _payoffs(simulator_class, factory, params, state):
+    sim = simulator_class(factory(**params), state, dt=0.5, total_time=40.0)
+    sim.run()
+    return {"attacker": sim.payoff_attacker, "defender": sim.payoff_defender}
+
+
+@pytest.mark.parametrize("simulator_class, factory, params, state", [
+    (Simulator, _sis_model, {"beta": 1.62, "r": 1.2, "cost_attacker_coeff": 0.05,
+                             "cost_defender_coeff": 0.05}, [9985, 15]),
+    (UnifiedSimulator, UnifiedEpidemicModel, {"beta": 1.62, "gamma": 0.3, "r": 1.2,
+                                              "lambda_": 0.4, "k0": 0.01, "k1": 0.01},
+     [9985, 15, 0]),
+])
+def test_gradients_match_central_differences(simulator_class, factory, params, state):
+    sim = simulator_class(factory(**params), state, dt=0.5, total_time=40.0,
+                          sensitivities=True)
+    sim.run()
+    assert set(sim.payoff_gradients["attacker"]) == set(params)
+
+    h = 1e-6
+    for name, value in params.items():
+        up = _payoffs(simulator_class, factory, dict(params, **{name: value + h}), state)
+        down = _payoffs(simulator_class, factory, dict(params, **{name: value - h}), state)
+        for player in ("attacker", "defender"):
+            finite_difference = (up[player] - down[player]) / (2 * h)
+            assert sim.payoff_gradients[player][name] == pytest.approx(
+                finite_difference, rel=1e-5, abs=1e-8)
+
+
+def test_sensitivities_need_euler():
+    with pytest.raises(ValueError):
+        Simulator(EpidemicModel(1.0, 1.0), [90, 10], method="rk45", sensitivities=True)
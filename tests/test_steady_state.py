@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from first_scenario.lib.epidemic_model import EpidemicModel as SISModel
+from first_scenario.lib.simulation import BatchSimulator, Simulator as SISSimulator
+from second_scenario.lib.epidemic_model import EpidemicModel as PatchModel
+from second_scenario.lib.simulation import Simulator as PatchSimulator
+from third_scenario.lib.unified_model import UnifiedEpidemicModel
+from third_scenario.lib.unified_simulation import UnifiedSimulator
+
+OUTPUTS = ("gain_attacker", "gain_defender", "cost_defender",
+           "payoff_attacker", "payoff_defender")
+
+
+def _run(simulator_class, model, state, **kwargs):
+    sim = simulator_class(model, state, 1.0, 168.0, **kwargs)
+    sim.run()
+    return sim
+
+
+@pytest.mark.parametrize("simulator_class, model, state", [
+    (SISSimulator, SISModel(0.5, 2.0), [9985, 15]),
+    (PatchSimulator, PatchModel(1.62, 2.0, 1.0, 15.0, 10000), [9985, 15, 0]),
+    (UnifiedSimulator, UnifiedEpidemicModel(1.62, 5.0, 5.0, 10.0), [9985, 15, 0]),
+])
+def test_steady_stop_matches_full_integration(simulator_class, model, state):
+    full = _run(simulator_class, model, state)
+    steady = _run(simulator_class, model, state, steady_tol=1e-9)
+
+    # Se detuvo antes del horizonte, pero la trayectoria cubre toda la malla
+    assert steady.steady_time is not None and steady.steady_time < 168.0
+    assert np.allclose(steady.t_values, full.t_values)
+    for name in OUTPUTS:
+        assert np.isclose(getattr(steady, name), getattr(full, name), rtol=1e-6, atol=1e-9)
+
+
+def test_batch_steady_stop_matches_scalar_runs():
+    betas, rs = [0.5, 1.62, 2.5], [0.5, 2.0, 5.0]
+    batch = BatchSimulator.from_grid(betas, rs, [9985, 15], steady_tol=1e-9)
+    batch.run()
+    for i, beta in enumerate(betas):
+        for j, r in enumerate(rs):
+            sim = _run(SISSimulator, SISModel(beta, r), [9985, 15], steady_tol=1e-9)
+            assert np.isclose(batch.payoff_attacker[i, j], sim.payoff_attacker)
+            assert np.isclose(batch.payoff_defender[i, j], sim.payoff_defender)
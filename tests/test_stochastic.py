@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from common.stochastic import ReplicatedSimulator
+from first_scenario.lib.epidemic_model import EpidemicModel
+from first_scenario.lib.simulation import Simulator
+from first_scenario.lib.stochastic import StochasticSimulator
+
+
+def test_base_class_requires_transitions_and_payoffs():
+    with pytest.raises(TypeError):
+        ReplicatedSimulator(EpidemicModel(1.0, 1.0), [90, 10])
+
+
+@pytest.mark.parametrize("method", ["ssa", "tau"])
+def test_replicate_ranges_are_reproducible(method):
+    # Una réplica solo depende de (seed, block_size, índice): los rangos parciales
+    # coinciden con la corrida completa
+    sim = StochasticSimulator(EpidemicModel(2.0, 1.0), [190, 10], total_time=10.0,
+                              method=method, block_size=32)
+    full = sim.run(replicates=100)["replicates"]
+    part = sim.run(replicates=50, first_replicate=40)["replicates"]
+    for key, values in part.items():
+        assert np.array_equal(values, full[key][40:90])
+
+
+@pytest.mark.parametrize("method", ["ssa", "tau"])
+def test_mean_matches_mean_field(method):
+    model = EpidemicModel(2.0, 1.0)
+    state = [1900, 100]
+    reference = Simulator(model, state, dt=0.01, total_time=10.0, method="rk45")
+    reference.run()
+
+    summary = StochasticSimulator(model, state, total_time=10.0, method=method,
+                                  tau=0.05).run(replicates=256)["summary"]
+    for name in ("gain_attacker", "gain_defender"):
+        assert summary[name]["mean"] == pytest.approx(getattr(reference, name), abs=0.01)
@@ -0,0 +1,33 @@
+import numpy as np
+
+from common.surrogate import Surrogate, latin_hypercube
+
+BOUNDS = [(0.1, 5.0), (0.5, 15.0)]
+
+
+def _payoff(points):
+    beta, r = points[:, 0], points[:, 1]
+    return np.tanh(beta - 0.3 * r) + 0.05 * beta
+
+
+def test_latin_hypercube_fills_every_stratum():
+    points = latin_hypercube(20, BOUNDS, np.random.default_rng(0))
+    for (lo, hi), column in zip(BOUNDS, points.T):
+        strata = np.floor((column - lo) / (hi - lo) * 20).astype(int)
+        assert sorted(strata) == list(range(20))
+
+
+def test_refined_surrogate_approximates_the_payoff():
+    surrogate = Surrogate(_payoff, BOUNDS, batch_size=8, seed=0)
+    _, std_before = surrogate.select()
+    std_after = surrogate.refine(max_simulations=60)
+    assert surrogate.n_simulations == 60
+    assert std_after < std_before
+
+    # Interpola los puntos simulados y se acerca al payoff en una malla densa
+    assert np.allclose(surrogate.predict(surrogate.X), surrogate.y, atol=1e-3)
+    betas, rs = np.linspace(0.1, 5.0, 30), np.linspace(0.5, 15.0, 30)
+    dense = surrogate.predict_grid(betas, rs, chunk_size=97)
+    grid = np.column_stack([g.ravel() for g in np.meshgrid(betas, rs, indexing="ij")])
+    assert dense.shape == (30, 30)
+    assert np.abs(dense.ravel() - _payoff(grid)).max() < 0.05
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from common.trajectory import Trajectory
+from first_scenario.lib.epidemic_model import EpidemicModel
+from first_scenario.lib.simulation import Simulator
+
+
+def _run(record):
+    sim = Simulator(EpidemicModel(1.5, 1.0), [9985, 15], dt=1.0, total_time=50.0,
+                    record=record)
+    sim.run()
+    return sim
+
+
+def test_decimated_record_is_a_subsample_of_full():
+    full, every = _run("full"), _run(7)
+    # Uno de cada 7 pasos más el último, con las mismas ganancias
+    assert np.array_equal(every.t_values, np.append(full.t_values[::7], full.t_values[-1]))
+    assert np.array_equal(every.I_values, np.append(full.I_values[::7], full.I_values[-1]))
+    assert every.gain_attacker == full.gain_attacker
+
+
+def test_summary_record_keeps_only_last_state():
+    full, summary = _run("full"), _run("summary")
+    assert len(summary.trajectory.data) == 0
+    assert summary.trajectory.last_time == full.t_values[-1]
+    assert summary.payoff_defender == full.payoff_defender
+
+
+def test_extend_matches_repeated_append():
+    appended, extended = Trajectory(("x",), 10, 3), Trajectory(("x",), 10, 3)
+    for t in range(4):
+        appended.append(t, 1.0)
+        extended.append(t, 1.0)
+    for t in range(4, 11):
+        appended.append(t, 2.0)
+    extended.extend(range(4, 11), 2.0)
+    appended.finalize()
+    extended.finalize()
+    assert np.array_equal(appended.data, extended.data)
+
+
+@pytest.mark.parametrize("record", [True, False, 0, -2, 2.0, "all"])
+def test_invalid_record_modes_are_rejected(record):
+    with pytest.raises(ValueError):
+        Trajectory(("x",), 10, record)
@@ -5,10 +5,19 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import os
-
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.cache import SimulationCache
+from common.figures import FigureRenderer
+from common.instrumentation import Profiler
+from common.nash import eliminate_dominated, expand_equilibria, solve_nash
+from common.result_store import ResultStore
+from common.surrogate import Surrogate
 from lib.unified_model import UnifiedEpidemicModel
-from lib.unified_simulation import UnifiedSimulator
-from lib.nash import solve_nash
+from lib.unified_simulation import UnifiedSimulator, UnifiedBatchSimulator, sweep, to_matrix
+from lib.double_oracle import UnifiedPayoffOracle, double_oracle
+from lib.fictitious_play import FictitiousPlay
 
 # ---------------------------------------------------------------
 # CONFIGURACIÓN
@@ -26,22 +35,38 @@ R0 = 0
 
 TOTAL_TIME = 168.0
 DT = 1.0
+# Las celdas que llegan al estado estacionario dejan de integrarse
+# (max |dX/dt| / N bajo este valor); None integra siempre todo el horizonte
+STEADY_TOL = 1e-9
+
+# Método de equilibrio: "lemke_howson" (un equilibrio, rápido),
+# "support" (enumeración de soportes, todos los de soportes de igual tamaño) o
+# "vertex" (enumeración de vértices, todos los equilibrios extremos aun si el
+# juego es degenerado)
+SOLVER = "lemke_howson"
+# Eliminación previa de estrategias estrictamente dominadas: None, "pure" o "mixed"
+ELIMINATE = "pure"
+
+# Las corridas individuales (con su trayectoria) se guardan en disco
+CACHE = SimulationCache(trajectories=True)
+
+# Tensores de payoff en .npy con índice de ejes (results/index.json); las
+# tablas CSV son una vista opcional
+STORE = ResultStore(OUTPUT_DIR)
+EXPORT_CSV = True
+
+# Tiempo por fase (simulación, matrices, nash, figuras...); se guarda en results/perfil.json
+PROFILER = Profiler()
+
+# Las figuras se encolan y se generan juntas al final (en paralelo, saltando
+# las que no cambiaron)
+FIGURES = FigureRenderer()
 
 # ---------------------------------------------------------------
 # SIMULACIÓN Y GRÁFICAS TEMPORALES
 # ---------------------------------------------------------------
 
-def run_and_plot(beta, gamma, r, lambda_, title, filename):
-    initial_state = [S0, I0, R0]
-    model = UnifiedEpidemicModel(beta, gamma, r, lambda_)
-    sim = UnifiedSimulator(model, initial_state, DT, TOTAL_TIME)
-    sim.run()
-
-    t = sim.t_values
-    S = sim.S_values
-    I = sim.I_values
-    R = sim.R_values
-
+def plot_trajectory(t, S, I, R, beta, gamma, r, lambda_, title):
     plt.figure(figsize=(10, 6))
     plt.plot(t, S, "b--", linewidth=2, label="Susceptible")
     plt.plot(t, I, "r-", linewidth=2, label="Infectado")
@@ -53,10 +78,17 @@ def run_and_plot(beta, gamma, r, lambda_, title, filename):
     plt.grid(True, alpha=0.3)
     plt.legend()
     plt.tight_layout()
-    plt.savefig(os.path.join(OUTPUT_DIR, filename))
-    plt.close()
 
-    print(f"Generada: {filename}")
+
+def run_and_plot(beta, gamma, r, lambda_, title, filename):
+    initial_state = [S0, I0, R0]
+    model = UnifiedEpidemicModel(beta, gamma, r, lambda_)
+    with PROFILER.phase("simulación", cells=1):
+        trajectory = CACHE.run(UnifiedSimulator, model, initial_state, DT, TOTAL_TIME)["trajectory"]
+
+    FIGURES.submit(os.path.join(OUTPUT_DIR, filename), plot_trajectory,
+                   trajectory["t"], trajectory["S"], trajectory["I"], trajectory["R"],
+                   beta, gamma, r, lambda_, title)
 
 
 # Figuras similares a Fig 5–7 del paper, pero ahora con (β, γ, r, λ)
@@ -85,21 +117,26 @@ for g in defender_gammas:
         for l in defender_lambdas:
             defender_strategies.append((g, r, l))
 
-# MATRICES
-payoff_matrix_A = np.zeros((len(attacker_betas), len(defender_strategies)))
-payoff_matrix_D = np.zeros((len(attacker_betas), len(defender_strategies)))
-
-for i, beta in enumerate(attacker_betas):
-    for j, (gamma, r, lambda_) in enumerate(defender_strategies):
-
-        model = UnifiedEpidemicModel(beta, gamma, r, lambda_)
-        sim = UnifiedSimulator(model, [S0, I0, R0], DT, TOTAL_TIME)
-        sim.run()
-
-        payoff_matrix_A[i, j] = sim.payoff_attacker
-        payoff_matrix_D[i, j] = sim.payoff_defender
-
-# Guardar CSV
+# MATRICES: se integra el tensor (β, γ, r, λ) completo de una vez y se aplana
+# en el mismo orden que defender_strategies
+with PROFILER.phase("matrices", cells=len(attacker_betas) * len(defender_strategies)):
+    payoffs = sweep(attacker_betas, defender_gammas, defender_rs, defender_lambdas,
+                    [S0, I0, R0], DT, TOTAL_TIME, steady_tol=STEADY_TOL)
+payoff_matrix_A = to_matrix(payoffs["payoff_attacker"])
+payoff_matrix_D = to_matrix(payoffs["payoff_defender"])
+
+# Guardar los tensores (β, γ, r, λ) completos y, opcionalmente, su vista CSV
+axes = {"beta": attacker_betas, "gamma": defender_gammas, "r": defender_rs,
+        "lambda_": defender_lambdas}
+for name, filename in (("payoff_attacker", "payoff_atacante.csv"),
+                       ("payoff_defender", "payoff_defensor.csv")):
+    STORE.save(name, payoffs[name], axes, scenario="third")
+    if EXPORT_CSV:
+        STORE.export_csv(name, os.path.join(OUTPUT_DIR, filename))
+
+print("Matrices guardadas.")
+
+# DataFrames con etiquetas para los heatmaps
 df_A = pd.DataFrame(
     payoff_matrix_A,
     index=[f"β={b}" for b in attacker_betas],
@@ -111,25 +148,23 @@ df_D = pd.DataFrame(
     columns=[f"γ={g}, r={r}, λ={l}" for (g, r, l) in defender_strategies]
 )
 
-df_A.to_csv(os.path.join(OUTPUT_DIR, "payoff_atacante.csv"))
-df_D.to_csv(os.path.join(OUTPUT_DIR, "payoff_defensor.csv"))
-
-print("Matrices guardadas en CSV.")
 
 # Heatmaps para el atacante y el defensor
-plt.figure(figsize=(18, 6))
+def plot_heatmaps(df_A, df_D):
+    plt.figure(figsize=(18, 6))
 
-plt.subplot(1, 2, 1)
-sns.heatmap(df_A, annot=False, cmap="Reds")
-plt.title("Payoff del Atacante")
+    plt.subplot(1, 2, 1)
+    sns.heatmap(df_A, annot=False, cmap="Reds")
+    plt.title("Payoff del Atacante")
 
-plt.subplot(1, 2, 2)
-sns.heatmap(df_D, annot=False, cmap="Greens")
-plt.title("Payoff del Defensor")
+    plt.subplot(1, 2, 2)
+    sns.heatmap(df_D, annot=False, cmap="Greens")
+    plt.title("Payoff del Defensor")
+
+    plt.tight_layout()
 
-plt.tight_layout()
-plt.savefig(os.path.join(OUTPUT_DIR, "heatmaps.png"))
-plt.close()
+
+FIGURES.submit(os.path.join(OUTPUT_DIR, "heatmaps.png"), plot_heatmaps, df_A, df_D)
 
 
 # ---------------------------------------------------------------
@@ -138,7 +173,38 @@ plt.close()
 
 print(f"\nBuscando Equilibrio de Nash para el {CASE}..")
 
-equilibria = solve_nash(payoff_matrix_A, payoff_matrix_D)
+# Se resuelve el bloque no dominado y se lleva al largo completo (como
+# stage_nash en common/experiment.py): la eliminación se hace una sola vez
+with PROFILER.phase("nash"):
+    rows = np.arange(len(attacker_betas))
+    cols = np.arange(len(defender_strategies))
+    if ELIMINATE:
+        rows, cols = eliminate_dominated(payoff_matrix_A, payoff_matrix_D,
+                                         mixed=ELIMINATE == "mixed")
+        print(f"Estrategias no dominadas: {len(rows)}/{len(attacker_betas)} del atacante, "
+              f"{len(cols)}/{len(defender_strategies)} del defensor")
+
+    block = np.ix_(rows, cols)
+    equilibria = expand_equilibria(
+        solve_nash(payoff_matrix_A[block], payoff_matrix_D[block], method=SOLVER),
+        rows, cols, payoff_matrix_A.shape)
+
+def plot_mixed_strategies(attacker_betas, n_defenders, eq_p, eq_q):
+    plt.figure(figsize=(12, 5))
+
+    plt.subplot(1, 2, 1)
+    plt.bar([str(b) for b in attacker_betas], eq_p, color="red")
+    plt.title("Estrategia Mixta Atacante (Caso 4)")
+    plt.xlabel("Beta")
+    plt.ylabel("Probabilidad")
+
+    plt.subplot(1, 2, 2)
+    plt.bar(range(n_defenders), eq_q, color="green")
+    plt.title("Estrategia Mixta Defensor (Caso 4)")
+    plt.xlabel("Estrategias (γ,r,λ)")
+
+    plt.tight_layout()
+
 
 if not equilibria:
     print(f"No se encontró equilibrio para el {CASE}.")
@@ -155,23 +221,70 @@ else:
     print(f"Payoff esperado Defensor: {expected_D:.4f}")
 
     # Gráfica de estrategias mixtas
-    plt.figure(figsize=(12, 5))
+    FIGURES.submit(os.path.join(OUTPUT_DIR, "nash_mixto.png"), plot_mixed_strategies,
+                   attacker_betas, len(defender_strategies), eq_p, eq_q)
 
-    plt.subplot(1, 2, 1)
-    plt.bar([str(b) for b in attacker_betas], eq_p, color="red")
-    plt.title("Estrategia Mixta Atacante (Caso 4)")
-    plt.xlabel("Beta")
-    plt.ylabel("Probabilidad")
 
-    plt.subplot(1, 2, 2)
-    plt.bar(range(len(defender_strategies)), eq_q, color="green")
-    plt.title("Estrategia Mixta Defensor (Caso 4)")
-    plt.xlabel("Estrategias (γ,r,λ)")
 
-    plt.tight_layout()
-    plt.savefig(os.path.join(OUTPUT_DIR, "nash_mixto.png"))
-    plt.close()
+# ---------------------------------------------------------------
+# DOBLE ORÁCULO SOBRE MALLAS FINAS
+# ---------------------------------------------------------------
+
+print(f"\nDoble oráculo sobre mallas finas para el {CASE}...")
+
+fine_betas = np.round(np.linspace(0.1, 5.0, 491), 4).tolist()
+fine_rates = np.round(np.linspace(0.5, 15.0, 30), 4).tolist()
+fine_defenders = [(g, r, l) for g in fine_rates for r in fine_rates for l in fine_rates]
 
+oracle = UnifiedPayoffOracle([S0, I0, R0], DT, TOTAL_TIME, steady_tol=STEADY_TOL)
+with PROFILER.phase("doble_oráculo"):
+    do_result = double_oracle(oracle, fine_betas, fine_defenders,
+                              initial_attackers=attacker_betas,
+                              initial_defenders=defender_strategies, method=SOLVER)
+
+print(f"Iteraciones: {len(do_result['history'])}, celdas simuladas: {oracle.n_simulations} "
+      f"de {len(fine_betas) * len(fine_defenders)}")
+for b, prob in zip(do_result["attackers"], do_result["p"]):
+    if prob > 0:
+        print(f"  Atacante β={b}: {prob:.4f}")
+for (g, r, l), prob in zip(do_result["defenders"], do_result["q"]):
+    if prob > 0:
+        print(f"  Defensor γ={g}, r={r}, λ={l}: {prob:.4f}")
+print(f"Mejora máxima por desviarse: atacante {do_result['gap_attacker']:.2e}, "
+      f"defensor {do_result['gap_defender']:.2e}")
+
+
+# ---------------------------------------------------------------
+# JUEGO FICTICIO CON PARÁMETROS CONTINUOS (retomable)
+# ---------------------------------------------------------------
+
+FP_ITERATIONS = 50
+FP_CHECKPOINT = os.path.join(OUTPUT_DIR, "fictitious_play.json")
+FP_CONFIG = {"initial_state": [S0, I0, R0], "dt": DT, "total_time": TOTAL_TIME,
+             "steady_tol": STEADY_TOL}
+
+print(f"\nJuego ficticio continuo para el {CASE}...")
+fp = None
+if os.path.exists(FP_CHECKPOINT):
+    try:
+        fp = FictitiousPlay.load(FP_CHECKPOINT, **FP_CONFIG)
+        print(f"Retomando desde la iteración {fp.iteration}")
+    except ValueError as error:
+        print(f"Punto de control descartado ({error})")
+if fp is None:
+    fp = FictitiousPlay(**FP_CONFIG)
+
+# FP_ITERATIONS es el total: al retomar solo se corren las que faltan
+with PROFILER.phase("juego_ficticio"):
+    fp_result = fp.run(max(0, FP_ITERATIONS - fp.iteration))
+fp.save(FP_CHECKPOINT)
+
+# Las mejores respuestas son numéricas: la brecha medida es una cota inferior
+print(f"Iteración {fp_result['iteration']}: explotabilidad ≥ {fp_result['exploitability']:.4f}")
+for b, prob in zip(fp_result["attackers"], fp_result["p"]):
+    print(f"  Atacante β={b:.4f}: {prob:.4f}")
+for (g, r, l), prob in zip(fp_result["defenders"], fp_result["q"]):
+    print(f"  Defensor γ={g:.4f}, r={r:.4f}, λ={l:.4f}: {prob:.4f}")
 
 
 print("\nGenerando gráficas extra (Payoff vs parámetros)...")
@@ -180,57 +293,108 @@ print("\nGenerando gráficas extra (Payoff vs parámetros)...")
 # Payoff del Defensor vs r
 # ---------------------------
 r_values = np.linspace(0.5, 15, 20)
-payoffs_def_vs_r = []
 
 beta_fixed = 1.5     # fija beta
 gamma_fixed = 5      # fija gamma
 lambda_fixed = 8     # fija lambda
 
-for r_val in r_values:
-    model = UnifiedEpidemicModel(beta_fixed, gamma_fixed, r_val, lambda_fixed)
-    sim = UnifiedSimulator(model, [S0, I0, R0], DT, TOTAL_TIME)
-    sim.run()
-    payoffs_def_vs_r.append(sim.payoff_defender)
+with PROFILER.phase("matrices", cells=len(r_values)):
+    payoffs_def_vs_r = sweep(beta_fixed, gamma_fixed, r_values, lambda_fixed, [S0, I0, R0],
+                             DT, TOTAL_TIME, steady_tol=STEADY_TOL)["payoff_defender"].ravel()
+
+def plot_payoff_curve(values, payoffs, style, title, xlabel, ylabel):
+    plt.figure(figsize=(10, 6))
+    plt.plot(values, payoffs, style, linewidth=2)
+    plt.title(title)
+    plt.xlabel(xlabel)
+    plt.ylabel(ylabel)
+    plt.grid(True, alpha=0.3)
+    plt.tight_layout()
 
-plt.figure(figsize=(10, 6))
-plt.plot(r_values, payoffs_def_vs_r, "g-o", linewidth=2)
-plt.title(f"Payoff del Defensor vs Tasa de Recuperación r\n(β={beta_fixed}, γ={gamma_fixed}, λ={lambda_fixed})")
-plt.xlabel("Tasa de recuperación (r)")
-plt.ylabel("Payoff del Defensor")
-plt.grid(True, alpha=0.3)
-plt.tight_layout()
-plt.savefig(os.path.join(OUTPUT_DIR, "payoff_def_vs_r.png"))
-plt.close()
 
-print("Generada: payoff_def_vs_r.png")
+FIGURES.submit(os.path.join(OUTPUT_DIR, "payoff_def_vs_r.png"), plot_payoff_curve,
+               r_values, payoffs_def_vs_r, "g-o",
+               f"Payoff del Defensor vs Tasa de Recuperación r\n(β={beta_fixed}, γ={gamma_fixed}, λ={lambda_fixed})",
+               "Tasa de recuperación (r)", "Payoff del Defensor")
 
 # ---------------------------
 # Payoff del Atacante vs β
 # ---------------------------
 beta_values = np.linspace(0.5, 3.0, 20)
-payoffs_att_vs_beta = []
 
 gamma_fixed = 5      # fija gamma
 r_fixed = 5          # fija r
 lambda_fixed = 8     # fija lambda
 
-for beta_val in beta_values:
-    model = UnifiedEpidemicModel(beta_val, gamma_fixed, r_fixed, lambda_fixed)
-    sim = UnifiedSimulator(model, [S0, I0, R0], DT, TOTAL_TIME)
-    sim.run()
-    payoffs_att_vs_beta.append(sim.payoff_attacker)
+with PROFILER.phase("matrices", cells=len(beta_values)):
+    payoffs_att_vs_beta = sweep(beta_values, gamma_fixed, r_fixed, lambda_fixed, [S0, I0, R0],
+                                DT, TOTAL_TIME, steady_tol=STEADY_TOL)["payoff_attacker"].ravel()
+
+FIGURES.submit(os.path.join(OUTPUT_DIR, "payoff_att_vs_beta.png"), plot_payoff_curve,
+               beta_values, payoffs_att_vs_beta, "r-o",
+               f"Payoff del Atacante vs Tasa de Infección β\n(γ={gamma_fixed}, r={r_fixed}, λ={lambda_fixed})",
+               "Tasa de infección (β)", "Payoff del Atacante")
+
+
+# ---------------------------
+# Heatmap denso con modelo sustituto (proceso gaussiano)
+# ---------------------------
+SURROGATE_SIMULATIONS = 200
+HEATMAP_RESOLUTION = 500
+
+gamma_fixed = 5
+lambda_fixed = 8
+
+def simulate_attacker_payoff(points):
+    """Payoff del atacante en puntos (beta, r) con γ y λ fijos."""
+    model = UnifiedEpidemicModel(points[:, 0], gamma_fixed, points[:, 1], lambda_fixed)
+    sim = UnifiedBatchSimulator(model, [S0, I0, R0], DT, TOTAL_TIME, steady_tol=STEADY_TOL)
+    return sim.run()["payoff_attacker"]
+
+with PROFILER.phase("sustituto"):
+    surrogate = Surrogate(simulate_attacker_payoff, [(0.5, 3.0), (0.5, 15.0)])
+    surrogate.refine(max_simulations=SURROGATE_SIMULATIONS)
+
+    dense_betas = np.linspace(0.5, 3.0, HEATMAP_RESOLUTION)
+    dense_rs = np.linspace(0.5, 15.0, HEATMAP_RESOLUTION)
+    dense_payoff, dense_std = surrogate.predict_grid(dense_betas, dense_rs, return_std=True)
+
+# Validación contra una malla pequeña simulada directamente
+check_betas = np.linspace(0.5, 3.0, 20)
+check_rs = np.linspace(0.5, 15.0, 20)
+check = sweep(check_betas, gamma_fixed, check_rs, lambda_fixed,
+              [S0, I0, R0], DT, TOTAL_TIME, steady_tol=STEADY_TOL)["payoff_attacker"][:, 0, :, 0]
+error = np.abs(surrogate.predict_grid(check_betas, check_rs) - check).max()
+
+def plot_surrogate(dense_payoff, extent, samples, n_simulations, resolution, gamma, lambda_):
+    plt.figure(figsize=(10, 7))
+    plt.imshow(dense_payoff, origin="lower", aspect="auto", cmap="Reds", extent=extent)
+    plt.colorbar(label="Payoff del Atacante")
+    plt.scatter(samples[:, 1], samples[:, 0], s=6, c="k", label="Simulaciones")
+    plt.title(f"Payoff del Atacante (sustituto {resolution}x{resolution}, "
+              f"{n_simulations} simulaciones)\n(γ={gamma}, λ={lambda_})")
+    plt.xlabel("Tasa de recuperación (r)")
+    plt.ylabel("Tasa de infección (β)")
+    plt.legend(loc="upper right")
+    plt.tight_layout()
+
+
+FIGURES.submit(os.path.join(OUTPUT_DIR, "surrogate_payoff_atacante.png"), plot_surrogate,
+               dense_payoff, [dense_rs[0], dense_rs[-1], dense_betas[0], dense_betas[-1]],
+               surrogate.X, surrogate.n_simulations, HEATMAP_RESOLUTION, gamma_fixed,
+               lambda_fixed)
 
-plt.figure(figsize=(10, 6))
-plt.plot(beta_values, payoffs_att_vs_beta, "r-o", linewidth=2)
-plt.title(f"Payoff del Atacante vs Tasa de Infección β\n(γ={gamma_fixed}, r={r_fixed}, λ={lambda_fixed})")
-plt.xlabel("Tasa de infección (β)")
-plt.ylabel("Payoff del Atacante")
-plt.grid(True, alpha=0.3)
-plt.tight_layout()
-plt.savefig(os.path.join(OUTPUT_DIR, "payoff_att_vs_beta.png"))
-plt.close()
+print(f"Sustituto: {surrogate.n_simulations} simulaciones, "
+      f"error máximo {error:.2e}, incertidumbre máxima {dense_std.max():.2e}")
 
-print("Generada: payoff_att_vs_beta.png")
 
+with PROFILER.phase("figuras"):
+    status = FIGURES.flush()
+for path, state in status.items():
+    print(f"{'Generada' if state == 'generada' else 'Sin cambios'}: {os.path.basename(path)}")
 
+print("\n" + CACHE.report())
+print(FIGURES.report())
+PROFILER.save(os.path.join(OUTPUT_DIR, "perfil.json"), script="analyze_case.py", case=CASE)
+print(PROFILER.report())
 print(f"\nAnálisis del {CASE} completado.")
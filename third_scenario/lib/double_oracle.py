@@ -0,0 +1,139 @@
+import numpy as np
+
+from common.nash import solve_nash
+
+from .unified_model import UnifiedEpidemicModel
+from .unified_simulation import UnifiedBatchSimulator
+
+
+class UnifiedPayoffOracle:
+    """
+    Payoffs de celdas (beta, (gamma, r, lambda_)) con memoria.
+
+    Cada celda se simula una sola vez: en cada consulta solo las celdas que
+    faltan se integran, todas juntas, con UnifiedBatchSimulator (mismos
+    resultados que UnifiedSimulator celda por celda). steady_tol se pasa al
+    simulador en lote.
+    """
+
+    def __init__(self, initial_state, dt=1.0, total_time=168.0, k0=0.01, k1=0.01,
+                 steady_tol=None):
+        self.initial_state = initial_state
+        self.dt = dt
+        self.total_time = total_time
+        self.k0 = k0
+        self.k1 = k1
+        self.steady_tol = steady_tol
+        self.memo = {}
+
+    @property
+    def n_simulations(self):
+        return len(self.memo)
+
+    def payoffs(self, attackers, defenders):
+        """
+        Matrices (A, D) de shape (len(attackers), len(defenders)).
+        attackers son valores de beta; defenders son tuplas (gamma, r, lambda_).
+        """
+        attackers = [float(b) for b in attackers]
+        defenders = [tuple(float(v) for v in d) for d in defenders]
+
+        missing = sorted({(b, d) for b in attackers for d in defenders} - self.memo.keys())
+        if missing:
+            beta = np.array([b for b, _ in missing])
+            gamma, r, lambda_ = np.array([d for _, d in missing]).T
+            model = UnifiedEpidemicModel(beta, gamma, r, lambda_, k0=self.k0, k1=self.k1)
+            result = UnifiedBatchSimulator(model, self.initial_state, self.dt,
+                                           self.total_time, self.steady_tol).run()
+            for cell, a, d in zip(missing, result["payoff_attacker"], result["payoff_defender"]):
+                self.memo[cell] = (float(a), float(d))
+
+        A = np.array([[self.memo[b, d][0] for d in defenders] for b in attackers])
+        D = np.array([[self.memo[b, d][1] for d in defenders] for b in attackers])
+        return A, D
+
+
+def double_oracle(oracle, attacker_space, defender_space, initial_attackers=None,
+                  initial_defenders=None, method="lemke_howson", tol=1e-9,
+                  max_iterations=100):
+    """
+    Generación de estrategias por doble oráculo.
+
+    En cada iteración se resuelve el juego restringido con solve_nash, se
+    busca la mejor respuesta de cada jugador en su espacio completo (una
+    malla muy fina) contra la estrategia mixta del otro y se agregan al juego
+    restringido. Termina cuando ninguna mejor respuesta mejora el valor del
+    equilibrio restringido en más de tol.
+
+    Solo se simulan las celdas nuevas: las mejores respuestas se evalúan
+    contra el soporte del rival y el oráculo recuerda todas las celdas.
+
+    Args:
+        oracle: Objeto con payoffs(attackers, defenders) -> (A, D).
+        attacker_space: Estrategias posibles del atacante.
+        defender_space: Estrategias posibles del defensor.
+        initial_attackers, initial_defenders: Juego restringido inicial
+            (por defecto la primera estrategia de cada espacio).
+        method: Método de solve_nash para los juegos restringidos. Si no
+            encuentra equilibrios se usa "lemke_howson".
+
+    Returns:
+        Diccionario con "attackers", "defenders", "p", "q" (equilibrio del
+        juego restringido final), "gap_attacker", "gap_defender" (mejora
+        máxima por desviarse) e "history" (brechas por iteración).
+    """
+    attacker_space = list(attacker_space)
+    defender_space = list(defender_space)
+    attackers = list(initial_attackers or attacker_space[:1])
+    defenders = list(initial_defenders or defender_space[:1])
+    history = []
+
+    for _ in range(max_iterations):
+        A, D = oracle.payoffs(attackers, defenders)
+        equilibria = solve_nash(A, D, method=method)
+        if not equilibria and method != "lemke_howson":
+            # p. ej. "support" en un juego degenerado sin soportes del mismo
+            # tamaño: Lemke-Howson siempre termina en un equilibrio
+            equilibria = solve_nash(A, D, method="lemke_howson")
+        if not equilibria:
+            raise RuntimeError(f"Sin equilibrio para el juego restringido "
+                               f"{A.shape[0]}x{A.shape[1]} (método {method!r})")
+        p, q = equilibria[0]
+        value_A = p @ A @ q
+        value_D = p @ D @ q
+
+        # Mejores respuestas contra el soporte de la estrategia del rival
+        cols = np.flatnonzero(q > 0)
+        rows = np.flatnonzero(p > 0)
+        A_br, _ = oracle.payoffs(attacker_space, [defenders[j] for j in cols])
+        _, D_br = oracle.payoffs([attackers[i] for i in rows], defender_space)
+        values_A = A_br @ q[cols]
+        values_D = p[rows] @ D_br
+        best_A = int(np.argmax(values_A))
+        best_D = int(np.argmax(values_D))
+
+        gap_A = float(values_A[best_A] - value_A)
+        gap_D = float(values_D[best_D] - value_D)
+        history.append({"gap_attacker": gap_A, "gap_defender": gap_D,
+                        "n_attackers": len(attackers), "n_defenders": len(defenders),
+                        "n_simulations": oracle.n_simulations})
+
+        improved = False
+        if gap_A > tol and attacker_space[best_A] not in attackers:
+            attackers.append(attacker_space[best_A])
+            improved = True
+        if gap_D > tol and defender_space[best_D] not in defenders:
+            defenders.append(defender_space[best_D])
+            improved = True
+        if not improved:
+            break
+
+    return {
+        "attackers": attackers,
+        "defenders": defenders,
+        "p": p,
+        "q": q,
+        "gap_attacker": gap_A,
+        "gap_defender": gap_D,
+        "history": history,
+    }
@@ -0,0 +1,276 @@
+import itertools
+import json
+
+import numpy as np
+from scipy.optimize import minimize, minimize_scalar
+
+from .unified_model import UnifiedEpidemicModel
+from .unified_simulation import UnifiedBatchSimulator
+
+
+class FictitiousPlay:
+    """
+    Juego ficticio (fictitious play) con parámetros continuos.
+
+    El atacante elige beta en beta_bounds y el defensor (gamma, r, lambda_) en
+    defender_bounds. En cada iteración cada jugador calcula su mejor respuesta
+    a la estrategia mixta promedio del rival con scipy.optimize sobre el payoff
+    simulado (barrido grueso en lote + refinamiento local acotado) y la agrega
+    a su historial de jugadas; las estrategias promedio son las frecuencias
+    empíricas.
+
+    Antes de cada actualización se registran las brechas de las estrategias
+    promedio:
+        gap_attacker = u_A(BR_A, sigma_D) - u_A(sigma_A, sigma_D)
+        gap_defender = u_D(sigma_A, BR_D) - u_D(sigma_A, sigma_D)
+    Las mejores respuestas son numéricas (pueden quedarse cortas), así que
+    max de ambas brechas es una cota inferior de la explotabilidad de
+    (sigma_A, sigma_D): el par es eps-Nash solo si el optimizador encontró
+    la mejor respuesta global.
+
+    Los payoffs se obtienen con UnifiedBatchSimulator (mismo resultado que
+    UnifiedSimulator, varias celdas por llamada, con steady_tol opcional) y
+    cada celda se recuerda. El estado completo se puede guardar y retomar
+    con save()/load(); load() rechaza puntos de control guardados con otra
+    configuración.
+    """
+
+    def __init__(self, initial_state, dt=1.0, total_time=168.0,
+                 beta_bounds=(0.1, 5.0), defender_bounds=((0.5, 15.0),) * 3,
+                 k0=0.01, k1=0.01, initial_attacker=1.0,
+                 initial_defender=(5.0, 5.0, 5.0), grid_points=25, defender_grid=5,
+                 steady_tol=None):
+        self.initial_state = list(initial_state)
+        self.dt = dt
+        self.total_time = total_time
+        self.beta_bounds = tuple(beta_bounds)
+        self.defender_bounds = tuple(tuple(b) for b in defender_bounds)
+        self.k0 = k0
+        self.k1 = k1
+        self.grid_points = grid_points
+        self.defender_grid = defender_grid
+        self.steady_tol = steady_tol
+
+        # Jugadas distintas y cuántas veces se jugaron
+        self.attackers = [float(initial_attacker)]
+        self.defenders = [tuple(float(v) for v in initial_defender)]
+        self.attacker_counts = [1]
+        self.defender_counts = [1]
+        self.iteration = 0
+        self.history = []
+        self.memo = {}
+
+    # -----------------------------------------------------------------
+    # Payoffs
+    # -----------------------------------------------------------------
+
+    def simulate(self, betas, defenders):
+        """Payoffs (A, D) celda por celda para listas paralelas de beta y (gamma, r, lambda_)."""
+        cells = [(float(b), tuple(float(v) for v in d)) for b, d in zip(betas, defenders)]
+        missing = list(dict.fromkeys(c for c in cells if c not in self.memo))
+        if missing:
+            beta = np.array([b for b, _ in missing])
+            gamma, r, lambda_ = np.array([d for _, d in missing]).T
+            model = UnifiedEpidemicModel(beta, gamma, r, lambda_, k0=self.k0, k1=self.k1)
+            result = UnifiedBatchSimulator(model, self.initial_state, self.dt,
+                                           self.total_time, self.steady_tol).run()
+            for cell, a, d in zip(missing, result["payoff_attacker"], result["payoff_defender"]):
+                self.memo[cell] = (float(a), float(d))
+        A = np.array([self.memo[c][0] for c in cells])
+        D = np.array([self.memo[c][1] for c in cells])
+        return A, D
+
+    def strategies(self):
+        """Estrategias promedio (frecuencias empíricas)."""
+        p = np.array(self.attacker_counts, dtype=float)
+        q = np.array(self.defender_counts, dtype=float)
+        return p / p.sum(), q / q.sum()
+
+    def matrices(self):
+        pairs = list(itertools.product(self.attackers, self.defenders))
+        A, D = self.simulate([b for b, _ in pairs], [d for _, d in pairs])
+        shape = (len(self.attackers), len(self.defenders))
+        return A.reshape(shape), D.reshape(shape)
+
+    def attacker_value(self, betas, q):
+        """u_A(beta, sigma_D) para cada beta."""
+        betas = np.atleast_1d(betas)
+        A, _ = self.simulate(np.repeat(betas, len(self.defenders)),
+                             self.defenders * len(betas))
+        return A.reshape(len(betas), -1) @ q
+
+    def defender_value(self, defenders, p):
+        """u_D(sigma_A, d) para cada d = (gamma, r, lambda_)."""
+        defenders = [tuple(d) for d in defenders]
+        _, D = self.simulate(self.attackers * len(defenders),
+                             np.repeat(np.array(defenders), len(self.attackers), axis=0))
+        return p @ D.reshape(len(defenders), -1).T
+
+    # -----------------------------------------------------------------
+    # Mejores respuestas
+    # -----------------------------------------------------------------
+
+    def attacker_best_response(self, q):
+        lo, hi = self.beta_bounds
+        grid = np.linspace(lo, hi, self.grid_points)
+        values = self.attacker_value(grid, q)
+        k = int(np.argmax(values))
+        best_beta, best_value = float(grid[k]), float(values[k])
+
+        # Refinamiento acotado alrededor del mejor punto de la malla
+        step = (hi - lo) / (self.grid_points - 1)
+        res = minimize_scalar(lambda b: -self.attacker_value(b, q)[0], method="bounded",
+                              bounds=(max(lo, best_beta - step), min(hi, best_beta + step)),
+                              options={"xatol": 1e-4})
+        if -res.fun > best_value:
+            best_beta, best_value = float(res.x), float(-res.fun)
+        return best_beta, best_value
+
+    def defender_best_response(self, p):
+        axes = [np.linspace(lo, hi, self.defender_grid) for lo, hi in self.defender_bounds]
+        grid = list(itertools.product(*axes))
+        values = self.defender_value(grid, p)
+        k = int(np.argmax(values))
+        best, best_value = tuple(float(v) for v in grid[k]), float(values[k])
+
+        res = minimize(lambda x: -self.defender_value([x], p)[0], np.array(best),
+                       method="Nelder-Mead", bounds=self.defender_bounds,
+                       options={"xatol": 1e-4, "fatol": 1e-10, "maxfev": 300})
+        if -res.fun > best_value:
+            best, best_value = tuple(float(v) for v in res.x), float(-res.fun)
+        return best, best_value
+
+    # -----------------------------------------------------------------
+    # Iteraciones
+    # -----------------------------------------------------------------
+
+    def step(self):
+        """
+        Una iteración: brechas de las estrategias promedio y actualización.
+        El registro guarda p y q tal como se midieron (antes de agregar las
+        mejores respuestas).
+        """
+        p, q = self.strategies()
+        A, D = self.matrices()
+        value_A = float(p @ A @ q)
+        value_D = float(p @ D @ q)
+
+        br_attacker, br_value_A = self.attacker_best_response(q)
+        br_defender, br_value_D = self.defender_best_response(p)
+
+        gap_A = max(0.0, br_value_A - value_A)
+        gap_D = max(0.0, br_value_D - value_D)
+        self.iteration += 1
+        self.history.append({
+            "iteration": self.iteration,
+            "value_attacker": value_A,
+            "value_defender": value_D,
+            "gap_attacker": gap_A,
+            "gap_defender": gap_D,
+            "exploitability": max(gap_A, gap_D),
+            "n_simulations": len(self.memo),
+            "p": p.tolist(),
+            "q": q.tolist(),
+        })
+
+        self._play(self.attackers, self.attacker_counts, br_attacker)
+        self._play(self.defenders, self.defender_counts, br_defender)
+        return self.history[-1]
+
+    @staticmethod
+    def _play(strategies, counts, strategy, tol=1e-6):
+        # Jugadas muy cercanas a una ya conocida se cuentan como la misma
+        for i, s in enumerate(strategies):
+            if np.allclose(s, strategy, atol=tol, rtol=0):
+                counts[i] += 1
+                return
+        strategies.append(strategy)
+        counts.append(1)
+
+    def run(self, iterations, tol=None, callback=None):
+        """
+        Ejecuta hasta `iterations` iteraciones más (continúa desde el estado
+        actual). Se detiene antes si la explotabilidad baja de tol.
+        """
+        for _ in range(iterations):
+            record = self.step()
+            if callback is not None:
+                callback(self, record)
+            if tol is not None and record["exploitability"] <= tol:
+                break
+        return self.result()
+
+    def result(self):
+        """
+        Estrategias promedio sobre las que se midió la última brecha (las
+        de antes de la última actualización) y esa brecha, que es una cota
+        inferior de su explotabilidad. Sin iteraciones, las iniciales.
+        """
+        if not self.history:
+            p, q = self.strategies()
+            exploitability = None
+        else:
+            last = self.history[-1]
+            p, q = np.array(last["p"]), np.array(last["q"])
+            exploitability = last["exploitability"]
+        return {
+            "attackers": self.attackers[:len(p)],
+            "defenders": self.defenders[:len(q)],
+            "p": p,
+            "q": q,
+            "iteration": self.iteration,
+            "exploitability": exploitability,
+        }
+
+    # -----------------------------------------------------------------
+    # Guardar / retomar
+    # -----------------------------------------------------------------
+
+    CONFIG = ("initial_state", "dt", "total_time", "beta_bounds", "defender_bounds",
+              "k0", "k1", "grid_points", "defender_grid", "steady_tol")
+
+    def config(self):
+        """Opciones de CONFIG tal como quedan en el JSON (tuplas como listas)."""
+        return json.loads(json.dumps({name: getattr(self, name) for name in self.CONFIG}))
+
+    def save(self, path):
+        """Guarda configuración, jugadas e historial en JSON (sin la memoria de celdas)."""
+        state = self.config()
+        state.update({
+            "attackers": self.attackers,
+            "defenders": self.defenders,
+            "attacker_counts": self.attacker_counts,
+            "defender_counts": self.defender_counts,
+            "iteration": self.iteration,
+            "history": self.history,
+        })
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2)
+
+    @classmethod
+    def load(cls, path, **config):
+        """
+        Retoma un punto de control. `config` son los argumentos del
+        constructor con que se quiere seguir; todas las opciones de CONFIG
+        (las omitidas con su valor por defecto) deben coincidir con las
+        guardadas. Si alguna difiere o el archivo no la tiene, se lanza
+        ValueError en vez de mezclar iteraciones de juegos distintos.
+        """
+        with open(path, encoding="utf-8") as f:
+            state = json.load(f)
+        expected = cls(**config).config()
+        for name in cls.CONFIG:
+            if state.get(name) != expected[name]:
+                raise ValueError(f"{path}: {name}={state.get(name)!r} en el punto de control, "
+                                 f"se esperaba {expected[name]!r}")
+        if any("p" not in record for record in state["history"][-1:]):
+            raise ValueError(f"{path}: el historial no guarda las estrategias medidas")
+
+        fp = cls(**config)
+        fp.attackers = [float(b) for b in state["attackers"]]
+        fp.defenders = [tuple(d) for d in state["defenders"]]
+        fp.attacker_counts = list(state["attacker_counts"])
+        fp.defender_counts = list(state["defender_counts"])
+        fp.iteration = state["iteration"]
+        fp.history = state["history"]
+        return fp
@@ -1,5 +1,8 @@
 # lib/unified_model.py
 
+import numpy as np
+
+
 class UnifiedEpidemicModel:
     """
     Tres compartimentos: S, I, R.
@@ -12,6 +15,10 @@ class UnifiedEpidemicModel:
         k0, k1 - coeficientes de costo del defensor y atacante
     """
 
+    # Parámetros y coeficientes de costo respecto a los que se derivan los payoffs
+    PARAMETERS = ("beta", "gamma", "r", "lambda_")
+    COST_COEFFICIENTS = ("k0", "k1")
+
     def __init__(self, beta, gamma, r, lambda_, k0=0.01, k1=0.01):
         self.beta = beta
         self.gamma = gamma
@@ -30,6 +37,32 @@ class UnifiedEpidemicModel:
     def dR_dt(self, S, I, R, N):
         return self.gamma * S + self.lambda_ * I
 
+    # Derivadas para las ecuaciones de sensibilidad
+    def jacobian(self, S, I, R, N):
+        """Derivadas de (dS/dt, dI/dt, dR/dt) respecto a (S, I, R)."""
+        return np.array([
+            [-self.beta * I - self.gamma, self.r - self.beta * S, 0.0],
+            [self.beta * I, self.beta * S - self.lambda_ - self.r, 0.0],
+            [self.gamma, self.lambda_, 0.0],
+        ])
+
+    def parameter_jacobian(self, S, I, R, N):
+        """Derivadas de (dS/dt, dI/dt, dR/dt) respecto a (beta, gamma, r, lambda_)."""
+        return np.array([
+            [-S * I, -S, I, 0.0],
+            [S * I, 0.0, -I, -I],
+            [0.0, S, 0.0, I],
+        ])
+
+    def cost_gradients(self):
+        """Derivadas de los costos respecto a PARAMETERS + COST_COEFFICIENTS."""
+        return {
+            "attacker": {"beta": self.k1, "gamma": 0.0, "r": 0.0, "lambda_": 0.0,
+                         "k0": 0.0, "k1": self.beta},
+            "defender": {"beta": 0.0, "gamma": self.k0, "r": self.k0, "lambda_": self.k0,
+                         "k0": self.gamma + self.r + self.lambda_, "k1": 0.0},
+        }
+
     # Costos
     @property
     def cost_defender(self):
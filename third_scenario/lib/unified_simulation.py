@@ -1,13 +1,60 @@
 # lib/unified_simulation.py
+import copy
 import math
 
+import numpy as np
+
+from common.trajectory import Trajectory, remaining_times
+
+from .unified_model import UnifiedEpidemicModel
+
+
 class UnifiedSimulator:
     """
     Tres compartimentos: S, I, R.
+
+    record controla cuánto de la trayectoria se guarda (ver Trajectory):
+    "full", cada k pasos (entero k) o "summary" (sin historia).
+
+    Las ganancias (promedios de las muestras) se acumulan dentro del ciclo de
+    pasos, así que run() no necesita la historia. metrics permite agregar
+    integrandos extra {nombre: f(sim)}, cuyo promedio temporal (trapecio)
+    queda en metric_values.
+
+    Con sensitivities=True se propagan junto al estado las sensibilidades
+    d(S, I, R)/d(beta, gamma, r, lambda_) del paso discreto (incluidos el
+    recorte en 0 y la renormalización), y run() deja en gain_gradients y
+    payoff_gradients las derivadas exactas de las ganancias y payoffs respecto
+    a esos parámetros y a k0, k1.
+
+    Con steady_tol el ciclo se detiene cuando max(|dS|, |dI|, |dR|) / N queda
+    bajo steady_tol y no crece durante steady_steps pasos seguidos; el resto
+    del horizonte se suma analíticamente (estado fijo) a los promedios y a la
+    trayectoria. steady_time guarda el tiempo en que se detuvo (None si no
+    llegó al estado estacionario).
+
+    observers es una secuencia de funciones f(sim) que se llaman después de
+    cada paso; sin observadores el ciclo solo paga una comprobación por paso.
     """
 
-    def __init__(self, model, initial_state, dt=1.0, total_time=168.0):
+    __slots__ = ("model", "record", "metrics", "observers", "sensitivities", "steady_tol", "steady_steps",
+                 "steady_count", "steady_time", "rate", "S", "I", "R", "N", "dt",
+                 "total_time", "time", "trajectory", "n_samples", "sum_I", "sum_S_R",
+                 "metric_areas", "metric_prev", "metric_values",
+                 "X", "d_sum_I", "d_sum_S_R", "gain_gradients", "payoff_gradients",
+                 "gain_attacker", "gain_defender",
+                 "cost_attacker", "cost_defender", "payoff_attacker", "payoff_defender")
+
+    def __init__(self, model, initial_state, dt=1.0, total_time=168.0, record="full",
+                 metrics=None, sensitivities=False, steady_tol=None, steady_steps=5,
+                 observers=None):
         self.model = model
+        self.record = record
+        self.metrics = dict(metrics or {})
+        self.observers = tuple(observers or ())
+        self.sensitivities = sensitivities
+        self.steady_tol = steady_tol
+        self.steady_steps = steady_steps
 
         self.S, self.I, self.R = initial_state
         self.N = self.S + self.I + self.R
@@ -19,15 +66,110 @@ class UnifiedSimulator:
         self._init_statistics()
 
     def _init_statistics(self):
-        self.t_values = [0.0]
-        self.S_values = [self.S]
-        self.I_values = [self.I]
-        self.R_values = [self.R]
+        capacity = math.ceil(self.total_time / self.dt) + 1
+        self.trajectory = Trajectory(("S", "I", "R"), capacity, self.record)
+        self.trajectory.append(0.0, self.S, self.I, self.R)
+
+        # Sumas acumuladas para los promedios de las ganancias
+        self.n_samples = 1
+        self.sum_I = self.I
+        self.sum_S_R = self.S + self.R
+
+        self.metric_areas = dict.fromkeys(self.metrics, 0.0)
+        self.metric_prev = [f(self) for f in self.metrics.values()]
+
+        # Pasos seguidos con derivada pequeña y no creciente
+        self.steady_count = 0
+        self.steady_time = None
+        self.rate = math.inf
+
+        if self.sensitivities:
+            # X[i, k] = d(estado_i)/d(parámetro_k); el estado inicial no depende de ellos
+            n_params = len(self.model.PARAMETERS)
+            self.X = np.zeros((3, n_params))
+            self.d_sum_I = np.zeros(n_params)
+            self.d_sum_S_R = np.zeros(n_params)
+
+    def accumulate(self):
+        """Agrega el estado actual a las sumas y a las integrales de las métricas."""
+        self.n_samples += 1
+        self.sum_I += self.I
+        self.sum_S_R += self.S + self.R
+
+        if self.metrics:
+            for k, (name, f) in enumerate(self.metrics.items()):
+                value = f(self)
+                self.metric_areas[name] += 0.5 * (self.metric_prev[k] + value) * self.dt
+                self.metric_prev[k] = value
+
+    @property
+    def t_values(self):
+        return self.trajectory.column("t")
+
+    @property
+    def S_values(self):
+        return self.trajectory.column("S")
+
+    @property
+    def I_values(self):
+        return self.trajectory.column("I")
+
+    @property
+    def R_values(self):
+        return self.trajectory.column("R")
+
+    def propagate_sensitivities(self):
+        """
+        Avanza X = d(S, I, R)/d(parámetros) con la derivada del paso que step()
+        está por dar, desde el estado actual:
+            X' = R C [(Id + dt J) X + dt F]
+        con J y F las derivadas del modelo, C la del recorte en 0 y R la de la
+        renormalización S + I + R = N.
+        """
+        m = self.model
+        dt, N = self.dt, self.N
+        S, I, R = self.S, self.I, self.R
+
+        X = self.X + dt * (m.jacobian(S, I, R, N) @ self.X + m.parameter_jacobian(S, I, R, N))
+
+        y = np.array([S + m.dS_dt(S, I, R, N) * dt,
+                      I + m.dI_dt(S, I, R, N) * dt,
+                      R + m.dR_dt(S, I, R, N) * dt])
+        X[y < 0.0] = 0.0
+        y = np.fmax(0.0, y)
+
+        total = y.sum()
+        if total > 0:
+            X = N * (X / total - np.outer(y, X.sum(axis=0)) / total ** 2)
+
+        self.X = X
+        self.d_sum_I += X[1]
+        self.d_sum_S_R += X[0] + X[2]
+
+    def compute_payoff_gradients(self):
+        """Derivadas de ganancias y payoffs respecto a parámetros y coeficientes de costo."""
+        m = self.model
+        names = m.PARAMETERS + m.COST_COEFFICIENTS
+        cost_gradients = m.cost_gradients()
+        self.gain_gradients = {}
+        self.payoff_gradients = {}
+        for player, d_gain in (("attacker", self.d_sum_I / self.n_samples),
+                               ("defender", self.d_sum_S_R / (2 * self.n_samples))):
+            gradient = dict.fromkeys(names, 0.0)
+            gradient.update(zip(m.PARAMETERS, d_gain.tolist()))
+            self.gain_gradients[player] = gradient
+            self.payoff_gradients[player] = {
+                name: gradient[name] - cost_gradients[player][name] for name in names}
 
     def step(self):
+        if self.sensitivities:
+            self.propagate_sensitivities()
+
         dS = self.model.dS_dt(self.S, self.I, self.R, self.N)
         dI = self.model.dI_dt(self.S, self.I, self.R, self.N)
         dR = self.model.dR_dt(self.S, self.I, self.R, self.N)
+        if self.steady_tol is not None:
+            self.track_steady(max(abs(dS), abs(dI), abs(dR)) / self.N)
 
         self.S += dS * self.dt
         self.I += dI * self.dt
@@ -46,22 +188,239 @@ class UnifiedSimulator:
 
         self.time += self.dt
 
-        self.t_values.append(self.time)
-        self.S_values.append(self.S)
-        self.I_values.append(self.I)
-        self.R_values.append(self.R)
+        self.accumulate()
+        self.trajectory.append(self.time, self.S, self.I, self.R)
+        if self.observers:
+            for observer in self.observers:
+                observer(self)
+
+    def track_steady(self, rate):
+        """Cuenta los pasos seguidos con derivada bajo steady_tol y no creciente."""
+        if rate < self.steady_tol and rate <= self.rate:
+            self.steady_count += 1
+        else:
+            self.steady_count = 0
+        self.rate = rate
+
+    def extend_steady(self):
+        """
+        Termina el horizonte sin integrar: con el estado fijo cada muestra
+        restante suma el estado actual a los promedios y la trayectoria lo
+        repite en los tiempos que habría recorrido el ciclo.
+        """
+        times = remaining_times(self.time, self.total_time, self.dt)
+        if not times:
+            return
+        n = len(times)
+        self.n_samples += n
+        self.sum_I += self.I * n
+        self.sum_S_R += (self.S + self.R) * n
+        for k, name in enumerate(self.metrics):
+            self.metric_areas[name] += self.metric_prev[k] * (times[-1] - self.time)
+        if self.sensitivities:
+            self.d_sum_I += self.X[1] * n
+            self.d_sum_S_R += (self.X[0] + self.X[2]) * n
+
+        self.trajectory.extend(times, self.S, self.I, self.R)
+        self.steady_time = self.time
+        self.time = times[-1]
 
     def run(self):
         while self.time < self.total_time:
             self.step()
+            if self.steady_count >= self.steady_steps:
+                self.extend_steady()
+        self.trajectory.finalize()
 
-        self.gain_attacker = self.average(self.I_values)
-        self.gain_defender = self.average(self.S_values + self.R_values)
+        self.gain_attacker = self.sum_I / self.n_samples
+        # Equivale a promediar la lista concatenada S_values + R_values
+        self.gain_defender = self.sum_S_R / (2 * self.n_samples)
+        self.metric_values = {name: area / self.total_time
+                              for name, area in self.metric_areas.items()}
         self.cost_attacker = self.model.cost_attacker
         self.cost_defender = self.model.cost_defender
 
         self.payoff_attacker = self.gain_attacker - self.cost_attacker
         self.payoff_defender = self.gain_defender - self.cost_defender
 
-    def average(self, lst):
-        return sum(lst) / len(lst)
+        if self.sensitivities:
+            self.compute_payoff_gradients()
+
+
+class UnifiedBatchSimulator:
+    """
+    Versión vectorizada de UnifiedSimulator.
+
+    El modelo debe tener beta, gamma, r y lambda_ como arreglos broadcastables
+    (UnifiedEpidemicModel sirve tal cual): cada elemento del shape resultante es
+    una celda independiente y todas avanzan juntas en cada paso.
+
+    Con steady_tol cada celda deja de integrarse cuando llega al estado
+    estacionario (mismo criterio que UnifiedSimulator) y sus muestras
+    restantes se suman analíticamente; las celdas detenidas salen del lote.
+    steady_time guarda, por celda, el tiempo en que se detuvo (NaN si no se
+    detuvo).
+    """
+
+    # Estado por celda que se compacta al retirar celdas estacionarias
+    CELL_STATE = ("S", "I", "R", "N", "sum_S", "sum_I", "sum_R")
+
+    def __init__(self, model, initial_state, dt=1.0, total_time=168.0,
+                 steady_tol=None, steady_steps=5):
+        self.model = model
+        self.steady_tol = steady_tol
+        self.steady_steps = steady_steps
+
+        shape = np.broadcast(*(np.asarray(v) for v in
+                               (model.beta, model.gamma, model.r, model.lambda_))).shape
+        S0, I0, R0 = initial_state
+        self.S = np.broadcast_to(np.asarray(S0, dtype=float), shape).copy()
+        self.I = np.broadcast_to(np.asarray(I0, dtype=float), shape).copy()
+        self.R = np.broadcast_to(np.asarray(R0, dtype=float), shape).copy()
+        self.N = self.S + self.I + self.R
+
+        self.dt = dt
+        self.total_time = total_time
+        self.time = 0.0
+
+        # Sumas acumuladas para los promedios de UnifiedSimulator.run
+        self.n_samples = 1
+        self.sum_S = self.S.copy()
+        self.sum_I = self.I.copy()
+        self.sum_R = self.R.copy()
+
+    def step(self):
+        m = self.model
+        dS = m.dS_dt(self.S, self.I, self.R, self.N)
+        dI = m.dI_dt(self.S, self.I, self.R, self.N)
+        dR = m.dR_dt(self.S, self.I, self.R, self.N)
+        if self.steady_tol is not None:
+            self.rate = np.fmax(np.fmax(np.abs(dS), np.abs(dI)), np.abs(dR)) / self.N
+
+        # Corrección numérica (equivale a max(0.0, x) en la versión escalar)
+        S = np.fmax(0.0, self.S + dS * self.dt)
+        I = np.fmax(0.0, self.I + dI * self.dt)
+        R = np.fmax(0.0, self.R + dR * self.dt)
+
+        total = S + I + R
+        with np.errstate(invalid="ignore", divide="ignore"):
+            self.S = np.where(total > 0, (S / total) * self.N, S)
+            self.I = np.where(total > 0, (I / total) * self.N, I)
+            self.R = np.where(total > 0, (R / total) * self.N, R)
+
+        self.time += self.dt
+
+        self.n_samples += 1
+        self.sum_S += self.S
+        self.sum_I += self.I
+        self.sum_R += self.R
+
+    def run_until_steady(self):
+        """
+        Ciclo de run() con detección de estado estacionario por celda.
+
+        Las celdas se aplanan y el lote activo es una copia del simulador con
+        solo las celdas que siguen cambiando (y un modelo con sus parámetros).
+        Cuando una celda cumple el criterio se escribe de vuelta, se le suman
+        las muestras restantes y sale del lote.
+        """
+        shape = self.S.shape
+        times = remaining_times(self.time, self.total_time, self.dt)
+        n_total = self.n_samples + len(times)
+        cells = {name: getattr(self, name).ravel().copy() for name in self.CELL_STATE}
+        params = {name: np.broadcast_to(getattr(self.model, name), shape).ravel()
+                  for name in self.model.PARAMETERS}
+        self.steady_time = np.full(cells["S"].size, np.nan)
+
+        active = copy.copy(self)
+        active.model = copy.copy(self.model)
+        index = np.arange(cells["S"].size)
+        for name in self.CELL_STATE:
+            setattr(active, name, cells[name].copy())
+        for name in params:
+            setattr(active.model, name, params[name])
+        active.rate = np.full(index.size, np.inf)
+        count = np.zeros(index.size, dtype=int)
+
+        while active.time < active.total_time and index.size:
+            rate = active.rate
+            active.step()
+            count = np.where((active.rate < self.steady_tol) & (active.rate <= rate), count + 1, 0)
+
+            done = count >= self.steady_steps
+            if done.any():
+                cell = index[done]
+                for name in self.CELL_STATE:
+                    cells[name][cell] = getattr(active, name)[done]
+
+                # Estado fijo: cada muestra restante repite el estado actual
+                n = n_total - active.n_samples
+                for name in ("S", "I", "R"):
+                    cells["sum_" + name][cell] += cells[name][cell] * n
+                self.steady_time[cell] = active.time
+
+                keep = ~done
+                index, count = index[keep], count[keep]
+                for name in self.CELL_STATE + ("rate",):
+                    setattr(active, name, getattr(active, name)[keep])
+                for name in params:
+                    setattr(active.model, name, getattr(active.model, name)[keep])
+
+        for name in self.CELL_STATE:
+            cells[name][index] = getattr(active, name)
+            setattr(self, name, cells[name].reshape(shape))
+        self.steady_time = self.steady_time.reshape(shape)
+        self.n_samples = n_total
+        self.time = times[-1] if times else self.time
+
+    def run(self):
+        if self.steady_tol is None:
+            while self.time < self.total_time:
+                self.step()
+        else:
+            self.run_until_steady()
+
+        shape = self.S.shape
+        # Mismos promedios que UnifiedSimulator: la ganancia del defensor
+        # promedia la lista concatenada S_values + R_values.
+        self.gain_attacker = self.sum_I / self.n_samples
+        self.gain_defender = (self.sum_S + self.sum_R) / (2 * self.n_samples)
+        self.cost_attacker = np.broadcast_to(self.model.cost_attacker, shape)
+        self.cost_defender = np.broadcast_to(self.model.cost_defender, shape)
+
+        self.payoff_attacker = self.gain_attacker - self.cost_attacker
+        self.payoff_defender = self.gain_defender - self.cost_defender
+
+        return {
+            "gain_attacker": self.gain_attacker,
+            "gain_defender": self.gain_defender,
+            "cost_attacker": self.cost_attacker,
+            "cost_defender": self.cost_defender,
+            "payoff_attacker": self.payoff_attacker,
+            "payoff_defender": self.payoff_defender,
+        }
+
+
+def sweep(betas, gammas, rs, lambdas, initial_state, dt=1.0, total_time=168.0,
+          k0=0.01, k1=0.01, **kwargs):
+    """
+    Integra de una sola vez el tensor completo de parámetros
+    betas x gammas x rs x lambdas.
+
+    Returns:
+        Diccionario con tensores de shape (len(betas), len(gammas), len(rs), len(lambdas)).
+        Para obtener las matrices atacante/defensor usar to_matrix().
+        kwargs se pasan a UnifiedBatchSimulator (p. ej. steady_tol).
+    """
+    grids = np.meshgrid(*(np.atleast_1d(np.asarray(v, dtype=float))
+                          for v in (betas, gammas, rs, lambdas)), indexing="ij")
+    model = UnifiedEpidemicModel(*grids, k0=k0, k1=k1)
+    return UnifiedBatchSimulator(model, initial_state, dt, total_time, **kwargs).run()
+
+
+def to_matrix(tensor):
+    """
+    Aplana un tensor (beta, gamma, r, lambda) a una matriz atacante x defensor.
+    Las columnas siguen el orden de los ciclos anidados gamma -> r -> lambda.
+    """
+    return tensor.reshape(tensor.shape[0], -1)
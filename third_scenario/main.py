@@ -1,3 +1,7 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from lib.unified_model import UnifiedEpidemicModel
 from lib.unified_simulation import UnifiedSimulator
 